@@ -0,0 +1,90 @@
+# secure-sim/analysis/flood_study.py
+import json
+import random
+import numpy as np
+
+from process_sim.water_tank import WaterTank
+from process_sim.clock import sim_clock
+from process_sim.request_queue import RequestQueue
+from attacks.flood_attack import RequestFloodAttack
+from defenses.rate_limiting import ClientRateLimiter
+
+
+def run_flood(flood_rate, clients=1, defense=False, duration=600.0, seed=0, capacity=64,
+              service_time=0.01, timeout=0.5, limit_rate=5.0, limit_burst=10.0, sample_interval=1.0):
+    """Flood the sensor read queue for duration seconds of virtual time and return the read statistics
+
+    The SCADA system reads the sensor every sample_interval while the
+    attacker floods at flood_rate requests per second from clients ids.
+    With defense, per-client token buckets allow limit_rate requests per
+    second (bursts of limit_burst).
+    """
+    random.seed(seed)
+    sim_clock.set_virtual(True, start_time=0.0)
+    try:
+        tank = WaterTank(capacity=100.0, initial_level=50.0)
+        queue = RequestQueue(capacity=capacity, service_time=service_time, timeout=timeout)
+        attack = RequestFloodAttack(tank, flood_rate=flood_rate, clients=clients, queue=queue,
+                                    rate_limiter=ClientRateLimiter(limit_rate, limit_burst))
+        attack.set_defense(defense)
+        attack.start()
+        for t in np.arange(sample_interval, duration + sample_interval / 2, sample_interval):
+            attack.apply(tank.get_level(), float(t))
+    finally:
+        sim_clock.set_virtual(False)
+
+    stats = queue.stats()
+    stats['rate_limited'] = attack.rate_limiter.limited
+    return {'flood_rate': flood_rate, 'clients': clients, 'defense': defense, **stats}
+
+
+def print_results(results):
+    """Print legitimate-read latency (of every served read, late or not) and losses per flood setting"""
+    print(f"{'flood/s':>9}{'clients':>9}{'defense':>9}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'dropped':>9}{'timeouts':>10}{'limited':>9}")
+    for row in results:
+        # No percentiles when every read was dropped
+        p50, p99 = (f"{row[key]:>9.1f}" if row[key] is not None else f"{'-':>9}"
+                    for key in ('read_p50_ms', 'read_p99_ms'))
+        print(f"{row['flood_rate']:>9g}{row['clients']:>9}{str(row['defense']):>9}{p50}{p99}"
+              f"{row['drop_rate']:>9.1%}{row['timeout_rate']:>10.1%}{row['rate_limited']:>9}")
+
+
+def add_arguments(parser):
+    """Add the flood command line options to an argparse parser"""
+    parser.add_argument('--flood-rate', dest='flood_rates', type=float, nargs='+',
+                        default=[0, 50, 90, 100, 200, 1000], help='Attacker requests per second to try')
+    parser.add_argument('--clients', dest='flood_clients', type=int, nargs='+', default=[1],
+                        help='Numbers of attacker client ids to try')
+    parser.add_argument('--defense', dest='defense_mode', choices=['off', 'on', 'both'], default='both',
+                        help='Per-client rate limiting off, on, or both')
+    parser.add_argument('--duration', dest='run_duration', type=float, default=600.0,
+                        help='Simulated seconds per setting')
+    parser.add_argument('--queue-capacity', type=int, default=64,
+                        help='Requests the read queue holds, including the one in service')
+    parser.add_argument('--service-time', type=float, default=0.01,
+                        help='Seconds to answer one request')
+    parser.add_argument('--timeout', type=float, default=0.5,
+                        help='Seconds a sensor read waits before giving up')
+    parser.add_argument('--limit-rate', type=float, default=5.0,
+                        help='Requests per second each client may make with rate limiting')
+    parser.add_argument('--limit-burst', type=float, default=10.0,
+                        help='Burst size of each client token bucket')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed; the same seed reproduces the same results')
+    parser.add_argument('--output', default=None,
+                        help='Write the results as JSON to this file')
+
+
+def main(args):
+    """Run the flood command"""
+    defenses = {'off': [False], 'on': [True], 'both': [False, True]}[args.defense_mode]
+    results = [
+        run_flood(rate, clients, defense, args.run_duration, args.seed, args.queue_capacity,
+                  args.service_time, args.timeout, args.limit_rate, args.limit_burst)
+        for rate in args.flood_rates for clients in args.flood_clients for defense in defenses
+    ]
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,199 @@
+# secure-sim/analysis/montecarlo.py
+import io
+import os
+import json
+import random
+import logging
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from process_sim.water_tank import WaterTank
+from process_sim.clock import sim_clock
+from control_logic.control import Controller
+from control_logic.command_channel import CommandChannel
+from attacks.base import available_attacks, create_attacks
+from defenses.authentication import command_authenticator
+from analysis.run_store import MemoryRecorder, DEFENSE_ACTIVE
+
+
+ATTACK_SCENARIOS = ['none'] + available_attacks() + ['all']
+
+
+def run_scenario(attack, defense, duration, seed, recorder=None, params=None, warmup=0):
+    """Run one seeded headless scenario in virtual time and return its recording
+
+    params can override the controller gain (kp) and attack settings
+    (max_deviation, max_delay). The tank first runs `warmup` seconds without
+    the attack, or longer if the attack needs to observe it first (a replay
+    attack captures a full window to replay).
+    """
+    # Imported here so the analysis package does not depend on main at import time
+    from main import simulation_loop
+
+    random.seed(seed)
+    sim_clock.set_virtual(True, start_time=0.0)
+    try:
+        # Every scenario restarts the clock at 0, so signatures seen by the previous one would look replayed
+        command_authenticator.reset()
+
+        params = params or {}
+        tank = WaterTank(capacity=100.0, initial_level=10.0)
+        command_channel = CommandChannel(tank)
+        controller = Controller(command_channel.actuator(), setpoint=50.0, kp=params.get('kp', 0.1))
+        attacks = create_attacks(tank)
+        if 'max_deviation' in params:
+            attacks['false_data'].max_deviation = params['max_deviation']
+        if 'max_delay' in params:
+            attacks['dos'].max_delay = params['max_delay']
+
+        started = [scenario_attack for name, scenario_attack in attacks.items() if attack in (name, 'all')]
+        warmup = max([warmup] + [scenario_attack.warmup for scenario_attack in started])
+
+        if recorder is None:
+            recorder = MemoryRecorder()
+        # The loop narrates every tick; nobody reads that in a batch run
+        with contextlib.redirect_stdout(io.StringIO()):
+            if warmup:
+                simulation_loop(tank, attacks, defense, False, controller=controller,
+                                duration=warmup, recorder=recorder, command_channel=command_channel)
+            # The warmup ticks stay in the recording (the sweep scores them as
+            # negatives), but scenario_metrics only looks at what follows
+            recorder.attack_start = sim_clock.time()
+            for scenario_attack in started:
+                scenario_attack.start()
+            simulation_loop(tank, attacks, defense, False, controller=controller,
+                            duration=duration, recorder=recorder, command_channel=command_channel)
+    finally:
+        sim_clock.set_virtual(False)
+    return recorder
+
+
+def scenario_metrics(recording, capacity=100.0):
+    """Summarize one recorded run, from its attack_start (if set) on"""
+    times = recording['time']
+    start = 0
+    if getattr(recording, 'attack_start', None) is not None:
+        start = int(np.searchsorted(times, recording.attack_start))
+    times = times[start:]
+    reported = recording['reported'][start:]
+    actual = recording['actual'][start:]
+    flags = recording['defense_flags'][start:]
+    discrepancy = np.abs(reported - actual)
+
+    # First tick where a defense actually intervened
+    detected = np.flatnonzero(flags & ~np.uint8(DEFENSE_ACTIVE))
+    time_to_detection = float(times[detected[0]] - times[0]) if detected.size else None
+
+    # Count transitions into the unsafe region, not ticks spent there
+    overflowing = actual >= capacity
+    emptied = actual <= 0
+    return {
+        'mean_discrepancy': float(discrepancy.mean()),
+        'max_discrepancy': float(discrepancy.max()),
+        'time_to_detection': time_to_detection,
+        'overflow_events': int(np.count_nonzero(overflowing[1:] & ~overflowing[:-1]) + overflowing[0]),
+        'empty_events': int(np.count_nonzero(emptied[1:] & ~emptied[:-1]) + emptied[0]),
+    }
+
+
+def run_task(task):
+    """Worker entry point: run one scenario and return its key and metrics"""
+    attack, defense, duration, seed = task
+    return (attack, defense), scenario_metrics(run_scenario(attack, defense, duration, seed))
+
+
+def init_worker():
+    """Silence logging in worker processes; results are reported by the parent"""
+    logging.disable(logging.CRITICAL)
+
+
+def scenario_seeds(base_seed, count):
+    """Independent per-run seeds derived from one base seed
+
+    Seeds belong to runs, not to workers, so results do not depend on how
+    runs are spread across processes.
+    """
+    children = np.random.SeedSequence(base_seed).spawn(count)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def aggregate(results):
+    """Combine per-run metrics into per-scenario statistics"""
+    grouped = {}
+    for key, metrics in results:
+        grouped.setdefault(key, []).append(metrics)
+
+    summary = []
+    for (attack, defense), runs in sorted(grouped.items()):
+        detection_times = [run['time_to_detection'] for run in runs if run['time_to_detection'] is not None]
+        summary.append({
+            'attack': attack,
+            'defense': defense,
+            'runs': len(runs),
+            'mean_discrepancy': float(np.mean([run['mean_discrepancy'] for run in runs])),
+            'mean_max_discrepancy': float(np.mean([run['max_discrepancy'] for run in runs])),
+            'max_discrepancy': float(np.max([run['max_discrepancy'] for run in runs])),
+            'detection_rate': len(detection_times) / len(runs),
+            'mean_time_to_detection': float(np.mean(detection_times)) if detection_times else None,
+            'overflow_events': int(sum(run['overflow_events'] for run in runs)),
+            'empty_events': int(sum(run['empty_events'] for run in runs)),
+        })
+    return summary
+
+
+def run_montecarlo(attacks, defenses, runs, duration, seed=0, workers=None):
+    """Run `runs` seeded scenarios for every attack/defense combination in parallel"""
+    combinations = [(attack, defense) for attack in attacks for defense in defenses]
+    seeds = scenario_seeds(seed, len(combinations) * runs)
+    tasks = [(attack, defense, duration, seeds[i * runs + j])
+             for i, (attack, defense) in enumerate(combinations) for j in range(runs)]
+
+    workers = workers or os.cpu_count() or 1
+    # Several tasks per message keeps IPC overhead low for short scenarios
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        results = list(executor.map(run_task, tasks, chunksize=chunksize))
+    return aggregate(results)
+
+
+def print_summary(summary):
+    """Print per-scenario results as a table"""
+    print(f"{'attack':<11}{'defense':<9}{'runs':>6}{'mean |d|':>10}{'max |d|':>10}"
+          f"{'detected':>10}{'t_detect':>10}{'overflows':>11}")
+    for row in summary:
+        t_detect = row['mean_time_to_detection']
+        print(f"{row['attack']:<11}{str(row['defense']):<9}{row['runs']:>6}"
+              f"{row['mean_discrepancy']:>10.2f}{row['max_discrepancy']:>10.2f}"
+              f"{row['detection_rate']:>10.0%}{'-' if t_detect is None else f'{t_detect:.1f}s':>10}"
+              f"{row['overflow_events']:>11}")
+
+
+def add_arguments(parser):
+    """Add the montecarlo command line options to an argparse parser"""
+    # Dests differ from the top-level --attack/--defense/--duration options
+    parser.add_argument('--attack', dest='attacks', nargs='+', choices=ATTACK_SCENARIOS,
+                        default=ATTACK_SCENARIOS, help='Attack scenarios to run')
+    parser.add_argument('--defense', dest='defense_mode', choices=['off', 'on', 'both'], default='both',
+                        help='Run with defenses off, on, or both')
+    parser.add_argument('--runs', type=int, default=100,
+                        help='Runs per attack/defense combination')
+    parser.add_argument('--duration', dest='run_duration', type=float, default=300.0,
+                        help='Simulated seconds per run')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Base seed; the same seed reproduces the same results')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per CPU)')
+    parser.add_argument('--output', default=None,
+                        help='Write the summary as JSON to this file')
+
+
+def main(args):
+    """Run the montecarlo command"""
+    defenses = {'off': [False], 'on': [True], 'both': [False, True]}[args.defense_mode]
+    summary = run_montecarlo(args.attacks, defenses, args.runs, args.run_duration,
+                             seed=args.seed, workers=args.workers)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
@@ -0,0 +1,196 @@
+# secure-sim/analysis/run_store.py
+import os
+import json
+import numpy as np
+
+
+# Bits of the defense_flags column
+DEFENSE_ACTIVE = 1  # Defense mechanisms were enabled during the tick
+REPLAY_CORRECTED = 2  # Anomaly detection corrected a replayed reading
+FALSE_DATA_CORRECTED = 4  # Anomaly detection corrected injected data
+BACKUP_READING = 8  # An authenticated backup reading was used
+
+# Per-tick columns and their on-disk types
+COLUMNS = {
+    'time': '<f8',
+    'reported': '<f8',
+    'actual': '<f8',
+    'inflow': '<f8',
+    'outflow': '<f8',
+    'phase': '<i2',
+    'defense_flags': '<u1',
+}
+
+META_FILE = 'meta.json'
+
+
+class RunWriter:
+    """Append-only columnar recorder for per-tick tank state
+
+    Each column is a raw little-endian binary file in the run directory, so
+    a finished (or still running) run can be memory-mapped by RunReader.
+    Rows are buffered in memory and written in blocks.
+    """
+    def __init__(self, path, buffer_rows=4096):
+        self.path = path
+        self.buffer_rows = buffer_rows
+        self.phases = []  # Phase names, indexed by the phase column
+        self.phase_codes = {}
+        self.rows = 0  # Rows in the buffer
+        self.buffers = {name: np.empty(buffer_rows, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+        os.makedirs(path, exist_ok=True)
+        # Start a fresh run if the directory already held one
+        self.files = {name: open(os.path.join(path, f'{name}.bin'), 'wb') for name in COLUMNS}
+        self.write_meta()
+
+    def phase_index(self, phase):
+        """Map a phase name to its integer code"""
+        code = self.phase_codes.get(phase)
+        if code is None:
+            code = self.phase_codes[phase] = len(self.phases)
+            self.phases.append(phase)
+            self.write_meta()
+        return code
+
+    def append(self, time, reported, actual, inflow, outflow, phase, defense_flags=0):
+        """Record the state of one tick"""
+        i = self.rows
+        buffers = self.buffers
+        buffers['time'][i] = time
+        buffers['reported'][i] = reported
+        buffers['actual'][i] = actual
+        buffers['inflow'][i] = inflow
+        buffers['outflow'][i] = outflow
+        buffers['phase'][i] = self.phase_index(phase)
+        buffers['defense_flags'][i] = defense_flags
+        self.rows += 1
+        if self.rows == self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows to the column files"""
+        if self.rows:
+            for name, file in self.files.items():
+                file.write(self.buffers[name][:self.rows].tobytes())
+                file.flush()
+            self.rows = 0
+
+    def write_meta(self):
+        """Write the column layout and phase names"""
+        meta = {'columns': COLUMNS, 'phases': self.phases}
+        with open(os.path.join(self.path, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    def close(self):
+        """Flush remaining rows and close the column files"""
+        self.flush()
+        for file in self.files.values():
+            file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MemoryRecorder:
+    """In-memory recorder with the RunWriter append interface
+
+    Used for short headless runs (Monte Carlo, sweeps) whose results are
+    analyzed straight away instead of being written to disk.
+    """
+    def __init__(self):
+        self.phases = []
+        self.phase_codes = {}
+        self.rows = {name: [] for name in COLUMNS}
+        self.attack_start = None  # Simulation time the attacks started, if the run had a warmup
+
+    def append(self, time, reported, actual, inflow, outflow, phase, defense_flags=0):
+        """Record the state of one tick"""
+        code = self.phase_codes.get(phase)
+        if code is None:
+            code = self.phase_codes[phase] = len(self.phases)
+            self.phases.append(phase)
+        rows = self.rows
+        rows['time'].append(time)
+        rows['reported'].append(reported)
+        rows['actual'].append(actual)
+        rows['inflow'].append(inflow)
+        rows['outflow'].append(outflow)
+        rows['phase'].append(code)
+        rows['defense_flags'].append(defense_flags)
+
+    def __len__(self):
+        return len(self.rows['time'])
+
+    def __getitem__(self, name):
+        return np.array(self.rows[name], dtype=COLUMNS[name])
+
+    def close(self):
+        pass
+
+
+class RunReader:
+    """Read a recorded run back as memory-mapped NumPy arrays"""
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        self.phases = meta['phases']
+        self.columns = {}
+        for name, dtype in meta['columns'].items():
+            file_path = os.path.join(path, f'{name}.bin')
+            if os.path.getsize(file_path) == 0:
+                self.columns[name] = np.empty(0, dtype=dtype)
+            else:
+                self.columns[name] = np.memmap(file_path, dtype=dtype, mode='r')
+
+        # Columns may differ by a partial block if the run is still being written
+        self.length = min(len(column) for column in self.columns.values())
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, name):
+        return self.columns[name][:self.length]
+
+    def time_range(self, start=None, end=None):
+        """Return every column restricted to start <= time < end
+
+        Times are recorded in increasing order, so this is a binary search
+        and the returned arrays are views into the mapped files.
+        """
+        times = self['time']
+        lo = 0 if start is None else np.searchsorted(times, start, side='left')
+        hi = self.length if end is None else np.searchsorted(times, end, side='left')
+        return {name: column[lo:hi] for name, column in self.columns.items()}
+
+    def phase_mask(self, phase):
+        """Boolean mask of ticks recorded during the named phase"""
+        if phase not in self.phases:
+            return np.zeros(self.length, dtype=bool)
+        return self['phase'] == self.phases.index(phase)
+
+    def flag_mask(self, flag):
+        """Boolean mask of ticks with the given defense flag bit set"""
+        return (self['defense_flags'] & flag) != 0
+
+    def discrepancy(self):
+        """Reported minus actual level for every tick"""
+        return self['reported'] - self['actual']
+
+    def summary(self):
+        """Per-phase tick counts and discrepancy statistics"""
+        discrepancy = np.abs(self.discrepancy())
+        summary = {}
+        for phase in self.phases:
+            mask = self.phase_mask(phase)
+            if mask.any():
+                summary[phase] = {
+                    'ticks': int(mask.sum()),
+                    'mean_discrepancy': float(discrepancy[mask].mean()),
+                    'max_discrepancy': float(discrepancy[mask].max()),
+                }
+        return summary
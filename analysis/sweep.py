@@ -0,0 +1,249 @@
+# secure-sim/analysis/sweep.py
+import os
+import json
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+from defenses.anomaly_detection import MultiStreamAnomalyDetector
+from attacks.base import available_attacks
+from analysis.montecarlo import run_scenario, scenario_seeds, init_worker
+
+
+# Tunable parameters and their default sweep values
+DEFAULT_SPACE = {
+    'z_score_threshold': [2.0, 2.5, 3.0],
+    'window_size': [10, 20, 40],
+    'max_deviation': [30.0],
+    'max_delay': [3.0],
+    'kp': [0.1],
+}
+INTEGER_PARAMETERS = {'window_size'}
+
+SWEEP_ATTACKS = available_attacks()
+
+
+def grid_cells(space):
+    """Every combination of the parameter values"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_cells(space, samples, seed=0):
+    """Random combinations, each parameter drawn uniformly between its smallest and largest value"""
+    rng = np.random.default_rng(seed)
+    cells = []
+    for _ in range(samples):
+        cell = {}
+        for name, values in space.items():
+            low, high = min(values), max(values)
+            if name in INTEGER_PARAMETERS:
+                cell[name] = int(rng.integers(low, high + 1))
+            else:
+                # Rounded so cells print readably and cache keys stay short
+                cell[name] = round(float(rng.uniform(low, high)), 4)
+        cells.append(cell)
+    return cells
+
+
+def detect(readings, window_size, z_score_threshold):
+    """Run the anomaly detector over a (runs x ticks) array and return the alarms
+
+    Every run is one sensor of a MultiStreamAnomalyDetector, so all runs of
+    a cell are scored in one pass over the ticks.
+    """
+    runs, ticks = readings.shape
+    detector = MultiStreamAnomalyDetector(runs, window_size=window_size)
+    detector.z_score_threshold = z_score_threshold
+    alarms = np.zeros((runs, ticks), dtype=bool)
+    for t in range(ticks):
+        alarms[detector.add_observations(readings[:, t]), t] = True
+    return alarms
+
+
+def evaluate_cell(params, attacks, runs, duration, warmup, seeds):
+    """Detection and false-positive rates of the anomaly detector for one parameter combination
+
+    Each run starts with `warmup` attack-free seconds. Those ticks and the
+    runs without an attack count as negatives; a run under attack counts as
+    detected if the detector raised an alarm after the attack started.
+    """
+    readings = []
+    under_attack = []
+    scenario_names = []
+    for attack in ['none'] + attacks:
+        for seed in seeds[attack]:
+            recording = run_scenario(attack, False, duration, seed, params=params, warmup=warmup)
+            none_code = recording.phase_codes.get('none', -1)
+            readings.append(recording['reported'])
+            under_attack.append(recording['phase'] != none_code)
+            scenario_names.append(attack)
+
+    # Runs of one cell are the same length, but trim in case a run ended a tick early
+    ticks = min(len(r) for r in readings)
+    readings = np.array([r[:ticks] for r in readings])
+    under_attack = np.array([a[:ticks] for a in under_attack])
+    scenario_names = np.array(scenario_names)
+    alarms = detect(readings, int(params['window_size']), params['z_score_threshold'])
+
+    normal = ~under_attack
+    detected = (alarms & under_attack).any(axis=1)
+    attacked = under_attack.any(axis=1)
+    first_alarm = np.argmax(alarms & under_attack, axis=1) - np.argmax(under_attack, axis=1)
+
+    metrics = {
+        'false_positive_rate': float((alarms & normal).sum() / max(1, normal.sum())),
+        'detection_rate': float(detected[attacked].mean()) if attacked.any() else None,
+        'mean_time_to_detection': float(first_alarm[detected].mean()) if detected.any() else None,
+    }
+    for attack in attacks:
+        runs_mask = (scenario_names == attack) & attacked
+        metrics[f'detection_rate_{attack}'] = float(detected[runs_mask].mean()) if runs_mask.any() else None
+    return metrics
+
+
+def run_cell(task):
+    """Worker entry point: evaluate one cell and return its key and metrics"""
+    key, params, attacks, runs, duration, warmup, seeds = task
+    return key, params, evaluate_cell(params, attacks, runs, duration, warmup, seeds)
+
+
+def cell_key(params, settings):
+    """Cache key of a cell; includes the scenario settings so changed settings are rerun"""
+    return json.dumps({'params': params, **settings}, sort_keys=True)
+
+
+def load_cache(path):
+    """Load completed cells from a JSON lines cache file"""
+    cache = {}
+    if path and os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by an interrupted sweep
+                cache[record['key']] = record
+    return cache
+
+
+def open_cache(path):
+    """Open the cache file for appending records
+
+    A sweep killed mid-write leaves a last line without a newline; end it
+    first so the next record starts on a line of its own.
+    """
+    cut_short = False
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            cut_short = f.read(1) != b'\n'
+    cache_file = open(path, 'a')
+    if cut_short:
+        cache_file.write('\n')
+    return cache_file
+
+
+def run_sweep(cells, attacks=SWEEP_ATTACKS, runs=10, duration=120.0, warmup=60.0,
+              seed=0, workers=None, cache_path=None):
+    """Evaluate every cell in parallel, skipping cells already in the cache
+
+    Each finished cell is appended to the cache immediately, so an
+    interrupted sweep picks up where it stopped. Every cell uses the same
+    scenario seeds, so differences between cells come from the parameters.
+    """
+    settings = {'attacks': list(attacks), 'runs': runs, 'duration': duration,
+                'warmup': warmup, 'seed': seed}
+    scenarios = ['none'] + list(attacks)
+    all_seeds = scenario_seeds(seed, len(scenarios) * runs)
+    seeds = {name: all_seeds[i * runs:(i + 1) * runs] for i, name in enumerate(scenarios)}
+
+    cache = load_cache(cache_path)
+    results = {}
+    tasks = []
+    for params in cells:
+        key = cell_key(params, settings)
+        if key in cache:
+            results[key] = cache[key]
+        elif key not in results:
+            results[key] = None
+            tasks.append((key, params, list(attacks), runs, duration, warmup, seeds))
+
+    if tasks:
+        if cache_path and os.path.dirname(cache_path):
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        cache_file = open_cache(cache_path) if cache_path else None
+        try:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                     initializer=init_worker) as executor:
+                futures = [executor.submit(run_cell, task) for task in tasks]
+                for future in as_completed(futures):
+                    key, params, metrics = future.result()
+                    record = {'key': key, 'params': params, 'metrics': metrics}
+                    results[key] = record
+                    if cache_file:
+                        cache_file.write(json.dumps(record) + '\n')
+                        cache_file.flush()
+        finally:
+            if cache_file:
+                cache_file.close()
+
+    return [results[cell_key(params, settings)] for params in cells]
+
+
+def print_results(records, space):
+    """Print one row per cell"""
+    names = list(space)
+    print(''.join(f'{name:>19}' for name in names) + f"{'detection':>11}{'false pos':>11}{'t_detect':>10}")
+    for record in records:
+        params, metrics = record['params'], record['metrics']
+        t_detect = metrics['mean_time_to_detection']
+        detection = metrics['detection_rate']
+        print(''.join(f'{params[name]:>19}' for name in names)
+              + f"{'-' if detection is None else f'{detection:.0%}':>11}"
+              + f"{metrics['false_positive_rate']:>11.2%}"
+              + f"{'-' if t_detect is None else f'{t_detect:.1f}s':>10}")
+
+
+def add_arguments(parser):
+    """Add the sweep command line options to an argparse parser"""
+    parser.add_argument('--mode', choices=['grid', 'random'], default='grid',
+                        help='Try every combination, or random combinations within each range')
+    parser.add_argument('--samples', type=int, default=20,
+                        help='Number of random combinations (random mode)')
+    for name, values in DEFAULT_SPACE.items():
+        parser.add_argument('--' + name.replace('_', '-'), dest=name, nargs='+',
+                            type=int if name in INTEGER_PARAMETERS else float, default=values,
+                            help=f'Values to sweep (default: {" ".join(map(str, values))})')
+    parser.add_argument('--attack', dest='sweep_attacks', nargs='+', choices=SWEEP_ATTACKS,
+                        default=SWEEP_ATTACKS, help='Attacks used to measure detection')
+    parser.add_argument('--runs', type=int, default=10,
+                        help='Runs per attack for every cell')
+    parser.add_argument('--duration', dest='run_duration', type=float, default=120.0,
+                        help='Simulated seconds of attack per run')
+    parser.add_argument('--warmup', type=float, default=60.0,
+                        help='Attack-free simulated seconds before the attack starts')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Base seed for scenarios and random search')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per CPU)')
+    parser.add_argument('--cache', default='data/sweep_cache.jsonl',
+                        help='JSON lines file of completed cells, used to resume')
+    parser.add_argument('--output', default=None,
+                        help='Write the results as JSON to this file')
+
+
+def main(args):
+    """Run the sweep command"""
+    space = {name: getattr(args, name) for name in DEFAULT_SPACE}
+    if args.mode == 'grid':
+        cells = grid_cells(space)
+    else:
+        cells = random_cells(space, args.samples, args.seed)
+
+    records = run_sweep(cells, args.sweep_attacks, args.runs, args.run_duration, args.warmup,
+                        seed=args.seed, workers=args.workers, cache_path=args.cache)
+    print_results(records, space)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([{'params': r['params'], 'metrics': r['metrics']} for r in records], f, indent=2)
@@ -0,0 +1,103 @@
+# secure-sim/attacks/base.py
+import os
+import pkgutil
+import importlib
+import numpy as np
+
+
+# Attack classes by name, filled in by @register_attack
+ATTACK_REGISTRY = {}
+
+
+def register_attack(name):
+    """Class decorator that makes an attack available under name"""
+    def decorator(cls):
+        cls.name = name
+        ATTACK_REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+def load_attacks():
+    """Import every module in the attacks package so its attacks register themselves"""
+    package_dir = os.path.dirname(__file__)
+    for module in pkgutil.iter_modules([package_dir]):
+        importlib.import_module(f'attacks.{module.name}')
+
+
+def available_attacks():
+    """Names of all registered attacks, in the order they are applied"""
+    load_attacks()
+    return sorted(ATTACK_REGISTRY, key=lambda name: ATTACK_REGISTRY[name].order)
+
+
+def create_attacks(tank):
+    """Create one instance of every registered attack against tank"""
+    return {name: ATTACK_REGISTRY[name](tank) for name in available_attacks()}
+
+
+def format_levels(levels):
+    """One reading as '12.34', several as a count and mean, for console output"""
+    levels = np.asarray(levels, dtype=np.float64)
+    if levels.ndim == 0:
+        return f"{float(levels):.2f}"
+    return f"{levels.size} readings, mean {levels.mean():.2f}"
+
+
+class Attack:
+    """Base class for attacks on sensor readings
+
+    Subclasses implement apply(), which transforms a whole array of readings
+    (one per tank) at simulation time t, so the same attack runs against a
+    single WaterTank or a TankFleet. An attack also carries the defense
+    against it: defend() answers the attacked readings while defenses are
+    active, and apply() can check self.defended for countermeasures that
+    sit inside the attacked path.
+    """
+    name = None
+    display_name = 'Attack'  # Shown in console output and dashboard phases
+    description = 'Sensor reading'  # What the attacked reading is, for console output
+    order = 100  # Attacks with a lower order are applied first
+    warmup = 0.0  # Seconds of genuine readings the attack must observe before start()
+
+    def __init__(self, tank):
+        self.tank = tank
+        self.running = False
+        self.defended = False  # Whether defenses are active, see set_defense()
+
+    def apply(self, readings, t):
+        """Return the readings as seen by the SCADA system at simulation time t"""
+        raise NotImplementedError
+
+    def observe(self, readings, t):
+        """Called with the genuine readings every tick, whether or not the attack is running"""
+        pass
+
+    def set_defense(self, enabled):
+        """Called every tick with whether defenses are active"""
+        self.defended = enabled
+
+    def defend(self, reported, actual):
+        """Defense response to this attack while defenses are active
+
+        Gets the attacked readings and the genuine ones and returns the
+        readings the SCADA system ends up with plus the defense_flags bits
+        for what the defense did. Attacks without a response leave the
+        readings alone.
+        """
+        return reported, 0
+
+    def start(self):
+        """Start the attack"""
+        self.running = True
+        return True
+
+    def stop(self):
+        """Stop the attack"""
+        self.running = False
+
+    def current_levels(self):
+        """True levels of the attacked tank(s) as an array"""
+        if hasattr(self.tank, 'get_levels'):
+            return self.tank.get_levels()
+        return np.asarray(self.tank.get_level(), dtype=np.float64)
@@ -1,44 +1,76 @@
 # secure-sim/attacks/dos_attack.py
-import time
 import random
+import numpy as np
+from attacks.base import Attack, register_attack, format_levels
+from process_sim.clock import sim_clock
+from defenses.authentication import command_authenticator
+from defenses.logging_defense import emit, log_event
+from analysis.run_store import BACKUP_READING
 
 
-class DoSAttack:
+@register_attack('dos')
+class DoSAttack(Attack):
     """Simulates a Denial of Service attack by returning delayed/stale sensor readings"""
+    display_name = 'DoS Attack'
+    description = 'Delayed sensor reading'
+    order = 30  # Delays whatever the earlier attacks produced
+
     def __init__(self, tank):
-        self.tank = tank
-        self.running = False
-        self.last_update_time = time.time()
-        self.delayed_value = 0.0
+        super().__init__(tank)
+        # Last delivered reading and delivery time for every sensor
+        self.delayed_values = np.zeros(())
+        self.last_update_times = np.zeros(())
         self.max_delay = 3.0  # Maximum delay in seconds
+        # Seeded from the random module so seeded runs stay reproducible
+        self.rng = np.random.default_rng(random.getrandbits(64))
         
-    def get_delayed_reading(self, true_value):
-        """Simulates communication delays by returning stale data"""
+    def apply(self, readings, t):
+        """Deliver each sensor's reading only once its random delay has passed"""
+        readings = np.asarray(readings, dtype=np.float64)
         if not self.running:
-            return true_value
+            return readings
+        
+        # Start over from this batch when its shape differs from the stored state,
+        # e.g. when aimed at a subset of a network's nodes after start()
+        if self.delayed_values.shape != readings.shape:
+            self.delayed_values = readings.copy()
+            self.last_update_times = np.full(readings.shape, float(t))
         
-        # Randomly vary the delay to simulate intermittent connectivity
-        update_delay = random.uniform(1.0, self.max_delay)
+        # Randomly vary the delay per sensor to simulate intermittent connectivity
+        update_delay = self.rng.uniform(1.0, self.max_delay, size=readings.shape)
         
-        # Get current time
-        current_time = time.time()
+        # Update the stored values whose delay has passed
+        due = t - self.last_update_times >= update_delay
+        self.delayed_values[due] = readings[due]
+        self.last_update_times[due] = t
         
-        # Check if it's time for an update based on delay
-        if current_time - self.last_update_time >= update_delay:
-            # Update the stored value after delay has passed
-            self.delayed_value = true_value
-            self.last_update_time = current_time
+        # Return the delayed values (which might be stale)
+        return self.delayed_values.copy()
         
-        # Return the delayed value (which might be stale)
-        return self.delayed_value
+    def get_delayed_reading(self, true_value):
+        """Simulates communication delays by returning stale data"""
+        if not self.running:
+            return true_value
+        return float(self.apply(true_value, sim_clock.time()))
             
     def start(self):
         """Start the attack"""
         self.running = True
-        self.delayed_value = self.tank.get_level()  # Initialize with current value
-        self.last_update_time = time.time()
+        # Initialize with the current values
+        self.delayed_values = np.array(self.current_levels(), dtype=np.float64)
+        self.last_update_times = np.full(self.delayed_values.shape, sim_clock.time())
         return True
-        
-    def stop(self):
-        """Stop the attack"""
-        self.running = False
\ No newline at end of file
+
+    def defend(self, reported, actual):
+        """Authentication allows backup readings during a DoS"""
+        if random.random() < 0.6:
+            cmd = "get_backup_reading"
+            timestamp = sim_clock.time()
+            signature = command_authenticator.generate_hmac(cmd, timestamp)
+            
+            if command_authenticator.authenticate_command(cmd, timestamp, signature):
+                reported = actual + random.uniform(-1, 1)
+                emit(f"[DEFENSE] Using authenticated backup reading: {format_levels(reported)}")
+                log_event(f"[DEFENSE] Command authentication activated backup system")
+                return reported, BACKUP_READING
+        return reported, 0
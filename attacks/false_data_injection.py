@@ -1,19 +1,31 @@
 # secure-sim/attacks/false_data_injection.py
 import random
+import numpy as np
+from attacks.base import Attack, register_attack, format_levels
+from process_sim.clock import sim_clock
+from defenses.logging_defense import emit, log_event
+from analysis.run_store import FALSE_DATA_CORRECTED
 
 
-class FalseDataInjectionAttack:
+@register_attack('false_data')
+class FalseDataInjectionAttack(Attack):
     """Simulates a false data injection attack by adding random deviations to readings"""
+    display_name = 'False Data Attack'
+    description = 'Manipulated sensor reading'
+    order = 20
+
     def __init__(self, tank):
-        self.tank = tank
-        self.running = False
+        super().__init__(tank)
         self.attack_percent = 0.0  # Controls intensity (0.0 to 1.0)
         self.max_deviation = 30.0  # Maximum deviation in units
+        # Seeded from the random module so seeded runs stay reproducible
+        self.rng = np.random.default_rng(random.getrandbits(64))
         
-    def get_false_reading(self, true_value):
-        """Returns a falsified sensor reading based on the true value"""
+    def apply(self, readings, t):
+        """Add an independent random deviation to every reading"""
+        readings = np.asarray(readings, dtype=np.float64)
         if not self.running:
-            return true_value
+            return readings
             
         # Calculate deviation based on attack intensity
         # Gradually increase attack intensity with each call
@@ -25,15 +37,27 @@ class FalseDataInjectionAttack:
         max_current_deviation = self.max_deviation * self.attack_percent
         
         # Add random deviation to make it look realistic
-        deviation = random.uniform(-max_current_deviation, max_current_deviation)
-        return true_value + deviation
+        deviation = self.rng.uniform(-max_current_deviation, max_current_deviation, size=readings.shape)
+        return readings + deviation
+        
+    def get_false_reading(self, true_value):
+        """Returns a falsified sensor reading based on the true value"""
+        if not self.running:
+            return true_value
+        return float(self.apply(true_value, sim_clock.time()))
             
     def start(self):
         """Start the attack"""
         self.running = True
         self.attack_percent = 0.0  # Reset attack intensity
         return True
-        
-    def stop(self):
-        """Stop the attack"""
-        self.running = False
\ No newline at end of file
+
+    def defend(self, reported, actual):
+        """Anomaly detection has a chance to partially correct injected data"""
+        if random.random() < 0.5:
+            correction = random.uniform(0.3, 0.8)
+            reported = actual * correction + reported * (1-correction)
+            emit(f"[DEFENSE] Partially corrected false data: {format_levels(reported)}")
+            log_event(f"[DEFENSE] Anomaly detection identified false data injection")
+            return reported, FALSE_DATA_CORRECTED
+        return reported, 0
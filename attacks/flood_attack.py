@@ -0,0 +1,59 @@
+# secure-sim/attacks/flood_attack.py
+import random
+import numpy as np
+from attacks.base import Attack, register_attack
+from process_sim.clock import sim_clock
+from process_sim.request_queue import RequestQueue
+from defenses.rate_limiting import ClientRateLimiter
+
+
+@register_attack('flood')
+class RequestFloodAttack(Attack):
+    """Floods the bounded request queue in front of the sensor read path
+
+    Attacker requests arrive at flood_rate per second, spread over clients
+    client ids, and compete with the SCADA system's own sensor read every
+    tick. A read that is dropped or times out leaves the SCADA system with
+    the last reading it did get. With defenses active, per-client token
+    buckets turn the flood away before it queues (which only helps while
+    the attacker has few client ids).
+    """
+    display_name = 'Request Flood'
+    description = 'Sensor reading through flooded queue'
+    order = 40  # Sits in front of the read path, after the attacks on the reading itself
+
+    def __init__(self, tank, flood_rate=500.0, clients=1, queue=None, rate_limiter=None):
+        super().__init__(tank)
+        self.flood_rate = flood_rate  # Attacker requests per second
+        self.clients = clients  # Distinct attacker client ids
+        self.queue = queue or RequestQueue()
+        self.rate_limiter = rate_limiter or ClientRateLimiter()
+        self.last_delivered = np.zeros(())
+        self.last_time = None
+        self.rng = None
+
+    def apply(self, readings, t):
+        """Flood the queue up to t, then read; a failed read returns the last delivered readings"""
+        readings = np.asarray(readings, dtype=np.float64)
+        if not self.running:
+            return readings
+
+        # The defense is rate limiting clients while defenses are active
+        self.queue.rate_limiter = self.rate_limiter if self.defended else None
+        if self.last_time is not None and t > self.last_time:
+            self.queue.flood(self.last_time, t, self.flood_rate, self.rng, self.clients)
+        self.last_time = t
+
+        if self.queue.read(t) or self.last_delivered.shape != readings.shape:
+            self.last_delivered = readings.copy()
+        return self.last_delivered.copy()
+
+    def start(self):
+        """Start the attack"""
+        self.running = True
+        # Seeded here rather than in __init__ so runs without this attack keep their random stream
+        if self.rng is None:
+            self.rng = np.random.default_rng(random.getrandbits(64))
+        self.last_delivered = np.array(self.current_levels(), dtype=np.float64)
+        self.last_time = sim_clock.time()
+        return True
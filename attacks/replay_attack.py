@@ -1,19 +1,103 @@
 # secure-sim/attacks/replay_attack.py
-import threading
+import random
+import numpy as np
+from attacks.base import Attack, register_attack, format_levels
+from process_sim.clock import sim_clock
+from defenses.logging_defense import emit, log_event
+from analysis.run_store import REPLAY_CORRECTED
 
 
-class ReplayAttack:
-    """Simulates a replay attack that returns a fixed spoofed value"""
-    def __init__(self, tank):
-        self.tank = tank
-        self.running = False
-        self.attack_value = 75.0  # Fixed spoofed value
+@register_attack('replay')
+class ReplayAttack(Attack):
+    """Simulates a replay attack that plays back previously captured sensor readings
+
+    While idle the attack records genuine readings into a fixed-size ring
+    buffer. Once started it loops the captured trace, holding each recorded
+    value for as long as it was originally shown, so playback stays aligned
+    with the recorded timing whatever the current tick rate is. It needs a
+    capture, so let it observe for `warmup` seconds before starting it.
+    """
+    display_name = 'Replay Attack'
+    description = 'Spoofed sensor reading'
+    order = 10  # Replaces the reading outright, so it goes first
+
+    def __init__(self, tank, capture_window=60.0, max_samples=3600):
+        super().__init__(tank)
+        self.capture_window = capture_window  # Seconds of readings to replay
+        self.max_samples = max_samples  # Ring buffer size, bounds memory per sensor
+        
+        # Capture ring buffer, allocated on the first observation once the shape is known
+        self.capture_times = np.zeros(max_samples, dtype=np.float64)
+        self.capture_values = None  # (max_samples, *reading shape) float32
+        self.capture_count = 0  # Total readings ever captured
+        
+        # Trace being replayed: times relative to its start, values, loop length
+        self.trace_times = None
+        self.trace_values = None
+        self.trace_period = 0.0
+        self.replay_start = 0.0
+
+    def observe(self, readings, t):
+        """Record genuine readings while the attack is idle"""
+        if self.running:
+            return
+        readings = np.asarray(readings, dtype=np.float32)
+        if self.capture_values is None or self.capture_values.shape[1:] != readings.shape:
+            # First capture, or the sensors changed: start a new buffer
+            self.capture_values = np.zeros((self.max_samples,) + readings.shape, dtype=np.float32)
+            self.capture_count = 0
+        i = self.capture_count % self.max_samples
+        self.capture_times[i] = t
+        self.capture_values[i] = readings
+        self.capture_count += 1
+
+    @property
+    def warmup(self):
+        """A full capture window of genuine readings"""
+        return self.capture_window
+
+    def captured_trace(self):
+        """Return the captured (times, values) inside the capture window, oldest first"""
+        size = min(self.capture_count, self.max_samples)
+        order = (self.capture_count - size + np.arange(size)) % self.max_samples
+        times = self.capture_times[order]
+        values = self.capture_values[order] if size else None
+        if size:
+            keep = times >= times[-1] - self.capture_window
+            times, values = times[keep], values[keep]
+        return times, values
 
     def start(self):
-        """Start the attack"""
+        """Start the attack, freezing the captured trace for playback"""
+        times, values = self.captured_trace()
+        if len(times) == 0:
+            raise RuntimeError("Replay attack has nothing to replay: let it observe the sensors "
+                               f"for {self.warmup:.0f} s before starting it")
         self.running = True
+        self.replay_start = sim_clock.time()
+        self.trace_times = times - times[0]
+        self.trace_values = values
+        # Loop after the last sample has been shown for one typical tick
+        tick = (float(np.median(np.diff(times))) if len(times) > 1 else 0.0) or 1.0
+        self.trace_period = self.trace_times[-1] + tick
         return True
 
-    def stop(self):
-        """Stop the attack"""
-        self.running = False
+    def apply(self, readings, t):
+        """Replace the readings with the captured trace, time-aligned with playback"""
+        readings = np.asarray(readings, dtype=np.float64)
+        if not self.running:
+            return readings
+        
+        # Hold whichever sample was being shown at this point of the loop
+        offset = (t - self.replay_start) % self.trace_period
+        index = np.searchsorted(self.trace_times, offset, side='right') - 1
+        return np.array(np.broadcast_to(self.trace_values[index], readings.shape), dtype=np.float64)
+
+    def defend(self, reported, actual):
+        """Anomaly detection may correct a replayed value"""
+        if random.random() < 0.7:
+            reported = actual * 0.7 + reported * 0.3
+            emit(f"[DEFENSE] Anomaly detection partially corrected level: {format_levels(reported)}")
+            log_event(f"[DEFENSE] Anomaly detection identified replay attack")
+            return reported, REPLAY_CORRECTED
+        return reported, 0
@@ -0,0 +1,99 @@
+# secure-sim/bench/bench_modbus.py
+import sys
+import os
+import time
+import asyncio
+import argparse
+import multiprocessing
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from process_sim.water_tank import WaterTank
+from scada_net.modbus import ModbusServer, ModbusClient
+from scada_net.attack_clients import flood
+
+
+def serve(port_queue, stop):
+    """Server process: a Modbus server for one tank until stop is set"""
+    server = ModbusServer(WaterTank(capacity=100.0, initial_level=50.0), port=0)
+    server.start_in_thread()
+    port_queue.put(server.port)
+    stop.wait()
+    server.stop()
+
+
+def run_flood(port, connections, duration, result_queue):
+    """Flooder process: report how many replies the flood got"""
+    result_queue.put(asyncio.run(flood('127.0.0.1', port, connections, duration)))
+
+
+async def legit_reads(port, duration):
+    """One SCADA client polling the level back to back; return per-read latencies in ns"""
+    latencies = []
+    async with ModbusClient(port=port) as client:
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            start = time.perf_counter_ns()
+            await client.read_levels()
+            latencies.append(time.perf_counter_ns() - start)
+    return latencies
+
+
+def measure(flooders, connections, duration=2.0, ramp_up=0.3):
+    """Legitimate read latency and throughput with the given number of flooding processes
+
+    The server, each flooder and the measuring client run in separate
+    processes and talk over localhost TCP.
+    """
+    port_queue, result_queue = multiprocessing.Queue(), multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(port_queue, stop), daemon=True)
+    server.start()
+    port = port_queue.get(timeout=10)
+    try:
+        flood_time = ramp_up + duration
+        floods = [multiprocessing.Process(target=run_flood, args=(port, connections, flood_time, result_queue),
+                                          daemon=True) for _ in range(flooders)]
+        for process in floods:
+            process.start()
+        time.sleep(ramp_up if flooders else 0)
+        latencies = np.asarray(asyncio.run(legit_reads(port, duration)), dtype=np.float64) / 1000.0
+        flood_replies = sum(result_queue.get(timeout=30) for _ in floods)
+        for process in floods:
+            process.join()
+    finally:
+        stop.set()
+        server.join(timeout=10)
+
+    return {
+        'flooders': flooders,
+        'flood_connections': flooders * connections,
+        'legit_reads_per_s': len(latencies) / duration,
+        'legit_p50_us': float(np.percentile(latencies, 50)),
+        'legit_p99_us': float(np.percentile(latencies, 99)),
+        'legit_max_us': float(latencies.max()),
+        'flood_replies_per_s': flood_replies / flood_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Modbus server throughput and latency under a local DoS flood')
+    parser.add_argument('--flooders', type=int, nargs='+', default=[0, 1, 4],
+                        help='Numbers of flooding processes to try')
+    parser.add_argument('--connections', type=int, default=16,
+                        help='Connections per flooding process')
+    parser.add_argument('--duration', type=float, default=2.0,
+                        help='Seconds to measure each setting')
+    args = parser.parse_args()
+
+    print(f"{'flood conns':>12}{'reads/s':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>11}{'flood replies/s':>17}")
+    for flooders in args.flooders:
+        stats = measure(flooders, args.connections, args.duration)
+        print(f"{stats['flood_connections']:>12}{stats['legit_reads_per_s']:>10.0f}{stats['legit_p50_us']:>10.0f}"
+              f"{stats['legit_p99_us']:>10.0f}{stats['legit_max_us']:>11.0f}{stats['flood_replies_per_s']:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
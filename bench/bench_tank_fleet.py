@@ -0,0 +1,39 @@
+# secure-sim/bench/bench_tank_fleet.py
+import sys
+import os
+import time
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from process_sim.tank_fleet import TankFleet
+
+
+def bench_fleet_update(size, min_time=1.0):
+    """Measure tank-steps per second for a fleet of the given size"""
+    fleet = TankFleet(size, capacity=100.0, initial_level=50.0)
+    fleet.set_inflow(2.0)
+    fleet.set_outflow(1.9)
+    
+    # Warm up once so allocation and page faults are not timed
+    fleet.update(dt=1.0)
+    
+    steps = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        fleet.update(dt=1.0)
+        steps += 1
+        elapsed = time.perf_counter() - start
+    
+    return size * steps / elapsed
+
+
+def main():
+    for size in (1_000, 100_000, 1_000_000):
+        rate = bench_fleet_update(size)
+        print(f"TankFleet({size:>9,}): {rate:>16,.0f} tank-steps/s")
+
+
+if __name__ == "__main__":
+    main()
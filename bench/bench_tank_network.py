@@ -0,0 +1,47 @@
+# secure-sim/bench/bench_tank_network.py
+import sys
+import os
+import time
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from process_sim.tank_network import TankNetwork
+
+
+def build_network(size, seed=0):
+    """A cascade with random cross-connections, about two pipes per tank"""
+    rng = np.random.default_rng(seed)
+    network = TankNetwork.cascade(size, conductance=0.2, initial_level=50.0)
+    network.add_pipes(rng.integers(0, size, size), rng.integers(-1, size, size), 0.05)
+    network.set_inflow(rng.uniform(0.0, 2.0, size))
+    return network
+
+
+def bench_network_update(size, min_time=1.0):
+    """Measure milliseconds per tick for a network of the given size"""
+    network = build_network(size)
+    
+    # Warm up once so allocation and page faults are not timed
+    network.update(dt=1.0)
+    
+    steps = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        network.update(dt=1.0)
+        steps += 1
+        elapsed = time.perf_counter() - start
+    
+    return 1000.0 * elapsed / steps
+
+
+def main():
+    for size in (10_000, 100_000, 1_000_000):
+        ms = bench_network_update(size)
+        print(f"TankNetwork({size:>9,} nodes, {2 * size:>9,} pipes): {ms:>8.3f} ms/tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+# secure-sim/bench/run_benchmarks.py
+import sys
+import os
+import io
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+import numpy as np
+
+# Add the parent directory to path to allow imports
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from process_sim.water_tank import WaterTank
+from process_sim.clock import sim_clock
+from defenses.anomaly_detection import AnomalyDetector
+from defenses.authentication import CommandAuthenticator
+from defenses.event_bus import EventBus
+
+
+def timed_loop(func, min_time):
+    """Call func repeatedly for at least min_time seconds and return calls per second"""
+    func()  # Warm up
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        for _ in range(100):
+            func()
+        calls += 100
+        elapsed = time.perf_counter() - start
+    return calls / elapsed
+
+
+def latency_stats(samples_ns):
+    """Summarize per-call latencies given in nanoseconds as microseconds"""
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1000.0
+    return {
+        'p50_us': float(np.percentile(samples, 50)),
+        'p99_us': float(np.percentile(samples, 99)),
+        'max_us': float(samples.max()),
+        'mean_us': float(samples.mean()),
+    }
+
+
+def result(value, unit, higher_is_better, **details):
+    """One benchmark result; value is what --compare checks"""
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better, **details}
+
+
+def bench_water_tank_update(min_time):
+    """WaterTank.update throughput"""
+    tank = WaterTank(capacity=100.0, initial_level=50.0)
+    tank.set_inflow(2.0)
+    tank.set_outflow(1.9)
+    return result(timed_loop(tank.update, min_time), 'updates/s', True)
+
+
+def bench_anomaly_detector(min_time):
+    """AnomalyDetector.add_observation per-sample latency"""
+    detector = AnomalyDetector(window_size=20)
+    rng = np.random.default_rng(0)
+    values = (50 + rng.normal(0, 1, 100_000)).tolist()
+    latencies = []
+    clock = time.perf_counter_ns
+    deadline = time.perf_counter() + min_time
+    i = 0
+    while time.perf_counter() < deadline or i < 1000:
+        value = values[i % len(values)]
+        start = clock()
+        detector.add_observation(value)
+        latencies.append(clock() - start)
+        i += 1
+    stats = latency_stats(latencies)
+    return result(stats['p50_us'], 'us/sample (p50)', False, samples=i, **stats)
+
+
+def bench_authenticate_command(min_time):
+    """CommandAuthenticator.authenticate_command throughput for fresh valid commands
+
+    A command is only accepted once, so distinct commands are signed up
+    front and the replay cache is cleared whenever they run out.
+    """
+    sim_clock.set_virtual(True, start_time=0.0)
+    try:
+        authenticator = CommandAuthenticator()
+        commands = [authenticator.sign_command("get_backup_reading") for _ in range(10_000)]
+
+        def signed_commands():
+            while True:
+                authenticator.reset()
+                yield from commands
+
+        next_command = signed_commands().__next__
+        ops = timed_loop(lambda: authenticator.authenticate_command(*next_command()), min_time)
+    finally:
+        sim_clock.set_virtual(False)
+    return result(ops, 'ops/s', True)
+
+
+def bench_authenticate_batch(batch_size, min_time):
+    """CommandAuthenticator.authenticate_batch throughput, per command, for fresh valid commands"""
+    sim_clock.set_virtual(True, start_time=0.0)
+    try:
+        authenticator = CommandAuthenticator()
+        batch = [authenticator.sign_command("set_valve") for _ in range(batch_size)]
+
+        def authenticate():
+            authenticator.reset()
+            authenticator.authenticate_batch(batch)
+
+        batches = timed_loop(authenticate, min_time)
+    finally:
+        sim_clock.set_virtual(False)
+    return result(batches * batch_size, 'ops/s', True, batch_size=batch_size)
+
+
+def bench_replay_flood(rate, replays, duration):
+    """authenticate_command under a replay flood, on the virtual clock
+
+    Fresh commands arrive at rate per second of simulation time and each
+    one is replayed right away replays times. Reports the throughput over
+    all calls and the peak number of remembered signatures, which levels
+    off at rate * (time window + bucket width) + 1 however long the flood.
+    """
+    sim_clock.set_virtual(True, start_time=0.0)
+    try:
+        authenticator = CommandAuthenticator()
+        step = 1.0 / rate
+        commands = int(rate * duration)
+        accepted = peak_entries = 0
+        start = time.perf_counter()
+        for _ in range(commands):
+            sim_clock.advance(step)
+            command = authenticator.sign_command("get_backup_reading")
+            for _ in range(1 + replays):
+                accepted += authenticator.authenticate_command(*command)
+            peak_entries = max(peak_entries, authenticator.seen_count)
+        elapsed = time.perf_counter() - start
+        # Memory held by the cache at the end of the flood, signatures included
+        cache_bytes = sum(sys.getsizeof(bucket) + sum(map(sys.getsizeof, bucket))
+                          for bucket in authenticator.seen.values())
+    finally:
+        sim_clock.set_virtual(False)
+
+    calls = commands * (1 + replays)
+    # One more entry than the window holds: the command at the bucket boundary
+    ceiling = int(rate * (authenticator.time_window + authenticator.bucket_width)) + 1
+    return result(calls / elapsed, 'ops/s', True, commands=commands, replays_rejected=calls - accepted,
+                  accepted=accepted, peak_cache_entries=peak_entries, cache_ceiling=ceiling,
+                  cache_mb=cache_bytes / 1e6)
+
+
+def bench_api_water_level(backlog, min_time):
+    """/api/water-level latency with a backlog of events on the bus
+
+    The endpoint reads the in-process event bus rather than the log file,
+    so the backlog is published to the bus. The first request consumes the
+    whole backlog; the steady state measures full and ?since= responses
+    while the simulation keeps publishing one tick of events per request.
+    """
+    from scada_ui import dashboard
+
+    bus = EventBus(capacity=max(backlog, 4096))
+    dashboard.event_bus = bus
+    dashboard.event_cursor = 0
+    dashboard.defense_events.clear()
+    client = dashboard.app.test_client()
+
+    def publish_tick(i):
+        bus.publish('sample', level=50.0 + i % 7, actual_level=50.0, timestamp='12:00:00')
+        if i % 10 == 0:
+            bus.publish('defense', message=f"Anomaly detection identified replay attack {i}")
+        if i % 1000 == 0:
+            bus.publish_phase(f"Phase {i // 1000}", "ATTACK")
+
+    # Published in ticks, each one sample event plus occasional defense and phase events
+    i = 0
+    while bus.last_seq < backlog:
+        publish_tick(i)
+        i += 1
+
+    start = time.perf_counter_ns()
+    client.get('/api/water-level')
+    first_request_ns = time.perf_counter_ns() - start
+
+    full, delta = [], []
+    deadline = time.perf_counter() + min_time
+    while time.perf_counter() < deadline or len(full) < 20:
+        publish_tick(i)
+        i += 1
+        start = time.perf_counter_ns()
+        client.get('/api/water-level')
+        full.append(time.perf_counter_ns() - start)
+
+        cursor = bus.last_seq
+        publish_tick(i)
+        i += 1
+        start = time.perf_counter_ns()
+        client.get(f'/api/water-level?since={cursor}')
+        delta.append(time.perf_counter_ns() - start)
+
+    full_stats = latency_stats(full)
+    return result(full_stats['p50_us'] / 1000.0, 'ms (p50)', False,
+                  backlog_events=bus.last_seq,
+                  first_request_ms=first_request_ns / 1e6,
+                  full=full_stats, since=latency_stats(delta))
+
+
+def bench_command_channel(commands_per_tick, min_time):
+    """Per-command cost of routing actuator commands through the signed CommandChannel
+
+    Every tick sets the inflow of each tank of a fleet, once directly and
+    once through the channel (queue, batch sign, batch verify, apply). The
+    value is the overhead the channel adds per command.
+    """
+    from process_sim.tank_fleet import TankFleet
+    from control_logic.command_channel import CommandChannel
+
+    sim_clock.set_virtual(True, start_time=0.0)
+    try:
+        fleet = TankFleet(commands_per_tick)
+        channel = CommandChannel(fleet, CommandAuthenticator())
+        actuators = [channel.actuator(i) for i in range(commands_per_tick)]
+        rates = np.random.default_rng(0).uniform(0, 5, commands_per_tick).tolist()
+
+        def direct_tick():
+            for i, rate in enumerate(rates):
+                fleet.set_inflow(rate, i)
+
+        def secured_tick():
+            sim_clock.advance(1.0)  # Let the replay cache expire like a running simulation
+            for actuator, rate in zip(actuators, rates):
+                actuator.set_inflow(rate)
+            channel.flush()
+
+        direct_ticks = timed_loop(direct_tick, min_time / 10)
+        secured_ticks = timed_loop(secured_tick, min_time)
+    finally:
+        sim_clock.set_virtual(False)
+
+    direct_us = 1e6 / direct_ticks / commands_per_tick
+    secured_us = 1e6 / secured_ticks / commands_per_tick
+    return result(secured_us - direct_us, 'us/command overhead', False,
+                  commands_per_tick=commands_per_tick, rejected=channel.rejected, direct_us=direct_us, secured_us=secured_us,
+                  secured_tick_ms=secured_us * commands_per_tick / 1000)
+
+
+def bench_headless_ticks(duration):
+    """End-to-end headless simulation ticks per second on the virtual clock"""
+    from main import simulation_loop
+    from attacks.base import create_attacks
+    from control_logic.control import Controller
+    from control_logic.command_channel import CommandChannel
+
+    random.seed(0)
+    sim_clock.set_virtual(True, start_time=0.0)
+    try:
+        tank = WaterTank(capacity=100.0, initial_level=10.0)
+        command_channel = CommandChannel(tank, CommandAuthenticator())
+        controller = Controller(command_channel.actuator(), setpoint=50.0)
+        attacks = create_attacks(tank)
+        # The loop prints every tick; measure the simulation, not the terminal
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Let the attacks observe what they need (the replay capture) before timing
+            warmup = max(attack.warmup for attack in attacks.values())
+            simulation_loop(tank, attacks, True, False, controller=controller, duration=warmup,
+                            command_channel=command_channel)
+            for attack in attacks.values():
+                attack.start()
+            start = time.perf_counter()
+            simulation_loop(tank, attacks, True, False, controller=controller, duration=duration,
+                            command_channel=command_channel)
+        elapsed = time.perf_counter() - start
+    finally:
+        sim_clock.set_virtual(False)
+    return result(duration / elapsed, 'ticks/s', True, ticks=int(duration), attacks='all', defenses=True)
+
+
+def bench_modbus_reads(flooders, min_time):
+    """Modbus level-read latency over localhost TCP, optionally under a flood of 16 connections per flooder"""
+    from bench.bench_modbus import measure
+    stats = measure(flooders, connections=16, duration=min_time)
+    return result(stats['legit_p50_us'], 'us/read (p50)', False, **stats)
+
+
+def git_commit():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(quick=False):
+    """Run every benchmark and return the JSON-ready report"""
+    min_time = 0.2 if quick else 1.0
+    results = {}
+    results['water_tank_update'] = bench_water_tank_update(min_time)
+    results['anomaly_detector_add_observation'] = bench_anomaly_detector(min_time)
+    results['authenticate_command'] = bench_authenticate_command(min_time)
+    results['authenticate_batch_1000'] = bench_authenticate_batch(1000, min_time)
+    results['authenticate_replay_flood'] = bench_replay_flood(20_000, 5, 10 if quick else 30)
+    for backlog in (1_000, 100_000, 1_000_000):
+        results[f'api_water_level_{backlog}'] = bench_api_water_level(backlog, min_time)
+    results['command_channel_1000'] = bench_command_channel(1000, min_time)
+    results['modbus_read_idle'] = bench_modbus_reads(0, min_time)
+    results['modbus_read_flood_16'] = bench_modbus_reads(1, min_time)
+    results['headless_ticks'] = bench_headless_ticks(2_000 if quick else 20_000)
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'quick': quick,
+        },
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Print the change of every benchmark against a baseline and return the regressions"""
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        ratio = current['value'] / previous['value']
+        # Express every change so that positive is better
+        change = ratio - 1 if current['higher_is_better'] else 1 / ratio - 1
+        flag = ''
+        if change < -threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<36}{previous['value']:>14.4g}{current['value']:>14.4g} {current['unit']:<16}{change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the SecureSim benchmark suite')
+    parser.add_argument('--output', default=None,
+                        help='JSON file for the results (default: bench/results/<timestamp>.json)')
+    parser.add_argument('--compare', metavar='BASELINE', default=None,
+                        help='Compare against an earlier results file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Fractional slowdown reported as a regression (default: 0.2)')
+    parser.add_argument('--quick', action='store_true',
+                        help='Shorter runs, for a rough check')
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(ROOT, 'bench', 'results', time.strftime('%Y%m%d-%H%M%S') + '.json')
+    output = os.path.abspath(output)
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+
+    # Importing the dashboard resets data/simulation.log relative to the working
+    # directory, so run from a scratch directory and keep the repo's log intact
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            os.makedirs('data')
+            report = run_all(quick=args.quick)
+        finally:
+            os.chdir(ROOT)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, entry in report['results'].items():
+        print(f"{name:<36}{entry['value']:>14.4g} {entry['unit']}")
+    print(f"\nResults written to {output}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {baseline_path}:")
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# secure-sim/control_logic/batch_control.py
+import numpy as np
+
+
+def _per_tank(value, size):
+    """Broadcast a scalar or array-like parameter to one float per tank"""
+    return np.array(np.broadcast_to(np.asarray(value, dtype=np.float64), (size,)))
+
+
+class BatchController:
+    """Vectorized P/PI/PID controller for a whole array of tanks
+
+    Computes the inflow for every tank in one step. It has no thread of its
+    own: call step() from the same tick that advances the TankFleet.
+    """
+    def __init__(self, size, setpoint=50.0, kp=0.1, ki=0.0, kd=0.0, bias=2.5,
+                 output_min=0.0, output_max=5.0, outflow=1.0):
+        self.size = size
+        # Per-tank setpoints and gains (scalars are broadcast to every tank)
+        self.setpoint = _per_tank(setpoint, size)
+        self.kp = _per_tank(kp, size)
+        self.ki = _per_tank(ki, size)
+        self.kd = _per_tank(kd, size)
+        # Output offset and limits (the single-tank Controller uses 2.5 in [0, 5])
+        self.bias = _per_tank(bias, size)
+        self.output_min = _per_tank(output_min, size)
+        self.output_max = _per_tank(output_max, size)
+        self.outflow = _per_tank(outflow, size)
+
+        # Controller state
+        self.integral = np.zeros(size, dtype=np.float64)
+        self.prev_error = np.zeros(size, dtype=np.float64)
+        self.has_prev_error = False
+
+    def reset(self):
+        """Clear integral and derivative state"""
+        self.integral.fill(0.0)
+        self.prev_error.fill(0.0)
+        self.has_prev_error = False
+
+    def compute(self, levels, dt=1.0):
+        """Compute the limited control output for every tank"""
+        # Calculate error (difference from setpoint)
+        error = self.setpoint - levels
+
+        # Derivative term is zero on the first step to avoid a kick
+        if self.has_prev_error:
+            derivative = (error - self.prev_error) / dt
+        else:
+            derivative = np.zeros_like(error)
+
+        # Tentatively integrate and compute the unlimited output
+        integral = self.integral + error * dt
+        output = self.bias + self.kp * error + self.ki * integral + self.kd * derivative
+
+        # Anti-windup: stop integrating where the output is saturated and the
+        # error would push it further into saturation
+        windup = ((output > self.output_max) & (error > 0)) | ((output < self.output_min) & (error < 0))
+        np.copyto(self.integral, integral, where=~windup)
+        output -= np.where(windup, self.ki * error * dt, 0.0)
+
+        # Remember the error for the next derivative term
+        self.prev_error[:] = error
+        self.has_prev_error = True
+
+        # Apply output limits
+        return np.clip(output, self.output_min, self.output_max)
+
+    def step(self, fleet, dt=1.0):
+        """Run one control iteration over a TankFleet and return the new inflows"""
+        new_inflow = self.compute(fleet.get_levels(), dt)
+        fleet.set_inflow(new_inflow)
+
+        # Keep outflow constant
+        fleet.set_outflow(self.outflow)
+        return new_inflow
@@ -0,0 +1,132 @@
+# secure-sim/control_logic/command_channel.py
+import logging
+import threading
+from collections import deque
+from defenses.authentication import command_authenticator
+
+
+# Actuator methods that can be commanded over the channel
+ACTUATOR_ACTIONS = ('set_inflow', 'set_outflow')
+
+
+def encode_command(action, value, index=None):
+    """Command string for an actuator call, e.g. 'set_inflow 3 2.5' ('*' for the whole tank)"""
+    if action not in ACTUATOR_ACTIONS:
+        raise ValueError(f"Unknown actuator action '{action}', expected one of {', '.join(ACTUATOR_ACTIONS)}")
+    target = '*' if index is None else int(index)
+    # repr() round-trips floats exactly, so the tank gets the value that was sent
+    return f"{action} {target} {float(value)!r}"
+
+
+def decode_command(command):
+    """Inverse of encode_command: (action, value, index)"""
+    action, target, value = command.split(' ')
+    if action not in ACTUATOR_ACTIONS:
+        raise ValueError(f"Unknown actuator action '{action}'")
+    return action, float(value), None if target == '*' else int(target)
+
+
+class CommandChannel:
+    """Signed command path from controllers to the tank's actuators
+
+    Senders queue set_inflow/set_outflow commands during a tick. flush()
+    signs everything queued as one batch, puts it on the wire, verifies
+    everything on the wire as one batch and applies only the commands that
+    pass, in order. Anything else on the wire (see inject()) is verified
+    the same way, so forged and replayed commands never reach the tank.
+    Works with a WaterTank or, with per-tank indices, a TankFleet or
+    TankNetwork. Commands may be sent from other threads (e.g. the Modbus
+    server) while the simulation flushes.
+    """
+    def __init__(self, tank, authenticator=None):
+        self.tank = tank
+        self.authenticator = authenticator or command_authenticator
+        self.outbox = []  # Command strings queued this tick
+        self.wire = deque()  # Signed (command, timestamp, signature) tuples awaiting delivery
+        self.lock = threading.Lock()  # Guards the outbox and the wire
+        self.sent = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    def send(self, action, value, index=None):
+        """Queue an actuator command; it takes effect at the next flush()"""
+        command = encode_command(action, value, index)
+        with self.lock:
+            self.outbox.append(command)
+
+    def transmit(self):
+        """Sign everything queued and put it on the wire"""
+        with self.lock:
+            outbox, self.outbox = self.outbox, []
+        if outbox:
+            signed = self.authenticator.sign_batch(outbox)
+            with self.lock:
+                self.wire.extend(signed)
+                self.sent += len(outbox)
+
+    def inject(self, command, timestamp, signature):
+        """Put a raw command on the wire, as an attacker on the network would"""
+        with self.lock:
+            self.wire.append((command, timestamp, signature))
+
+    def deliver(self):
+        """Verify everything on the wire and apply the accepted commands; return how many"""
+        with self.lock:
+            batch = list(self.wire)
+            self.wire.clear()
+        if not batch:
+            return 0
+        verdicts = self.authenticator.authenticate_batch(batch)
+
+        applied = 0
+        for (command, _, _), authentic in zip(batch, verdicts):
+            if not authentic:
+                continue
+            try:
+                action, value, index = decode_command(command)
+            except ValueError:
+                # Signed but malformed: the sender is broken, not an attacker
+                logging.warning(f"Command rejected: Malformed command {command}")
+                continue
+            actuate = getattr(self.tank, action)
+            if index is None:
+                actuate(value)
+            else:
+                actuate(value, index)
+            applied += 1
+        self.accepted += applied
+        self.rejected += len(batch) - applied
+        return applied
+
+    def flush(self):
+        """Sign and deliver this tick's commands"""
+        self.transmit()
+        return self.deliver()
+
+    def actuator(self, index=None):
+        """WaterTank-compatible handle whose actuation goes through this channel"""
+        return SignedActuator(self, index)
+
+
+class SignedActuator:
+    """Stands in for a tank (or one tank of a fleet) in front of a controller
+
+    Readings and attributes come straight from the tank; set_inflow and
+    set_outflow are queued on the channel as signed commands.
+    """
+    def __init__(self, channel, index=None):
+        self.channel = channel
+        self.index = index
+        self.target = channel.tank if index is None else channel.tank.tank(index)
+
+    def set_inflow(self, rate):
+        """Queue a signed inflow command"""
+        self.channel.send('set_inflow', rate, self.index)
+
+    def set_outflow(self, rate):
+        """Queue a signed outflow command"""
+        self.channel.send('set_outflow', rate, self.index)
+
+    def __getattr__(self, name):
+        # Everything else (get_level, capacity, ...) is read from the tank itself
+        return getattr(self.target, name)
@@ -5,9 +5,10 @@ import threading
 
 class Controller:
     """Simple proportional controller for water tank level"""
-    def __init__(self, tank, setpoint=50.0):
+    def __init__(self, tank, setpoint=50.0, kp=0.1):
         self.tank = tank
         self.setpoint = setpoint
+        self.kp = kp  # Proportional gain
         self.running = True
         self.manual_control = False
 
@@ -15,27 +16,32 @@ class Controller:
         """Enable or disable automatic control"""
         self.manual_control = enabled
 
+    def step(self):
+        """Run a single control iteration"""
+        # Only control automatically if manual control is disabled
+        if self.manual_control:
+            return
+        
+        # Get current tank level
+        current_level = self.tank.get_level()
+        
+        # Calculate error (difference from setpoint)
+        error = self.setpoint - current_level
+        
+        # Simple proportional control
+        control_signal = self.kp * error
+        
+        # Adjust inflow based on control signal (limit between 0 and 5)
+        new_inflow = max(0, min(5, control_signal + 2.5))
+        self.tank.set_inflow(new_inflow)
+        
+        # Keep outflow constant
+        self.tank.set_outflow(1.0)
+
     def control_loop(self):
         """Main control loop that adjusts inflow to maintain setpoint"""
         while self.running:
-            # Only control automatically if manual control is disabled
-            if not self.manual_control:
-                # Get current tank level
-                current_level = self.tank.get_level()
-                
-                # Calculate error (difference from setpoint)
-                error = self.setpoint - current_level
-                
-                # Simple proportional control
-                kp = 0.1  # Proportional gain
-                control_signal = kp * error
-                
-                # Adjust inflow based on control signal (limit between 0 and 5)
-                new_inflow = max(0, min(5, control_signal + 2.5))
-                self.tank.set_inflow(new_inflow)
-                
-                # Keep outflow constant
-                self.tank.set_outflow(1.0)
+            self.step()
             
             # Sleep to control loop rate
             time.sleep(1)
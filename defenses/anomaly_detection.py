@@ -1,8 +1,51 @@
 # secure-sim/defenses/anomaly_detection.py
 import logging
-import time
 import numpy as np
 from collections import deque
+from itertools import islice
+from process_sim.clock import sim_clock
+
+
+class RollingStats:
+    """Running mean and variance over a sliding window (Welford with removal)"""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+        
+    def add(self, value):
+        """Add a value to the window"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        
+    def remove(self, value):
+        """Remove a value that was previously added"""
+        if self.count <= 1:
+            self.reset()
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (value - self.mean)
+        # Rounding can leave a tiny negative sum after removals
+        if self.m2 < 0.0:
+            self.m2 = 0.0
+            
+    def reset(self, values=()):
+        """Clear the statistics, optionally recomputing them from values"""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        for value in values:
+            self.add(value)
+            
+    def std(self):
+        """Population standard deviation (same as np.std)"""
+        if self.count == 0:
+            return 0.0
+        return (self.m2 / self.count) ** 0.5
 
 
 class AnomalyDetector:
@@ -16,24 +59,53 @@ class AnomalyDetector:
         self.z_score_threshold = 2.5  # Number of standard deviations for anomaly
         self.min_samples = 5  # Minimum samples needed before detection starts
         
+        # Running statistics over the history, excluding the newest value
+        self.stats = RollingStats()
+        self.constant_run = 0  # Trailing run of identical values in that window
+        self.resync_interval = 1000  # Observations between exact recomputations
+        self.observations_since_resync = 0
+        
     def add_observation(self, value):
         """Add a new observation and check for anomalies"""
+        # The previous newest value becomes part of the reference window
+        if self.level_history:
+            self.stats.add(self.level_history[-1])
+            if len(self.level_history) > 1 and self.level_history[-1] == self.level_history[-2]:
+                self.constant_run += 1
+            else:
+                self.constant_run = 1
+            if len(self.level_history) == self.window_size:
+                # The oldest value is about to fall out of the window
+                self.stats.remove(self.level_history[0])
+        
         # Add the value to history
         self.level_history.append(value)
         
+        # Periodically recompute the sums exactly so rounding error cannot drift
+        self.observations_since_resync += 1
+        if self.observations_since_resync >= self.resync_interval:
+            self.stats.reset(islice(self.level_history, len(self.level_history) - 1))
+            self.observations_since_resync = 0
+        
         # Run anomaly checks if we have enough data
         if len(self.level_history) >= self.min_samples:
             return self.check_anomalies(value)
         return None
         
+    def get_window_stats(self):
+        """Return mean and standard deviation of the history, excluding the current value"""
+        # A window of identical values has exactly zero spread, even if
+        # removing earlier values left rounding residue in the running sums
+        if self.stats.count and self.constant_run >= self.stats.count:
+            return self.level_history[-2], 0.0
+        return self.stats.mean, self.stats.std()
+        
     def check_anomalies(self, current_value):
         """Check for anomalies in the data using z-score method"""
         anomalies = []
         
         # Calculate mean and standard deviation of historical values
-        history_list = list(self.level_history)[:-1]  # Exclude current value
-        level_mean = np.mean(history_list)
-        level_std = np.std(history_list)
+        level_mean, level_std = self.get_window_stats()
         
         # Prevent division by zero
         if level_std > 0:
@@ -46,7 +118,7 @@ class AnomalyDetector:
                     'type': 'level_outlier',
                     'value': current_value,
                     'z_score': z_score,
-                    'timestamp': time.time()
+                    'timestamp': sim_clock.time()
                 }
                 anomalies.append(anomaly)
                 logging.warning(f"Anomaly detected: Level outlier with z-score {z_score:.2f}")
@@ -66,5 +138,112 @@ class AnomalyDetector:
         self.detected_anomalies = []
 
 
+class MultiStreamAnomalyDetector:
+    """Vectorized z-score anomaly detector for many sensors at once
+
+    Uses the same z-score rule as AnomalyDetector, but keeps the recent
+    readings of every sensor in one (sensors x window) ring buffer and scores
+    a whole batch of readings per tick.
+    """
+    def __init__(self, num_sensors, window_size=20):
+        self.num_sensors = num_sensors
+        self.window_size = window_size
+        self.buffer = np.zeros((num_sensors, window_size), dtype=np.float64)
+        self.head = 0  # Column the next batch of readings is written to
+        self.count = 0  # Readings currently stored per sensor
+        
+        # Statistical threshold parameters
+        self.z_score_threshold = 2.5  # Number of standard deviations for anomaly
+        self.min_samples = 5  # Minimum samples needed before detection starts
+        
+        # Running statistics over the history, excluding the newest readings
+        self.stats_count = 0
+        self.mean = np.zeros(num_sensors, dtype=np.float64)
+        self.m2 = np.zeros(num_sensors, dtype=np.float64)
+        self.constant_run = np.zeros(num_sensors, dtype=np.int64)
+        self.resync_interval = 1000  # Ticks between exact recomputations
+        self.ticks_since_resync = 0
+        
+        # Results of the most recent tick and per-sensor totals
+        self.z_scores = np.zeros(num_sensors, dtype=np.float64)
+        self.anomaly_counts = np.zeros(num_sensors, dtype=np.int64)
+        
+    def add_observations(self, readings):
+        """Add one reading per sensor and return the indices of anomalous sensors"""
+        readings = np.asarray(readings, dtype=np.float64)
+        window = self.window_size
+        
+        # The previous newest readings become part of the reference window
+        if self.count > 0:
+            newest = self.buffer[:, (self.head - 1) % window]
+            if self.count > 1:
+                repeated = newest == self.buffer[:, (self.head - 2) % window]
+                self.constant_run = np.where(repeated, self.constant_run + 1, 1)
+            else:
+                self.constant_run.fill(1)
+            
+            if self.count == window:
+                # Replace the oldest reading with the newest one in a single update
+                oldest = self.buffer[:, self.head]
+                delta = newest - oldest
+                new_mean = self.mean + delta / self.stats_count
+                self.m2 += delta * (newest - new_mean + oldest - self.mean)
+                self.mean = new_mean
+            else:
+                # Welford update while the window is still filling
+                self.stats_count += 1
+                delta = newest - self.mean
+                self.mean += delta / self.stats_count
+                self.m2 += delta * (newest - self.mean)
+            np.maximum(self.m2, 0.0, out=self.m2)
+        
+        # Store the new readings
+        self.buffer[:, self.head] = readings
+        self.head = (self.head + 1) % window
+        self.count = min(self.count + 1, window)
+        
+        # Periodically recompute the sums exactly so rounding error cannot drift
+        self.ticks_since_resync += 1
+        if self.ticks_since_resync >= self.resync_interval:
+            self.resync()
+        
+        # Run anomaly checks if we have enough data
+        if self.count < self.min_samples:
+            return np.empty(0, dtype=np.intp)
+        return self.check_anomalies(readings)
+        
+    def check_anomalies(self, readings):
+        """Score the current readings and return the indices of anomalous sensors"""
+        level_std = np.sqrt(self.m2 / self.stats_count)
+        level_mean = self.mean
+        
+        # Windows of identical values have exactly zero spread
+        constant = self.constant_run >= self.stats_count
+        if constant.any():
+            level_std[constant] = 0.0
+            level_mean = np.where(constant, self.buffer[:, (self.head - 2) % self.window_size], level_mean)
+        
+        # Calculate z-scores, leaving sensors with zero spread at zero
+        self.z_scores.fill(0.0)
+        np.divide(np.abs(readings - level_mean), level_std, out=self.z_scores, where=level_std > 0)
+        
+        anomalous = np.flatnonzero(self.z_scores > self.z_score_threshold)
+        if anomalous.size:
+            self.anomaly_counts[anomalous] += 1
+            logging.warning(f"Anomaly detected: Level outliers on {anomalous.size} sensors")
+        return anomalous
+        
+    def resync(self):
+        """Recompute the window statistics exactly from the ring buffer"""
+        self.ticks_since_resync = 0
+        if self.count < 2:
+            return
+        # Every stored column except the newest one
+        columns = (self.head - 1 - np.arange(1, self.count)) % self.window_size
+        history = self.buffer[:, columns]
+        self.mean = history.mean(axis=1)
+        self.m2 = ((history - self.mean[:, None]) ** 2).sum(axis=1)
+
+
 # Singleton instance
 anomaly_detector = AnomalyDetector()
\ No newline at end of file
@@ -1,58 +1,163 @@
 # secure-sim/defenses/authentication.py
-import time
 import hmac
+import math
 import hashlib
 import logging
+import threading
+from collections import Counter
+import numpy as np
+from process_sim.clock import sim_clock
 
 
 class CommandAuthenticator:
-    """Simple HMAC-based command authentication system"""
-    def __init__(self):
+    """Simple HMAC-based command authentication system
+
+    Every accepted signature is remembered until its timestamp falls out of
+    the time window, so a signed command is accepted at most once. The seen
+    signatures are kept in buckets by timestamp; a replay is found with one
+    dict and one set lookup before any HMAC is computed, and whole buckets
+    are dropped as the window slides past them.
+
+    The keyed HMAC state is computed once and cloned for every message, and
+    signatures are compared as raw digests.
+    """
+    def __init__(self, time_window=5, bucket_width=1.0, max_entries=250_000):
         # Shared secret key (in a real system, this would be securely stored)
         self.shared_secret = "90fcf5e4-e1be-4390-867a-4bf82be7b13f"
-        self.time_window = 5  # Time window in seconds for valid commands
-        
+        # HMAC state with the key pads already applied; each message updates a copy
+        self.key_state = hmac.new(self.shared_secret.encode(), digestmod=hashlib.sha256)
+        self.time_window = time_window  # Time window in seconds for valid commands
+        self.bucket_width = bucket_width
+        self.max_entries = max_entries  # Hard cap on remembered signatures
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all seen signatures, e.g. when a virtual clock restarts"""
+        with self.lock:
+            self.seen = {}  # Bucket index -> signatures accepted with a timestamp in that bucket
+            self.seen_count = 0
+            self.expired_before = -math.inf  # Buckets below this index have been dropped
+            self.last_signed = -math.inf  # Newest timestamp handed out for signing
+
+    def digest(self, command, timestamp):
+        """Raw HMAC-SHA256 digest of a command"""
+        # Combine command and timestamp to create a unique message
+        mac = self.key_state.copy()
+        mac.update(f"{command}|{timestamp}".encode())
+        return mac.digest()
+
     def generate_hmac(self, command, timestamp):
         """Generate an HMAC signature for command authentication"""
-        # Combine command and timestamp to create a unique message
-        message = f"{command}|{timestamp}"
-        
-        # Create HMAC signature using SHA-256
-        signature = hmac.new(
-            self.shared_secret.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        
-        return signature
-        
-    def authenticate_command(self, command, timestamp, signature):
-        """Verify if a command is authentic based on its signature"""
+        return self.digest(command, timestamp).hex()
+
+    def expire(self, current_time):
+        """Drop the buckets that lie entirely before the time window"""
+        cutoff = math.floor((current_time - self.time_window) / self.bucket_width)
+        if cutoff <= self.expired_before:
+            return
+        # Only a handful of buckets are live at once, so a scan is cheap
+        for bucket in [bucket for bucket in self.seen if bucket < cutoff]:
+            self.seen_count -= len(self.seen.pop(bucket))
+        self.expired_before = cutoff
+
+    def check(self, command, timestamp, signature, current_time):
+        """Why a command is rejected, or None if it is authentic (call with the lock held)
+
+        An authentic command is remembered, so checking it again rejects it
+        as a replay.
+        """
         # Check if timestamp is within acceptable time window
-        current_time = time.time()
         if abs(current_time - timestamp) > self.time_window:
-            logging.warning(f"Command rejected: Timestamp outside valid window")
-            return False
-            
-        # Calculate the expected signature
-        expected_signature = self.generate_hmac(command, timestamp)
-        
+            return "Timestamp outside valid window"
+        try:
+            digest = bytes.fromhex(signature)
+        except (TypeError, ValueError):
+            return "Invalid signature"
+
+        # A replay carries the same timestamp, so it can only be in this bucket
+        bucket = math.floor(timestamp / self.bucket_width)
+        seen = self.seen.get(bucket)
+        if seen is not None and digest in seen:
+            return "Replayed signature"
+
         # Use constant-time comparison to prevent timing attacks
-        is_authentic = hmac.compare_digest(signature, expected_signature)
-        
-        if is_authentic:
+        if not hmac.compare_digest(digest, self.digest(command, timestamp)):
+            return "Invalid signature"
+
+        if self.seen_count >= self.max_entries:
+            # Fail closed rather than forget signatures that are still valid
+            return "Replay cache full"
+        if seen is None:
+            seen = self.seen[bucket] = set()
+        seen.add(digest)
+        self.seen_count += 1
+        return None
+
+    def authenticate_command(self, command, timestamp, signature):
+        """Verify if a command is authentic based on its signature"""
+        current_time = sim_clock.time()
+        with self.lock:
+            self.expire(current_time)
+            reason = self.check(command, timestamp, signature, current_time)
+
+        if reason is None:
             logging.info(f"Command authenticated: {command}")
-        else:
-            logging.warning(f"Command rejected: Invalid signature for {command}")
-            
-        return is_authentic
-        
+            return True
+        logging.warning(f"Command rejected: {reason} for {command}")
+        return False
+
+    def authenticate_batch(self, commands):
+        """Verify a sequence of (command, timestamp, signature) tuples in one go
+
+        Returns a NumPy bool array with one verdict per command. The clock is
+        read and the lock taken once for the whole batch, and the batch is
+        logged as one line. A command repeated within the batch is a replay
+        of its first copy.
+        """
+        current_time = sim_clock.time()
+        with self.lock:
+            self.expire(current_time)
+            check = self.check
+            reasons = [check(command, timestamp, signature, current_time)
+                       for command, timestamp, signature in commands]
+
+        verdicts = np.fromiter((reason is None for reason in reasons), dtype=bool, count=len(reasons))
+        rejected = len(reasons) - int(verdicts.sum())
+        if rejected:
+            counts = Counter(reason for reason in reasons if reason is not None)
+            details = ", ".join(f"{count} {reason.lower()}" for reason, count in counts.items())
+            logging.warning(f"Command batch: {rejected} of {len(reasons)} rejected ({details})")
+        elif reasons:
+            logging.info(f"Command batch: {len(reasons)} commands authenticated")
+        return verdicts
+
     def sign_command(self, command):
         """Sign a command for sending to the system"""
-        timestamp = time.time()
+        # The timestamp doubles as the nonce, so never sign two commands with
+        # the same one (the virtual clock stands still within a tick), not
+        # even when several threads sign at once
+        with self.lock:
+            timestamp = max(sim_clock.time(), math.nextafter(self.last_signed, math.inf))
+            self.last_signed = timestamp
         signature = self.generate_hmac(command, timestamp)
         return (command, timestamp, signature)
 
+    def sign_batch(self, commands):
+        """Sign a sequence of commands at once, each with its own timestamp"""
+        current_time = sim_clock.time()
+        # Reserve the timestamps under the lock; the HMACs can be computed outside it
+        timestamps = []
+        with self.lock:
+            timestamp = self.last_signed
+            for _ in commands:
+                timestamp = max(current_time, math.nextafter(timestamp, math.inf))
+                timestamps.append(timestamp)
+            self.last_signed = timestamp
+        generate_hmac = self.generate_hmac
+        return [(command, timestamp, generate_hmac(command, timestamp))
+                for command, timestamp in zip(commands, timestamps)]
+
 
 # Singleton instance
-command_authenticator = CommandAuthenticator()
\ No newline at end of file
+command_authenticator = CommandAuthenticator()
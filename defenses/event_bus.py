@@ -0,0 +1,84 @@
+# secure-sim/defenses/event_bus.py
+import threading
+from collections import deque
+from process_sim.clock import sim_clock
+
+
+class EventBus:
+    """Bounded in-process event bus with sequence numbers
+
+    Security events and demo phase changes are published here so readers
+    such as the dashboard can fetch what is new without parsing log files.
+    Samples arrive every tick and soon push the rarer events off the bus,
+    so the newest notices (every kind but samples) and the latest one of
+    each kind are also kept aside and handed to readers that fell behind.
+    """
+    TRANSIENT_KINDS = ('sample',)  # Superseded by the next one, so not kept aside
+
+    def __init__(self, capacity=4096, notice_capacity=100):
+        self.events = deque(maxlen=capacity)  # Oldest events are dropped when full
+        self.notices = deque(maxlen=notice_capacity)  # Newest non-sample events
+        self.latest_notices = {}  # Kind -> newest event of that kind
+        self.last_seq = 0
+        self.current_phase = None
+        self.condition = threading.Condition()
+
+    def publish(self, kind, **data):
+        """Publish an event and return its sequence number"""
+        with self.condition:
+            self.last_seq += 1
+            event = {'seq': self.last_seq, 'kind': kind, 'time': sim_clock.time()}
+            event.update(data)
+            self.events.append(event)
+            if kind not in self.TRANSIENT_KINDS:
+                self.notices.append(event)
+                self.latest_notices[kind] = event
+            self.condition.notify_all()
+            return self.last_seq
+
+    def publish_phase(self, name, phase_type):
+        """Publish a phase change, ignoring repeats of the current phase"""
+        with self.condition:
+            if self.current_phase == (name, phase_type):
+                return None
+            self.current_phase = (name, phase_type)
+            return self.publish('phase', name=name, type=phase_type)
+
+    def events_since(self, seq):
+        """Return events newer than seq, oldest first
+
+        Walks back from the newest event, so the cost is proportional to the
+        number of new events rather than the size of the bus. If events
+        after seq were already dropped, the notices kept aside among them
+        come first, so a late reader still learns the current phase and the
+        recent defense events.
+        """
+        with self.condition:
+            new_events = []
+            for event in reversed(self.events):
+                if event['seq'] <= seq:
+                    break
+                new_events.append(event)
+            first = self.events[0]['seq'] if self.events else self.last_seq + 1
+            missed = []
+            if seq < first - 1:
+                kept = {event['seq']: event for event in self.notices}
+                kept.update((event['seq'], event) for event in self.latest_notices.values())
+                missed = [kept[s] for s in sorted(kept) if seq < s < first]
+        new_events.reverse()
+        return missed + new_events
+
+    def wait_for_events(self, seq, timeout=None):
+        """Block until there are events newer than seq (or timeout) and return them"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.last_seq > seq, timeout)
+        return self.events_since(seq)
+
+    def first_seq(self):
+        """Sequence number of the oldest event still retained"""
+        with self.condition:
+            return self.events[0]['seq'] if self.events else self.last_seq + 1
+
+
+# Singleton instance
+event_bus = EventBus()
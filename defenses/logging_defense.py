@@ -2,7 +2,80 @@
 import logging
 import sys
 import os
+import time
+import queue
+import atexit
 import datetime
+import threading
+from defenses.event_bus import event_bus
+from process_sim.tick_metrics import tick_metrics
+
+
+# Background writer that keeps disk and terminal I/O off the simulation thread
+class AsyncLogWriter:
+    _STOP = object()
+
+    def __init__(self, stream, max_queue=10000, flush_bytes=64 * 1024, flush_interval=0.5):
+        self.stream = stream
+        self.queue = queue.Queue(maxsize=max_queue)  # Bounded so memory cannot grow without limit
+        self.flush_bytes = flush_bytes  # Flush once this much text is pending...
+        self.flush_interval = flush_interval  # ...or this many seconds have passed
+        self.dropped = 0  # Messages discarded because the queue was full
+        self.closed = False
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def write(self, message):
+        """Queue a message without ever blocking the caller"""
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """No-op: flushing happens in batches on the writer thread"""
+
+    def run(self):
+        """Writer thread: collect queued messages and write them in batches"""
+        pending = []
+        pending_bytes = 0
+        last_flush = time.monotonic()
+        stopping = False
+        while not stopping:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self.queue.get(timeout=timeout)
+                # Drain whatever else is already waiting in one go
+                while True:
+                    if item is self._STOP:
+                        stopping = True
+                        break
+                    pending.append(item)
+                    pending_bytes += len(item)
+                    item = self.queue.get_nowait()
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            if stopping or pending_bytes >= self.flush_bytes or now - last_flush >= self.flush_interval:
+                if pending:
+                    self.stream.write(''.join(pending))
+                    self.stream.flush()
+                    pending.clear()
+                    pending_bytes = 0
+                last_flush = now
+
+    def close(self):
+        """Drain every queued message to the stream and stop the writer thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(self._STOP)  # May wait for room, which is fine at shutdown
+        self.thread.join()
+        if self.dropped:
+            self.stream.write(f"[logging] {self.dropped} messages dropped because the log queue was full\n")
+            self.stream.flush()
 
 
 # Console logging forwarder
@@ -10,31 +83,59 @@ class ConsoleLogger:
     def __init__(self, log_file, original_stdout):
         self.log_file = log_file
         self.original_stdout = original_stdout
+        # Both destinations are written from background threads in batches
+        self.file_writer = AsyncLogWriter(log_file)
+        self.console_writer = AsyncLogWriter(original_stdout, flush_interval=0.1)
 
     def write(self, message):
-        self.log_file.write(message)
-        self.original_stdout.write(message)
-        self.log_file.flush()  # Immediately write to file
+        self.file_writer.write(message)
+        self.console_writer.write(message)
 
     def flush(self):
-        self.log_file.flush()
-        self.original_stdout.flush()
+        # Writes are flushed by the background writers on a size or time trigger
+        pass
+
+    def close(self):
+        """Drain pending output to the log file and terminal"""
+        self.file_writer.close()
+        self.console_writer.close()
+
+
+# Writer and handler behind simulation.log, drained by stop_logging()
+log_writer = None
+log_handler = None
 
 
 def setup_logging():
     """Initialize the event logging system"""
+    global log_writer, log_handler
+    
     # Create data directory if needed
     os.makedirs('data', exist_ok=True)
     
-    # Configure logging to file
+    # Configure logging to file through a background writer so log_anomaly
+    # never waits for the disk
+    log_writer = AsyncLogWriter(open('data/simulation.log', 'a'))
+    log_handler = logging.StreamHandler(log_writer)
+    atexit.register(stop_logging)
     logging.basicConfig(
-        filename='data/simulation.log', 
+        handlers=[log_handler],
         level=logging.INFO,
         format='%(asctime)s:%(levelname)s:%(message)s'
     )
     logging.info("Logging initialized.")
 
 
+def stop_logging():
+    """Write out all queued log records and close the log file"""
+    global log_writer, log_handler
+    if log_writer is not None:
+        logging.getLogger().removeHandler(log_handler)
+        writer, log_writer, log_handler = log_writer, None, None
+        writer.close()
+        writer.stream.close()
+
+
 def setup_console_logging():
     """Set up console output logging to file"""
     # Create data directory if needed
@@ -60,8 +161,14 @@ def stop_console_logging(log_file):
     """Clean up console logging"""
     if log_file:
         print(f"Console logging stopped at {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        console_logger = sys.stdout
         sys.stdout = sys.__stdout__  # Restore original stdout
+        
+        # Drain everything still queued before closing the file
+        if isinstance(console_logger, ConsoleLogger):
+            console_logger.close()
         log_file.close()
+    stop_logging()
 
 
 def log_anomaly(message):
@@ -69,5 +176,26 @@ def log_anomaly(message):
     # Handle demo mode messages with type tags
     if "[DEMO]" in message and "[TYPE:" in message:
         logging.warning(message)  # Preserve formatting for UI to parse
+        publish_phase_event(message)
     else:
         logging.warning(f"Anomaly detected: {message}")
+        if "[DEFENSE]" in message:
+            event_bus.publish('defense', message=message.split("[DEFENSE]", 1)[1].strip())
+
+
+def publish_phase_event(message):
+    """Publish a tagged demo message ("[DEMO] Now demonstrating: X [TYPE:ATTACK]") as a phase change"""
+    text, _, type_tag = message.partition("[TYPE:")
+    phase_type = type_tag.split("]")[0]
+    
+    # Strip the [DEMO] tag and the "Now demonstrating:" prefix if present
+    name = text.split("[DEMO]", 1)[1]
+    if "demonstrating:" in name:
+        name = name.split("demonstrating:", 1)[1]
+    event_bus.publish_phase(name.strip(), phase_type)
+
+
+# Console and log output for the simulation loop and the defenses, timed as
+# their own stages when tick metrics are on
+emit = tick_metrics.wrap('print', print)
+log_event = tick_metrics.wrap('log_anomaly', log_anomaly)
@@ -0,0 +1,46 @@
+# secure-sim/defenses/rate_limiting.py
+
+
+class TokenBucket:
+    """Token bucket: refills at rate tokens per second up to burst, and each request takes one"""
+    def __init__(self, rate, burst, t=0.0):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = t
+
+    def allow(self, t):
+        """Take a token for a request at time t, if there is one"""
+        self.tokens = min(self.burst, self.tokens + (t - self.last) * self.rate)
+        self.last = t
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class ClientRateLimiter:
+    """Per-client token buckets in front of a service
+
+    Each client may make rate requests per second with bursts of up to
+    burst. At most max_clients buckets are kept; the oldest is dropped to
+    make room, so a client that is forgotten starts over with a full bucket.
+    """
+    def __init__(self, rate=5.0, burst=10.0, max_clients=10_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.buckets = {}  # Client -> TokenBucket, oldest first
+        self.limited = 0  # Requests turned away so far
+
+    def allow(self, client, t):
+        """Whether a request from client at time t is within its rate"""
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            if len(self.buckets) >= self.max_clients:
+                del self.buckets[next(iter(self.buckets))]
+            bucket = self.buckets[client] = TokenBucket(self.rate, self.burst, t)
+        if bucket.allow(t):
+            return True
+        self.limited += 1
+        return False
@@ -1,39 +1,63 @@
 # secure-sim/main.py
-import time
 import argparse
-import random
 from process_sim.water_tank import WaterTank
+from process_sim.clock import sim_clock
+from process_sim.scheduler import Scheduler
+from process_sim.integrators import INTEGRATORS
+from process_sim.tick_metrics import tick_metrics
 from control_logic.control import Controller
-from attacks.replay_attack import ReplayAttack
-from attacks.false_data_injection import FalseDataInjectionAttack
-from attacks.dos_attack import DoSAttack
-from defenses.logging_defense import setup_logging, log_anomaly, setup_console_logging, stop_console_logging
+from control_logic.command_channel import CommandChannel
+from attacks.base import available_attacks, create_attacks
+from defenses.logging_defense import (setup_logging, log_anomaly, setup_console_logging, stop_console_logging,
+                                      emit, log_event)
 from defenses.anomaly_detection import anomaly_detector
-from defenses.authentication import command_authenticator
-from scada_ui.dashboard import start_dashboard, update_water_level
+from scada_net.modbus import ModbusServer
+from scada_ui.dashboard import start_dashboard, update_water_level, set_history_retention, PHASE_DURATION
+from analysis import montecarlo, sweep, flood_study
+from analysis.run_store import RunWriter, DEFENSE_ACTIVE
 
 
-def simulation_loop(tank, attacks=None, defenses_enabled=False, demo_mode=False):
-    """Simplified main simulation loop"""
+def simulation_loop(tank, attacks=None, defenses_enabled=False, demo_mode=False,
+                    controller=None, duration=None, recorder=None,
+                    control_interval=1.0, sample_interval=1.0, physics_interval=None,
+                    command_channel=None):
+    """Simplified main simulation loop
+
+    Tank physics, the controller and the sensor tick (attacks, defenses, UI
+    and recording) are periodic events on one discrete-event scheduler, each
+    at its own interval; physics defaults to the faster of the other two.
+    The scheduler follows sim_clock, so it runs in real time or, on a virtual
+    clock, as fast as possible. If a controller is passed it is stepped by
+    the scheduler instead of running in its own thread. If duration is set,
+    the loop stops after that many seconds of simulation time. If a recorder
+    (RunWriter) is passed, the state of every sensor tick is appended to it.
+    If the controller actuates through a CommandChannel, pass the channel
+    so its signed commands are delivered right after every controller step.
+    """
     if attacks is None:
         attacks = {}
+    if physics_interval is None:
+        physics_interval = min(control_interval, sample_interval)
 
-    # Simplified demo mode sequence
-    attack_modes = ['none', 'replay', 'false_data', 'dos', 'none_with_defense', 
-                    'replay_with_defense', 'false_data_with_defense', 'dos_with_defense']
+    # Simplified demo mode sequence: every attack without, then with defenses
+    base_modes = ['none'] + list(attacks)
+    attack_modes = base_modes + [f'{mode}_with_defense' for mode in base_modes]
     attack_index = 0
     active_attack = attack_modes[attack_index]
-    attack_start_time = time.time()
-    attack_duration = 15  # seconds per attack mode
+    attack_start_time = sim_clock.time()
+    attack_duration = PHASE_DURATION  # seconds per attack mode, as counted down on the dashboard
     
     # Tracking for defense status
     defense_active = defenses_enabled
-    # Flag to track if we've completed a full demo cycle
-    demo_complete = False
+    loop_start_time = sim_clock.time()
+    scheduler = Scheduler()
     
-    while True:
+    def sensor_tick():
+        """Sample the tank, apply attacks and defenses, and publish the reading"""
+        nonlocal attack_index, active_attack, attack_start_time, defense_active
+        
         # Demo mode attack cycling
-        if demo_mode and time.time() - attack_start_time > attack_duration:
+        if demo_mode and sim_clock.time() - attack_start_time > attack_duration:
             # Stop current attack if running
             current_attack = active_attack.split('_with_defense')[0]
             if current_attack in attacks and current_attack != 'none':
@@ -44,11 +68,11 @@ def simulation_loop(tank, attacks=None, defenses_enabled=False, demo_mode=False)
             
             # Check if we've gone through all attack modes
             if attack_index >= len(attack_modes):
-                print("\n" + "="*60)
-                print("[DEMO COMPLETE] Demonstration has finished")
-                print("[DEMO COMPLETE] All attack and defense scenarios have been shown")
-                print("="*60 + "\n")
-                log_anomaly("[DEMO] Demonstration complete [TYPE:NORMAL]")
+                emit("\n" + "="*60)
+                emit("[DEMO COMPLETE] Demonstration has finished")
+                emit("[DEMO COMPLETE] All attack and defense scenarios have been shown")
+                emit("="*60 + "\n")
+                log_event("[DEMO] Demonstration complete [TYPE:NORMAL]")
                 
                 # Stop all attacks to ensure clean exit
                 for attack in attacks.values():
@@ -56,19 +80,20 @@ def simulation_loop(tank, attacks=None, defenses_enabled=False, demo_mode=False)
                         attack.stop()
                 
                 # Exit the simulation loop
-                break
+                scheduler.stop()
+                return
                 
             active_attack = attack_modes[attack_index]
-            attack_start_time = time.time()
+            attack_start_time = sim_clock.time()
             
             # Check if we're entering defense mode
             with_defense = '_with_defense' in active_attack
             if with_defense and not defense_active:
                 defense_active = True
-                print(f"\n[DEMO] ACTIVATING DEFENSE MECHANISMS")
-                log_anomaly(f"[DEFENSE] Security systems activated - Starting defense monitoring")
+                emit(f"\n[DEMO] ACTIVATING DEFENSE MECHANISMS")
+                log_event(f"[DEFENSE] Security systems activated - Starting defense monitoring")
                 # Extra log specifically for dashboard to detect defense mode
-                log_anomaly(f"[DEMO] Now demonstrating: Defense Active Mode [TYPE:DEFENSE]")
+                log_event(f"[DEMO] Now demonstrating: Defense Active Mode [TYPE:DEFENSE]")
             
             # Start the new attack if needed
             base_attack = active_attack.split('_with_defense')[0] 
@@ -88,11 +113,11 @@ def simulation_loop(tank, attacks=None, defenses_enabled=False, demo_mode=False)
                 attack_type = "ATTACK"
                 
             # Log with explicit type tag for UI to detect
-            log_anomaly(f"[DEMO] Now demonstrating: {display_name} [TYPE:{attack_type}]")
-            print(f"[DEMO] Now demonstrating: {display_name} [{attack_type}]")
+            log_event(f"[DEMO] Now demonstrating: {display_name} [TYPE:{attack_type}]")
+            emit(f"[DEMO] Now demonstrating: {display_name} [{attack_type}]")
         
-        # Update water tank state
-        current_level = tank.update(dt=1)
+        # Sample the water tank state
+        current_level = tank.get_level()
         reported_level = current_level
         
         # Set tank inflow/outflow for demo mode based on the current phase
@@ -113,7 +138,7 @@ def simulation_loop(tank, attacks=None, defenses_enabled=False, demo_mode=False)
                     tank.set_outflow(2.0)
             # Simple oscillation for attack scenarios
             else:
-                phase_time = time.time() - attack_start_time
+                phase_time = sim_clock.time() - attack_start_time
                 if phase_time % 6 < 3:
                     tank.set_inflow(3.0)
                     tank.set_outflow(1.5)
@@ -123,121 +148,223 @@ def simulation_loop(tank, attacks=None, defenses_enabled=False, demo_mode=False)
         
         # Apply attack effects
         with_defense = '_with_defense' in active_attack if demo_mode else defense_active
+        defense_flags = DEFENSE_ACTIVE if with_defense else 0
             
-        # Replay attack
-        if 'replay' in attacks and attacks['replay'].running:
-            reported_level = attacks['replay'].attack_value
-            print(f"[Replay Attack] Spoofed sensor reading: {reported_level}")
-            log_anomaly(f"[DEMO] Now demonstrating: Replay Attack [TYPE:ATTACK]")
-            
-            # Defense: anomaly detection may correct the value
-            if with_defense and random.random() < 0.7:
-                reported_level = current_level * 0.7 + reported_level * 0.3
-                print(f"[DEFENSE] Anomaly detection partially corrected level: {reported_level:.2f}")
-                log_anomaly(f"[DEFENSE] Anomaly detection identified replay attack")
-        
-        # False data injection attack
-        if 'false_data' in attacks and attacks['false_data'].running:
-            reported_level = attacks['false_data'].get_false_reading(reported_level)
-            print(f"[False Data Attack] Manipulated sensor reading: {reported_level}")
-            log_anomaly(f"[DEMO] Now demonstrating: False Data Attack [TYPE:ATTACK]")
-            
-            # Defense: anomaly detection has a chance to partially correct
-            if with_defense and random.random() < 0.5:
-                correction = random.uniform(0.3, 0.8)
-                reported_level = current_level * correction + reported_level * (1-correction)
-                print(f"[DEFENSE] Partially corrected false data: {reported_level:.2f}")
-                log_anomaly(f"[DEFENSE] Anomaly detection identified false data injection")
-        
-        # DoS attack
-        if 'dos' in attacks and attacks['dos'].running:
-            reported_level = attacks['dos'].get_delayed_reading(reported_level)
-            print(f"[DoS Attack] Delayed sensor reading: {reported_level}")
-            log_anomaly(f"[DEMO] Now demonstrating: DoS Attack [TYPE:ATTACK]")
+        # Apply every running attack in turn
+        now = sim_clock.time()
+        tick_metrics.start('attacks')
+        for attack in attacks.values():
+            # Attacks see the genuine reading every tick, e.g. to capture it for replay
+            attack.observe(current_level, now)
+            if not attack.running:
+                continue
+            attack.set_defense(with_defense)
+            reported_level = float(attack.apply(reported_level, now))
+            emit(f"[{attack.display_name}] {attack.description}: {reported_level}")
+            log_event(f"[DEMO] Now demonstrating: {attack.display_name} [TYPE:ATTACK]")
             
-            # Defense: authentication allows backup readings
-            if with_defense and random.random() < 0.6:
-                cmd = "get_backup_reading"
-                timestamp = time.time()
-                signature = command_authenticator.generate_hmac(cmd, timestamp)
-                
-                if command_authenticator.authenticate_command(cmd, timestamp, signature):
-                    backup_reading = current_level + random.uniform(-1, 1)
-                    reported_level = backup_reading
-                    print(f"[DEFENSE] Using authenticated backup reading: {reported_level:.2f}")
-                    log_anomaly(f"[DEFENSE] Command authentication activated backup system")
+            if attack.defended:
+                tick_metrics.start('defenses')
+                reported_level, flag = attack.defend(reported_level, current_level)
+                tick_metrics.stop()
+                defense_flags |= flag
+        tick_metrics.stop()
         
         # Log water levels
-        print(f"Water Tank Level - Reported: {reported_level:.1f}, Actual: {current_level:.1f}")
+        emit(f"Water Tank Level - Reported: {reported_level:.1f}, Actual: {current_level:.1f}")
         
         # Update UI with both values
+        tick_metrics.start('ui')
         update_water_level(reported_level, current_level)
+        tick_metrics.stop()
         
         # Basic safety check
         if current_level <= 0 or current_level >= tank.capacity:
-            log_anomaly(f"Tank level out of bounds: {current_level}")
+            log_event(f"Tank level out of bounds: {current_level}")
         
-        time.sleep(1)
+        # Record the tick for offline analysis
+        if recorder is not None:
+            tick_metrics.start('record')
+            if demo_mode:
+                phase = active_attack
+            else:
+                running = [name for name, attack in attacks.items() if attack.running]
+                phase = '+'.join(running) if running else 'none'
+                if defense_active:
+                    phase += '_with_defense'
+            recorder.append(sim_clock.time(), reported_level, current_level,
+                            tank.inflow, tank.outflow, phase, defense_flags)
+            tick_metrics.stop()
+    
+    # Events due at the same time run controller, then physics, then sensor,
+    # so each sample sees the state the controller just acted on. Each is a
+    # timed stage, and a tick closes after every sensor sample.
+    if controller is not None:
+        scheduler.every(control_interval, tick_metrics.wrap('controller', controller.step), priority=0)
+    if command_channel is not None:
+        scheduler.every(control_interval, tick_metrics.wrap('commands', command_channel.flush), priority=0)
+    scheduler.every(physics_interval, tick_metrics.wrap('physics', tank.update), physics_interval, priority=1)
+    scheduler.every(sample_interval, tick_metrics.wrap('sensor', sensor_tick), priority=2)
+    scheduler.every(sample_interval, tick_metrics.end_tick, priority=3)
+    scheduler.run(until=None if duration is None else loop_start_time + duration)
 
 
 def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description='Secure SCADA Simulation')
-    parser.add_argument('--attack', choices=['replay', 'false_data', 'dos', 'all', 'none'], 
-                        default='none', help='Attack type to simulate')
+    attack_choices = available_attacks() + ['all', 'none']
+    parser.add_argument('--attack', choices=attack_choices, default='none',
+                        help=f"Attack type to simulate: {', '.join(attack_choices)}")
     parser.add_argument('--defense', action='store_true', 
                         help='Enable defense mechanisms')
     parser.add_argument('--demo', action='store_true',
                         help='Enable demonstration mode that cycles through attacks')
+    parser.add_argument('--headless', action='store_true',
+                        help='Run without starting the web dashboard')
+    parser.add_argument('--virtual-time', action='store_true',
+                        help='Drive the simulation from a virtual clock (requires --headless)')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='Stop after this many seconds of simulation time')
+    parser.add_argument('--control-interval', type=float, default=1.0,
+                        help='Seconds between controller updates')
+    parser.add_argument('--sample-interval', type=float, default=1.0,
+                        help='Seconds between sensor readings')
+    parser.add_argument('--integrator', choices=list(INTEGRATORS), default='euler',
+                        help='ODE integrator for the tank level')
+    parser.add_argument('--drain-coefficient', type=float, default=0.0,
+                        help='Gravity drain k in drain = k * sqrt(level) (0 disables it)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Time every stage of the simulation loop (served at /api/metrics)')
+    parser.add_argument('--profile-slowest', metavar='N', type=int, default=0,
+                        help='Profile every tick with cProfile and keep the N slowest (implies --metrics)')
+    parser.add_argument('--profile-dir', default='data/profiles',
+                        help='Where --profile-slowest writes its .prof files')
+    parser.add_argument('--modbus-port', type=int, default=None,
+                        help='Serve the tank over Modbus/TCP on 127.0.0.1 at this port (0 picks a free one); '
+                             'register writes are sent as signed commands')
+    parser.add_argument('--history-size', type=int, default=None,
+                        help='Number of samples the dashboard keeps in memory')
+    parser.add_argument('--record', metavar='DIR', default=None,
+                        help='Record every tick to a columnar run store in DIR')
+    
+    # Batch analysis commands
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    montecarlo_parser = subparsers.add_parser(
+        'montecarlo', help='Run many seeded headless scenarios in parallel and aggregate metrics')
+    montecarlo.add_arguments(montecarlo_parser)
+    sweep_parser = subparsers.add_parser(
+        'sweep', help='Tune detector, attack and controller parameters by grid or random search')
+    sweep.add_arguments(sweep_parser)
+    flood_parser = subparsers.add_parser(
+        'flood', help='Measure sensor-read latency and drops under a request flood, with and without rate limiting')
+    flood_study.add_arguments(flood_parser)
     args = parser.parse_args()
     
+    if args.command == 'montecarlo':
+        montecarlo.main(args)
+        return
+    if args.command == 'sweep':
+        sweep.main(args)
+        return
+    if args.command == 'flood':
+        flood_study.main(args)
+        return
+    
+    if args.virtual_time and not args.headless:
+        parser.error('--virtual-time requires --headless')
+    
+    # Switch to the virtual clock before anything records a timestamp
+    if args.virtual_time:
+        sim_clock.set_virtual(True)
+    
+    if args.control_interval <= 0 or args.sample_interval <= 0:
+        parser.error('--control-interval and --sample-interval must be positive')
+    
+    if args.history_size is not None:
+        if args.history_size < 1:
+            parser.error('--history-size must be at least 1')
+        set_history_retention(args.history_size)
+    
     # Initialize logging
     console_log_file = setup_console_logging()
     setup_logging()
     
     # Initialize the water tank simulation
-    tank = WaterTank(capacity=100.0, initial_level=10.0)
+    tank = WaterTank(capacity=100.0, initial_level=10.0, integrator=args.integrator,
+                     drain_coefficient=args.drain_coefficient)
     
-    # Start the control logic
-    controller = Controller(tank, setpoint=50.0)
+    # Start the control logic; its actuator commands are signed and verified
+    command_channel = CommandChannel(tank)
+    controller = Controller(command_channel.actuator(), setpoint=50.0)
     if args.demo:
         controller.set_manual_control(True)
-    controller.start()
     
-    # Initialize attacks
-    attacks = {}
-    attacks['replay'] = ReplayAttack(tank)
-    attacks['false_data'] = FalseDataInjectionAttack(tank)
-    attacks['dos'] = DoSAttack(tank)
+    # Initialize every registered attack
+    attacks = create_attacks(tank)
     
-    # Start attacks if needed (for non-demo mode)
+    # Attacks to start (for non-demo mode), after observing the tank for as
+    # long as they need, e.g. the replay attack's capture window
+    started = []
     if not args.demo:
-        if args.attack == 'replay' or args.attack == 'all':
-            attacks['replay'].start()
-        if args.attack == 'false_data' or args.attack == 'all':
-            attacks['false_data'].start()
-        if args.attack == 'dos' or args.attack == 'all':
-            attacks['dos'].start()
+        started = [attack for name, attack in attacks.items() if args.attack in (name, 'all')]
     else:
         print("[DEMO MODE] Starting demonstration - will cycle through attacks")
         log_anomaly("[DEMO] Now demonstrating: Normal Operation [TYPE:NORMAL]")
     
     # Start the dashboard UI
-    start_dashboard()
+    if not args.headless:
+        start_dashboard()
+    
+    # Expose the tank's registers to network clients (and network attacks)
+    modbus_server = None
+    if args.modbus_port is not None:
+        # Register writes go through the signed command channel, like the controller's
+        modbus_server = ModbusServer(tank, port=args.modbus_port, command_channel=command_channel)
+        modbus_server.start_in_thread()
+        print(f"Modbus/TCP server listening on 127.0.0.1:{modbus_server.port}")
+    
+    # Per-stage timing, with one sample interval as the tick budget
+    if args.metrics or args.profile_slowest:
+        tick_metrics.enable(tick_budget=args.sample_interval, profile_slowest=args.profile_slowest)
+    
+    # Open the run recorder if requested
+    recorder = RunWriter(args.record) if args.record else None
     
     # Run the main simulation loop
     try:
-        simulation_loop(tank, attacks, args.defense, args.demo)
+        warmup = max([attack.warmup for attack in started], default=0.0)
+        if warmup:
+            print(f"Observing normal operation for {warmup:.0f} s before starting the attack")
+            simulation_loop(tank, attacks, args.defense, args.demo, controller=controller,
+                            duration=warmup, recorder=recorder,
+                            control_interval=args.control_interval, sample_interval=args.sample_interval,
+                            command_channel=command_channel)
+        for attack in started:
+            attack.start()
+        simulation_loop(tank, attacks, args.defense, args.demo, controller=controller,
+                        duration=args.duration, recorder=recorder,
+                        control_interval=args.control_interval, sample_interval=args.sample_interval,
+                        command_channel=command_channel)
         if args.demo:
             print("\nDemo completed successfully! All attack and defense scenarios have been demonstrated.")
             print("You can run the demo again with: python main.py --demo")
-            print("Or try individual attack modes with: python main.py --attack [replay|false_data|dos|all]")
+            print(f"Or try individual attack modes with: python main.py --attack [{'|'.join(available_attacks() + ['all'])}]")
     except KeyboardInterrupt:
         print("Simulation terminated by user.")
     finally:
         controller.stop()
         for attack in attacks.values():
             attack.stop()
+        if recorder is not None:
+            recorder.close()
+        if modbus_server is not None:
+            modbus_server.stop()
+        if tick_metrics.enabled:
+            tick_metrics.disable()
+            print(tick_metrics.format_summary())
+            if args.profile_slowest:
+                for path in tick_metrics.dump_profiles(args.profile_dir):
+                    print(f"Profile written to {path}")
         stop_console_logging(console_log_file)
 
 
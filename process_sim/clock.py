@@ -0,0 +1,47 @@
+# secure-sim/process_sim/clock.py
+import time
+import threading
+
+
+class SimClock:
+    """Simulation clock that follows wall-clock time or a virtual timeline"""
+    def __init__(self):
+        self.virtual = False
+        self.virtual_time = 0.0
+        self.lock = threading.Lock()
+
+    def set_virtual(self, enabled, start_time=None):
+        """Switch between wall-clock and virtual time"""
+        with self.lock:
+            self.virtual = enabled
+            if enabled:
+                # Start the virtual timeline at the current wall-clock time so
+                # timestamps in logs and the UI still look sensible
+                self.virtual_time = time.time() if start_time is None else start_time
+
+    def time(self):
+        """Get the current simulation time in seconds"""
+        if self.virtual:
+            return self.virtual_time
+        return time.time()
+
+    def sleep(self, seconds):
+        """Wait for the given duration (instant when running in virtual time)"""
+        if self.virtual:
+            self.advance(seconds)
+        else:
+            time.sleep(seconds)
+
+    def advance(self, seconds):
+        """Move the virtual clock forward"""
+        with self.lock:
+            self.virtual_time += seconds
+
+    def advance_to(self, timestamp):
+        """Move the virtual clock forward to timestamp (never backwards)"""
+        with self.lock:
+            self.virtual_time = max(self.virtual_time, timestamp)
+
+
+# Singleton instance
+sim_clock = SimClock()
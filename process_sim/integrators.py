@@ -0,0 +1,130 @@
+# secure-sim/process_sim/integrators.py
+import numpy as np
+
+
+class Integrator:
+    """Advances a state y' = f(t, y) over a time step
+
+    States are floats or NumPy arrays, so the same integrator steps a single
+    tank or a whole fleet/network at once.
+    """
+    name = None
+
+    def integrate(self, f, t, y, dt):
+        """Return the state at t + dt"""
+        raise NotImplementedError
+
+
+class EulerIntegrator(Integrator):
+    """Explicit Euler, exact for constant flows"""
+    name = 'euler'
+
+    def integrate(self, f, t, y, dt):
+        return y + dt * f(t, y)
+
+
+class RK4Integrator(Integrator):
+    """Classic fourth-order Runge-Kutta with a fixed step
+
+    Steps longer than max_step are split into equal substeps.
+    """
+    name = 'rk4'
+
+    def __init__(self, max_step=None):
+        self.max_step = max_step
+
+    def integrate(self, f, t, y, dt):
+        substeps = 1 if not self.max_step else max(1, int(np.ceil(dt / self.max_step)))
+        h = dt / substeps
+        for _ in range(substeps):
+            k1 = f(t, y)
+            k2 = f(t + h / 2, y + h / 2 * k1)
+            k3 = f(t + h / 2, y + h / 2 * k2)
+            k4 = f(t + h, y + h * k3)
+            y = y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            t += h
+        return y
+
+
+# Dormand-Prince 5(4) tableau
+DP_C = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0)
+DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+# Fifth-order weights minus the embedded fourth-order ones
+DP_E = (71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+
+
+class RK45Integrator(Integrator):
+    """Adaptive Dormand-Prince 5(4) with error control
+
+    A time step is covered by as many internal steps as the error tolerance
+    requires. The last accepted step size carries over to the next call, so
+    steady flows settle on few, long steps.
+    """
+    name = 'rk45'
+
+    def __init__(self, rtol=1e-6, atol=1e-9, min_step=1e-6, max_step=None):
+        self.rtol = rtol
+        self.atol = atol
+        self.min_step = min_step
+        self.max_step = max_step
+        self.step_hint = None  # Step size proposed by the last call
+        self.steps_accepted = 0
+        self.steps_rejected = 0
+
+    def integrate(self, f, t, y, dt):
+        t_end = t + dt
+        h = dt if self.step_hint is None else min(self.step_hint, dt)
+        if self.max_step:
+            h = min(h, self.max_step)
+        k = [f(t, y)] + [None] * 6
+
+        while t_end - t > 1e-12 * max(1.0, abs(t_end)):
+            step = min(h, t_end - t)
+            for i in range(1, 7):
+                increment = sum(a * k[j] for j, a in enumerate(DP_A[i]) if a)
+                k[i] = f(t + DP_C[i] * step, y + step * increment)
+            # The last stage is evaluated at the fifth-order solution
+            y_new = y + step * sum(a * k[j] for j, a in enumerate(DP_A[6]) if a)
+            error = step * sum(e * k[j] for j, e in enumerate(DP_E) if e)
+
+            scale = self.atol + self.rtol * np.maximum(np.abs(y), np.abs(y_new))
+            error_norm = float(np.sqrt(np.mean(np.square(error / scale))))
+            if error_norm <= 1.0 or step <= self.min_step:
+                t += step
+                y = y_new
+                k[0] = k[6]  # First same as last
+                self.steps_accepted += 1
+            else:
+                self.steps_rejected += 1
+
+            # Standard step size controller, limited to shrinking 5x or growing 5x
+            factor = 5.0 if error_norm == 0.0 else min(5.0, max(0.2, 0.9 * error_norm ** -0.2))
+            if step == h or error_norm > 1.0:
+                h = step * factor
+            h = max(h, self.min_step)
+            if self.max_step:
+                h = min(h, self.max_step)
+
+        self.step_hint = h
+        return y
+
+
+# Integrators by name
+INTEGRATORS = {cls.name: cls for cls in (EulerIntegrator, RK4Integrator, RK45Integrator)}
+
+
+def get_integrator(integrator):
+    """Return an integrator instance from a name or an existing instance"""
+    if isinstance(integrator, Integrator):
+        return integrator
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator '{integrator}', expected one of {', '.join(INTEGRATORS)}")
+    return INTEGRATORS[integrator]()
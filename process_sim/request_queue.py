@@ -0,0 +1,100 @@
+# secure-sim/process_sim/request_queue.py
+from array import array
+from collections import deque
+import numpy as np
+
+
+LEGIT_CLIENT = 'scada'  # Client id of the SCADA system's own sensor reads
+
+
+class RequestQueue:
+    """Bounded FIFO service queue in front of the sensor read path
+
+    A single server answers requests in arrival order, each taking
+    service_time seconds of simulation time. A request that arrives while
+    capacity requests are waiting or in service is dropped, and a read that
+    is answered later than timeout counts as timed out (it still used the
+    server, which cannot know the client gave up). With a rate_limiter,
+    requests over their client's rate are turned away before they queue.
+    """
+    def __init__(self, capacity=64, service_time=0.01, timeout=0.5, rate_limiter=None):
+        self.capacity = capacity
+        self.service_time = service_time
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.departures = deque()  # Completion times of the requests in the queue, in order
+        self.busy_until = 0.0
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Clear the counters, keeping the queue itself"""
+        self.read_latencies = array('d')  # Seconds, for every read that was served, late or not
+        self.reads = 0
+        self.reads_dropped = 0
+        self.reads_timed_out = 0
+        self.flood_requests = 0
+        self.flood_dropped = 0
+
+    def submit(self, t, client):
+        """Offer one request arriving at time t; return its latency, or None if it was turned away"""
+        if self.rate_limiter is not None and not self.rate_limiter.allow(client, t):
+            return None
+        departures = self.departures
+        while departures and departures[0] <= t:
+            departures.popleft()
+        if len(departures) >= self.capacity:
+            return None
+        done = max(t, self.busy_until) + self.service_time
+        self.busy_until = done
+        departures.append(done)
+        return done - t
+
+    def flood(self, start, end, rate, rng, clients=1):
+        """Attacker requests over (start, end], a Poisson process at rate per second from clients clients"""
+        count = rng.poisson(rate * (end - start))
+        if not count:
+            return
+        times = np.sort(rng.uniform(start, end, count)).tolist()
+        senders = rng.integers(clients, size=count).tolist()
+        submit = self.submit
+        dropped = 0
+        for t, client in zip(times, senders):
+            if submit(t, client) is None:
+                dropped += 1
+        self.flood_requests += count
+        self.flood_dropped += dropped
+
+    def read(self, t):
+        """A legitimate sensor read at time t; return whether it was answered in time"""
+        self.reads += 1
+        latency = self.submit(t, LEGIT_CLIENT)
+        if latency is None:
+            self.reads_dropped += 1
+            return False
+        # Late reads count too, or the percentiles could never exceed the timeout
+        self.read_latencies.append(latency)
+        if latency > self.timeout:
+            self.reads_timed_out += 1
+            return False
+        return True
+
+    def stats(self):
+        """Legitimate-read latency, drop and timeout rates, and flood counts
+
+        Latency percentiles cover every read that was served, including
+        those answered after the timeout; dropped reads have no latency.
+        """
+        latencies = 1000 * np.frombuffer(self.read_latencies, dtype=np.float64)
+        served = len(latencies) > 0
+        reads = max(self.reads, 1)
+        return {
+            'reads': self.reads,
+            'read_p50_ms': float(np.percentile(latencies, 50)) if served else None,
+            'read_p99_ms': float(np.percentile(latencies, 99)) if served else None,
+            'read_max_ms': float(latencies.max()) if served else None,
+            'drop_rate': self.reads_dropped / reads,
+            'timeout_rate': self.reads_timed_out / reads,
+            'flood_requests': self.flood_requests,
+            'flood_dropped': self.flood_dropped,
+            'rate_limited': 0 if self.rate_limiter is None else self.rate_limiter.limited,
+        }
@@ -0,0 +1,120 @@
+# secure-sim/process_sim/scheduler.py
+import heapq
+import itertools
+import threading
+from process_sim.clock import sim_clock
+
+
+class ScheduledEvent:
+    """A one-shot or periodic callback on a Scheduler"""
+    def __init__(self, time, callback, args=(), interval=None, priority=0):
+        self.time = time  # Next time the event is due
+        self.callback = callback
+        self.args = args
+        self.interval = interval  # None for one-shot events
+        self.priority = priority  # Lower runs first among events due at the same time
+        self.start = time
+        self.runs = 0
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop the event from running again"""
+        self.cancelled = True
+
+
+class Scheduler:
+    """Discrete-event scheduler built on a heap of timestamped events
+
+    Components register one-shot or periodic events at their own rates and
+    run() executes them in time order. With a wall-clock SimClock it sleeps
+    until the next event is due (real time); with a virtual clock it jumps
+    straight to the next event (as fast as possible).
+    """
+    def __init__(self, clock=None):
+        self.clock = clock or sim_clock
+        self.queue = []  # Heap of (time, priority, seq, event)
+        self.counter = itertools.count()  # Keeps ties in the order they were scheduled
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()  # Set when run() should re-check the queue
+        self.running = False
+        self.events_run = 0
+
+    def schedule_at(self, timestamp, callback, *args, priority=0):
+        """Run callback(*args) once at the given simulation time"""
+        event = ScheduledEvent(timestamp, callback, args, priority=priority)
+        self.push(event)
+        return event
+
+    def schedule(self, delay, callback, *args, priority=0):
+        """Run callback(*args) once after delay seconds"""
+        return self.schedule_at(self.clock.time() + delay, callback, *args, priority=priority)
+
+    def every(self, interval, callback, *args, priority=0, start=None):
+        """Run callback(*args) every interval seconds, first at start (default: now)"""
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+        first = self.clock.time() if start is None else start
+        event = ScheduledEvent(first, callback, args, interval=interval, priority=priority)
+        self.push(event)
+        return event
+
+    def push(self, event):
+        """Add an event to the queue"""
+        with self.lock:
+            heapq.heappush(self.queue, (event.time, event.priority, next(self.counter), event))
+        # run() may be sleeping until a later event
+        self.wakeup.set()
+
+    def next_time(self):
+        """Time of the next pending event, or None if the queue is empty"""
+        with self.lock:
+            while self.queue and self.queue[0][3].cancelled:
+                heapq.heappop(self.queue)
+            return self.queue[0][0] if self.queue else None
+
+    def run(self, until=None):
+        """Run events in time order until the given time, stop() or an empty queue"""
+        self.running = True
+        while self.running:
+            self.wakeup.clear()
+            with self.lock:
+                if not self.queue:
+                    break
+                due_time, _, _, event = self.queue[0]
+                if until is not None and due_time >= until:
+                    break
+                if event.cancelled:
+                    heapq.heappop(self.queue)
+                    continue
+                
+                now = self.clock.time()
+                if self.clock.virtual:
+                    # Nothing can happen in between, so jump to the event
+                    self.clock.advance_to(due_time)
+                elif due_time > now:
+                    event = None
+                if event is not None:
+                    heapq.heappop(self.queue)
+            
+            if event is None:
+                # Sleep until the event is due, or until something new is scheduled
+                self.wakeup.wait(due_time - now)
+                continue
+            
+            event.callback(*event.args)
+            self.events_run += 1
+            event.runs += 1
+            if event.interval is not None and not event.cancelled:
+                # Absolute times, so periodic events never drift
+                event.time = event.start + event.runs * event.interval
+                self.push(event)
+        
+        # A finished (not stopped) virtual run ends exactly at the requested time
+        if self.running and until is not None and self.clock.virtual:
+            self.clock.advance_to(until)
+        self.running = False
+
+    def stop(self):
+        """Make run() return after the current event"""
+        self.running = False
+        self.wakeup.set()
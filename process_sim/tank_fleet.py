@@ -0,0 +1,136 @@
+# secure-sim/process_sim/tank_fleet.py
+import threading
+import numpy as np
+from process_sim.integrators import get_integrator
+
+
+class TankFleet:
+    """Vectorized simulation of many water tanks stored as NumPy arrays
+
+    Supports the same gravity drain and integrators as WaterTank; the whole
+    fleet is one state vector for the integrator.
+    """
+    def __init__(self, size, capacity=100.0, initial_level=10.0, integrator='euler', drain_coefficient=0.0):
+        self.size = size
+        # Per-tank state, broadcast from scalars or copied from array-likes
+        self.capacity = np.array(np.broadcast_to(np.asarray(capacity, dtype=np.float64), (size,)))
+        self.level = np.array(np.broadcast_to(np.asarray(initial_level, dtype=np.float64), (size,)))
+        self.inflow = np.zeros(size, dtype=np.float64)
+        self.outflow = np.zeros(size, dtype=np.float64)
+        self.drain_coefficient = np.array(np.broadcast_to(np.asarray(drain_coefficient, dtype=np.float64), (size,)))
+        self.has_drain = bool(self.drain_coefficient.any())
+        self.integrator = get_integrator(integrator)
+        # Scratch buffer so update() does not allocate on every tick
+        self._change = np.empty(size, dtype=np.float64)
+        # One lock for the whole fleet instead of one per tank
+        self.lock = threading.Lock()
+
+    def net_flow(self, t, levels):
+        """Rate of change of every level"""
+        flow = self.inflow - self.outflow
+        if self.has_drain:
+            flow -= self.drain_coefficient * np.sqrt(np.maximum(levels, 0.0))
+        return flow
+
+    def update(self, dt=1.0):
+        """Advance every tank by dt and return the level array"""
+        with self.lock:
+            if self.integrator.name == 'euler' and not self.has_drain:
+                # Calculate level change for all tanks at once
+                np.subtract(self.inflow, self.outflow, out=self._change)
+                self._change *= dt
+                self.level += self._change
+            else:
+                self.level[:] = self.integrator.integrate(self.net_flow, 0.0, self.level, dt)
+
+            # Ensure levels stay within bounds
+            np.clip(self.level, 0.0, self.capacity, out=self.level)
+            return self.level
+
+    def set_inflow(self, rates, index=None):
+        """Set inflow rates for all tanks, or for the tanks selected by index"""
+        with self.lock:
+            if index is None:
+                self.inflow[:] = rates
+            else:
+                self.inflow[index] = rates
+
+    def set_outflow(self, rates, index=None):
+        """Set outflow rates for all tanks, or for the tanks selected by index"""
+        with self.lock:
+            if index is None:
+                self.outflow[:] = rates
+            else:
+                self.outflow[index] = rates
+
+    def get_levels(self):
+        """Get a copy of all water levels"""
+        with self.lock:
+            return self.level.copy()
+
+    def tank(self, index):
+        """Get a WaterTank-compatible view of a single tank"""
+        if not -self.size <= index < self.size:
+            raise IndexError(f"Tank index {index} out of range for fleet of {self.size}")
+        return TankView(self, index % self.size)
+
+    def __len__(self):
+        return self.size
+
+
+class TankView:
+    """Single-tank view into a TankFleet with the WaterTank interface"""
+    def __init__(self, fleet, index):
+        self.fleet = fleet
+        self.index = index
+        self.lock = fleet.lock
+
+    @property
+    def capacity(self):
+        return float(self.fleet.capacity[self.index])
+
+    @property
+    def level(self):
+        return float(self.fleet.level[self.index])
+
+    @level.setter
+    def level(self, value):
+        self.fleet.level[self.index] = value
+
+    @property
+    def inflow(self):
+        return float(self.fleet.inflow[self.index])
+
+    @property
+    def outflow(self):
+        return float(self.fleet.outflow[self.index])
+
+    def update(self, dt=1.0):
+        """Update this tank only (use TankFleet.update to advance the whole fleet)"""
+        i = self.index
+        fleet = self.fleet
+        with self.lock:
+            change = fleet.inflow[i] - fleet.outflow[i]
+            if fleet.integrator.name == 'euler' and not fleet.has_drain:
+                level = fleet.level[i] + change * dt
+            else:
+                drain = fleet.drain_coefficient[i]
+                level = fleet.integrator.integrate(
+                    lambda t, h: change - drain * max(h, 0.0) ** 0.5, 0.0, float(fleet.level[i]), dt)
+            fleet.level[i] = max(0.0, min(fleet.capacity[i], level))
+            return float(fleet.level[i])
+
+    def set_inflow(self, rate):
+        """Set the inflow rate in units per second"""
+        with self.lock:
+            self.fleet.inflow[self.index] = rate
+
+    def set_outflow(self, rate):
+        """Set the outflow rate in units per second"""
+        with self.lock:
+            self.fleet.outflow[self.index] = rate
+
+    def get_level(self):
+        """Get the current water level"""
+        with self.lock:
+            return float(self.fleet.level[self.index])
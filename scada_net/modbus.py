@@ -0,0 +1,278 @@
+# secure-sim/scada_net/modbus.py
+import struct
+import asyncio
+import ipaddress
+import threading
+import numpy as np
+
+
+# Function codes
+READ_HOLDING_REGISTERS = 0x03
+READ_INPUT_REGISTERS = 0x04
+WRITE_SINGLE_REGISTER = 0x06
+WRITE_MULTIPLE_REGISTERS = 0x10
+
+# Exception codes
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+
+MBAP_HEADER = struct.Struct('>HHHB')  # Transaction id, protocol id (0), length, unit id
+MAX_REGISTERS = 125  # Most registers one read may ask for, as in the Modbus spec
+REGISTER_SCALE = 100  # Registers hold hundredths, so 0.00 to 655.35
+
+
+class ModbusError(Exception):
+    """Exception response from a Modbus server"""
+    def __init__(self, function, code):
+        super().__init__(f"Modbus exception {code} for function {function:#04x}")
+        self.function = function
+        self.code = code
+
+
+def to_register(value):
+    """Scale a level or flow to an unsigned 16-bit register"""
+    return int(min(max(round(value * REGISTER_SCALE), 0), 0xFFFF))
+
+
+def from_register(register):
+    """Inverse of to_register"""
+    return register / REGISTER_SCALE
+
+
+def frame(transaction, unit, pdu):
+    """Wrap a PDU in a Modbus/TCP (MBAP) header"""
+    return MBAP_HEADER.pack(transaction, 0, len(pdu) + 1, unit) + pdu
+
+
+async def read_frame(reader):
+    """Read one Modbus/TCP frame and return (transaction, unit, pdu)"""
+    transaction, protocol, length, unit = MBAP_HEADER.unpack(await reader.readexactly(MBAP_HEADER.size))
+    if protocol != 0 or not 2 <= length <= 254:
+        raise ConnectionError("Not a Modbus/TCP frame")
+    return transaction, unit, await reader.readexactly(length - 1)
+
+
+def check_loopback(host):
+    """Refuse to listen anywhere but on this machine"""
+    if host == 'localhost':
+        return
+    try:
+        loopback = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise ValueError(f"Refusing to listen on {host}: the Modbus server is localhost only")
+
+
+class ModbusServer:
+    """Asyncio Modbus/TCP server exposing a tank on localhost
+
+    Input registers hold the water level of each tank and holding registers
+    hold the inflow rates followed by the outflow rates, all in hundredths
+    (see REGISTER_SCALE). Writing a holding register sets that flow. With a
+    command_channel the write is sent as a signed actuator command that
+    takes effect at the channel's next flush, like the controller's own
+    commands; without one it sets the flow directly, with no
+    authentication, just like a real Modbus device. Works with a WaterTank
+    (one register of each kind) or a TankFleet/TankNetwork (one per tank).
+    Every client gets its own coroutine, so many clients can be connected
+    at once.
+    """
+    def __init__(self, tank, host='127.0.0.1', port=5020, command_channel=None):
+        check_loopback(host)
+        self.tank = tank
+        self.command_channel = command_channel
+        self.host = host
+        self.port = port  # 0 picks a free port; the real one is set once listening
+        self.size = len(tank) if hasattr(tank, 'get_levels') else 1
+        self.server = None
+        self.loop = None
+        self.thread = None
+
+        # Counters for benchmarks and the console
+        self.clients = 0
+        self.connections = 0
+        self.requests = 0
+        self.exceptions = 0
+
+    def levels(self):
+        """Current level of every tank"""
+        if hasattr(self.tank, 'get_levels'):
+            return self.tank.get_levels()
+        return np.array([self.tank.get_level()])
+
+    def holding_registers(self):
+        """Current inflows followed by outflows"""
+        return np.concatenate((np.atleast_1d(self.tank.inflow), np.atleast_1d(self.tank.outflow)))
+
+    def write_holding(self, address, registers):
+        """Set the flows behind consecutive holding registers"""
+        for offset, register in enumerate(registers):
+            index = address + offset
+            action = 'set_inflow' if index < self.size else 'set_outflow'
+            tank_index = None if self.size == 1 else index % self.size
+            if self.command_channel is not None:
+                self.command_channel.send(action, from_register(register), tank_index)
+            elif tank_index is None:
+                getattr(self.tank, action)(from_register(register))
+            else:
+                getattr(self.tank, action)(from_register(register), tank_index)
+
+    def handle_pdu(self, pdu):
+        """Execute one request PDU and return the response PDU"""
+        function = pdu[0]
+        try:
+            if function in (READ_INPUT_REGISTERS, READ_HOLDING_REGISTERS):
+                address, count = struct.unpack_from('>HH', pdu, 1)
+                values = self.levels() if function == READ_INPUT_REGISTERS else self.holding_registers()
+                if not 1 <= count <= MAX_REGISTERS:
+                    return self.exception(function, ILLEGAL_DATA_VALUE)
+                if address + count > len(values):
+                    return self.exception(function, ILLEGAL_DATA_ADDRESS)
+                registers = [to_register(value) for value in values[address:address + count]]
+                return struct.pack(f'>BB{count}H', function, 2 * count, *registers)
+
+            if function == WRITE_SINGLE_REGISTER:
+                address, register = struct.unpack_from('>HH', pdu, 1)
+                if address >= 2 * self.size:
+                    return self.exception(function, ILLEGAL_DATA_ADDRESS)
+                self.write_holding(address, [register])
+                return pdu[:5]  # The response echoes the request
+
+            if function == WRITE_MULTIPLE_REGISTERS:
+                address, count, byte_count = struct.unpack_from('>HHB', pdu, 1)
+                if not 1 <= count <= MAX_REGISTERS - 2 or byte_count != 2 * count or len(pdu) != 6 + byte_count:
+                    return self.exception(function, ILLEGAL_DATA_VALUE)
+                if address + count > 2 * self.size:
+                    return self.exception(function, ILLEGAL_DATA_ADDRESS)
+                self.write_holding(address, struct.unpack_from(f'>{count}H', pdu, 6))
+                return pdu[:5]
+        except struct.error:
+            # Truncated request
+            return self.exception(function, ILLEGAL_DATA_VALUE)
+        return self.exception(function, ILLEGAL_FUNCTION)
+
+    def exception(self, function, code):
+        """Exception response PDU"""
+        self.exceptions += 1
+        return bytes((function | 0x80, code))
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection until the client hangs up or sends garbage"""
+        self.clients += 1
+        self.connections += 1
+        try:
+            while True:
+                transaction, unit, pdu = await read_frame(reader)
+                self.requests += 1
+                writer.write(frame(transaction, unit, self.handle_pdu(pdu)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def start(self):
+        """Start listening on the current event loop"""
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve(self, ready=None):
+        """Listen until stop() is called"""
+        self.loop = asyncio.get_running_loop()
+        await self.start()
+        if ready is not None:
+            ready.set()
+        try:
+            await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    def start_in_thread(self):
+        """Serve from a background thread with its own event loop; returns once listening"""
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            try:
+                asyncio.run(self.serve(ready))
+            except OSError as e:
+                # e.g. the port is taken; report it to the caller
+                errors.append(e)
+                ready.set()
+
+        self.thread = threading.Thread(target=run)
+        self.thread.daemon = True
+        self.thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self.thread
+
+    def stop(self):
+        """Stop a server started with start_in_thread()"""
+        if self.loop is not None and self.server is not None:
+            self.loop.call_soon_threadsafe(self.server.close)
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+
+
+class ModbusClient:
+    """Minimal asyncio Modbus/TCP client with one request in flight at a time"""
+    def __init__(self, host='127.0.0.1', port=5020, unit_id=1):
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self.transaction = 0
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.writer = None
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def request(self, pdu):
+        """Send a request PDU and return the response PDU, raising ModbusError on an exception"""
+        self.transaction = (self.transaction + 1) & 0xFFFF
+        self.writer.write(frame(self.transaction, self.unit_id, pdu))
+        transaction, _, response = await read_frame(self.reader)
+        if transaction != self.transaction:
+            raise ConnectionError(f"Response to transaction {transaction}, expected {self.transaction}")
+        if response[0] & 0x80:
+            raise ModbusError(response[0] & 0x7F, response[1])
+        return response
+
+    async def read_input_registers(self, address, count=1):
+        response = await self.request(struct.pack('>BHH', READ_INPUT_REGISTERS, address, count))
+        return list(struct.unpack_from(f'>{count}H', response, 2))
+
+    async def read_holding_registers(self, address, count=1):
+        response = await self.request(struct.pack('>BHH', READ_HOLDING_REGISTERS, address, count))
+        return list(struct.unpack_from(f'>{count}H', response, 2))
+
+    async def write_register(self, address, register):
+        await self.request(struct.pack('>BHH', WRITE_SINGLE_REGISTER, address, register))
+
+    async def write_registers(self, address, registers):
+        count = len(registers)
+        await self.request(struct.pack(f'>BHHB{count}H', WRITE_MULTIPLE_REGISTERS, address, count,
+                                       2 * count, *registers))
+
+    async def read_levels(self, address=0, count=1):
+        """Tank levels from the input registers"""
+        return [from_register(register) for register in await self.read_input_registers(address, count)]
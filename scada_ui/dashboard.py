@@ -1,9 +1,14 @@
 # secure-sim/scada_ui/dashboard.py
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, Response, render_template_string, jsonify, request
+import json
 import threading
 import time
-import re
+from collections import deque
 from datetime import datetime
+from defenses.event_bus import event_bus
+from process_sim.clock import sim_clock
+from process_sim.tick_metrics import tick_metrics
+from scada_ui.history_store import SampleRingBuffer
 
 app = Flask(__name__)
 
@@ -11,17 +16,22 @@ app = Flask(__name__)
 # Global variables to store both reported and actual water levels
 water_level = 10.0  # Potentially spoofed/reported level
 actual_water_level = 10.0  # Actual water level
-current_time = datetime.now().strftime('%H:%M:%S')
-timestamps = [current_time] * 5  # Pre-populate with initial timestamps
-history = [water_level] * 5  # Pre-populate with initial water level
-actual_history = [actual_water_level] * 5  # Pre-populate with initial water level
-MAX_HISTORY = 30  # Set history size to 30 data points
+MAX_HISTORY = 30  # Number of data points shown on the chart
+HISTORY_RETENTION = 30  # Number of samples kept in memory (see set_history_retention)
+sample_history = SampleRingBuffer(HISTORY_RETENTION)  # (timestamp, reported, actual, seq) rows
+for _ in range(5):
+    sample_history.append(sim_clock.time(), water_level, actual_water_level)  # Pre-populate with initial level
 last_active_attack = ""  # Track the last active attack for change detection
 attack_change_time = time.time()  # When the attack last changed
+PHASE_DURATION = 15  # Seconds per demo phase, used for the countdown
+STREAM_KEEPALIVE = 15  # Seconds between keep-alive comments on idle streams
 
 # Store all defense events for historical logging
-defense_events = []  # List of defense events with timestamps
 MAX_DEFENSE_EVENTS = 100  # Maximum number of defense events to retain
+defense_events = deque(maxlen=MAX_DEFENSE_EVENTS)  # Defense events with timestamps
+active_attack = ""  # Current demo phase as "<name> [TYPE:<type>]"
+event_cursor = 0  # Sequence number of the last event read from the event bus
+state_lock = threading.Lock()  # Guards the event state above between request threads
 
 # Clear log file at startup to remove old events
 def clear_old_log_entries():
@@ -34,26 +44,6 @@ def clear_old_log_entries():
 # Clear log at startup
 clear_old_log_entries()
 
-# Function to extract timestamp from log line
-def get_timestamp_from_log(log_line):
-    """
-    Extract timestamp from a log line and convert to Unix timestamp
-    Example log line: "2025-04-02 11:04:25,864:INFO:Logging initialized."
-    """
-    try:
-        # Extract timestamp using regex
-        match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),\d+', log_line)
-        if match:
-            timestamp_str = match.group(1)
-            dt = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-            return dt.timestamp()
-    except Exception:
-        pass
-    
-    # Return current time if parsing fails
-    return time.time()
-
-
 @app.route('/')
 def dashboard():
     html = """
@@ -203,7 +193,7 @@ def dashboard():
               <div id="current-attack" class="normal-state">
                 <div style="font-size: 1.2em;"><strong>Currently Demonstrating:</strong> <span id="attack-name">Normal Operation</span></div>
                 <div class="countdown">
-                  Next attack in: <span id="countdown-timer">15</span> seconds
+                  Next attack in: <span id="countdown-timer">{{ phase_duration }}</span> seconds
                 </div>
               </div>
             </div>
@@ -332,6 +322,7 @@ def dashboard():
           // Initial water level rendering
           const waterLevel = {{ level }};
           const actualWaterLevel = {{ actual_level }};
+          const phaseDuration = {{ phase_duration }};  // Seconds per demo phase
           const levelElement = document.getElementById('level-value');
           const waterElement = document.getElementById('water-level');
           const updateTimeElement = document.getElementById('update-time');
@@ -458,244 +449,238 @@ def dashboard():
             }
           });
 
-          // Update function
-          function updateDashboard() {
-            fetch('/api/water-level')
-              .then(response => response.json())
-              .then(data => {
-                console.log("API Response:", data);
+          // Render one dashboard state (from a poll response or the event stream)
+          function renderDashboard(data) {
+            // Update main water level display
+            const newLevel = data.level;
+            const newActualLevel = data.actual_level;
+            const height = Math.min(Math.max(newLevel, 0), 100);
+            const actualHeight = Math.min(Math.max(newActualLevel, 0), 100);
+            
+            // Update main display
+            waterElement.style.height = `${height}%`;
+            levelElement.innerText = newLevel.toFixed(3);
+            
+            // Update spoofed vs actual display
+            spoofedWaterElement.style.height = `${height}%`;
+            actualWaterElement.style.height = `${actualHeight}%`;
+            spoofedLevelElement.innerText = newLevel.toFixed(3);
+            actualLevelElement.innerText = newActualLevel.toFixed(3);
+            
+            // Calculate and display discrepancy with more decimal places
+            const discrepancy = Math.abs(newLevel - newActualLevel).toFixed(3);
+            discrepancyElement.innerText = discrepancy;
+            
+            // If there's a significant discrepancy, highlight it
+            if (discrepancy > 5) {
+              discrepancyElement.className = 'discrepancy-value text-danger fw-bold discrepancy-high';
+              securityStatusElement.className = 'badge bg-danger';
+              securityStatusElement.innerText = 'Potential Attack';
+            } else if (discrepancy > 0.5) {
+              discrepancyElement.className = 'discrepancy-value text-warning fw-bold';
+              securityStatusElement.className = 'badge bg-warning text-dark';
+              securityStatusElement.innerText = 'Suspicious';
+            } else {
+              discrepancyElement.className = 'discrepancy-value text-dark fw-bold';
+              securityStatusElement.className = 'badge bg-success';
+              securityStatusElement.innerText = 'Secured';
+            }
+
+            // Update time
+            const currentTime = new Date().toLocaleTimeString();
+            updateTimeElement.innerText = currentTime;
+            
+            // SIMPLIFIED ATTACK BANNER HANDLING
+            if (data.active_attack && typeof data.active_attack === 'string') {
+              const attackMessage = data.active_attack;
+              
+              // Extract display name and type (remove type tag if present)
+              let displayName = attackMessage;
+              let extractedType = "NORMAL";
+              
+              if (attackMessage.includes("[TYPE:")) {
+                const parts = attackMessage.split("[TYPE:");
+                displayName = parts[0].trim();
+                extractedType = parts[1].split("]")[0]; // Extract the type value
+                console.log("Extracted type:", extractedType);
+              }
+              
+              // Update attack name display
+              attackNameElement.innerText = displayName;
+              
+              // SIMPLIFIED DETECTION
+              // 1. Check message content for attack keywords
+              const hasAttackKeyword = 
+                attackMessage.toLowerCase().includes("replay") || 
+                attackMessage.toLowerCase().includes("false data") || 
+                attackMessage.toLowerCase().includes("dos");
+              
+              // 2. Check for defense keywords or type
+              const hasDefenseKeyword = 
+                attackMessage.toLowerCase().includes("defense") || 
+                attackMessage.toLowerCase().includes("with_defense") ||
+                extractedType === "DEFENSE";
+              
+              // 3. Check for explicit attack type
+              const hasAttackTag = extractedType === "ATTACK";
+              
+              // 4. Check significant discrepancy
+              const hasLargeDiscrepancy = Math.abs(newLevel - newActualLevel) > 5;
+              
+              // Handle UI update in order of priority
+              if (displayName.toLowerCase().includes("demonstration complete")) {
+                // Demo has completed
+                console.log("DEMO COMPLETE - SETTING COMPLETION BANNER");
                 
-                // Update main water level display
-                const newLevel = data.level;
-                const newActualLevel = data.actual_level;
-                const height = Math.min(Math.max(newLevel, 0), 100);
-                const actualHeight = Math.min(Math.max(newActualLevel, 0), 100);
+                // Set completion message
+                attackNameElement.innerHTML = `🎉 Demonstration Complete!`;
+                countdownElement.innerHTML = "Demo has finished";
                 
-                // Update main display
-                waterElement.style.height = `${height}%`;
-                levelElement.innerText = newLevel.toFixed(3);
+                // Apply blue completion style
+                currentAttackElement.className = 'normal-state';
+                currentAttackElement.style.backgroundColor = '#0d6efd !important';
+                currentAttackElement.style.borderColor = '#0d6efd !important';
+              }
+              else if (hasAttackKeyword || hasAttackTag || hasLargeDiscrepancy) {
+                // IT'S AN ATTACK - FORCE RED
+                console.log("ATTACK DETECTED - SETTING RED BANNER");
                 
-                // Update spoofed vs actual display
-                spoofedWaterElement.style.height = `${height}%`;
-                actualWaterElement.style.height = `${actualHeight}%`;
-                spoofedLevelElement.innerText = newLevel.toFixed(3);
-                actualLevelElement.innerText = newActualLevel.toFixed(3);
+                // Set warning indicators
+                attackNameElement.innerHTML = `⚠️ ${displayName} ⚠️`;
                 
-                // Calculate and display discrepancy with more decimal places
-                const discrepancy = Math.abs(newLevel - newActualLevel).toFixed(3);
-                discrepancyElement.innerText = discrepancy;
+                // Remove all classes and add attack state
+                currentAttackElement.className = 'attack-state';
+              }
+              else if (hasDefenseKeyword || extractedType === "DEFENSE") {
+                // It's a defense mode - yellow
+                console.log("DEFENSE MODE - SETTING YELLOW BANNER");
                 
-                // If there's a significant discrepancy, highlight it
-                if (discrepancy > 5) {
-                  discrepancyElement.className = 'discrepancy-value text-danger fw-bold discrepancy-high';
-                  securityStatusElement.className = 'badge bg-danger';
-                  securityStatusElement.innerText = 'Potential Attack';
-                } else if (discrepancy > 0.5) {
-                  discrepancyElement.className = 'discrepancy-value text-warning fw-bold';
-                  securityStatusElement.className = 'badge bg-warning text-dark';
-                  securityStatusElement.innerText = 'Suspicious';
+                // Set defense indicator
+                if (!displayName.includes("Defense")) {
+                  attackNameElement.innerHTML = `🛡️ ${displayName} (Defense Active)`;
                 } else {
-                  discrepancyElement.className = 'discrepancy-value text-dark fw-bold';
-                  securityStatusElement.className = 'badge bg-success';
-                  securityStatusElement.innerText = 'Secured';
+                  attackNameElement.innerHTML = `🛡️ ${displayName}`;
                 }
-
-                // Update time
-                const currentTime = new Date().toLocaleTimeString();
-                updateTimeElement.innerText = currentTime;
                 
-                // SIMPLIFIED ATTACK BANNER HANDLING
-                if (data.active_attack && typeof data.active_attack === 'string') {
-                  const attackMessage = data.active_attack;
-                  
-                  // Extract display name and type (remove type tag if present)
-                  let displayName = attackMessage;
-                  let extractedType = "NORMAL";
-                  
-                  if (attackMessage.includes("[TYPE:")) {
-                    const parts = attackMessage.split("[TYPE:");
-                    displayName = parts[0].trim();
-                    extractedType = parts[1].split("]")[0]; // Extract the type value
-                    console.log("Extracted type:", extractedType);
-                  }
-                  
-                  // Update attack name display
-                  attackNameElement.innerText = displayName;
-                  
-                  // SIMPLIFIED DETECTION
-                  // 1. Check message content for attack keywords
-                  const hasAttackKeyword = 
-                    attackMessage.toLowerCase().includes("replay") || 
-                    attackMessage.toLowerCase().includes("false data") || 
-                    attackMessage.toLowerCase().includes("dos");
-                  
-                  // 2. Check for defense keywords or type
-                  const hasDefenseKeyword = 
-                    attackMessage.toLowerCase().includes("defense") || 
-                    attackMessage.toLowerCase().includes("with_defense") ||
-                    extractedType === "DEFENSE";
-                  
-                  // 3. Check for explicit attack type
-                  const hasAttackTag = extractedType === "ATTACK";
-                  
-                  // 4. Check significant discrepancy
-                  const hasLargeDiscrepancy = Math.abs(newLevel - newActualLevel) > 5;
-                  
-                  // Handle UI update in order of priority
-                  if (displayName.toLowerCase().includes("demonstration complete")) {
-                    // Demo has completed
-                    console.log("DEMO COMPLETE - SETTING COMPLETION BANNER");
-                    
-                    // Set completion message
-                    attackNameElement.innerHTML = `🎉 Demonstration Complete!`;
-                    countdownElement.innerHTML = "Demo has finished";
-                    
-                    // Apply blue completion style
-                    currentAttackElement.className = 'normal-state';
-                    currentAttackElement.style.backgroundColor = '#0d6efd !important';
-                    currentAttackElement.style.borderColor = '#0d6efd !important';
-                  }
-                  else if (hasAttackKeyword || hasAttackTag || hasLargeDiscrepancy) {
-                    // IT'S AN ATTACK - FORCE RED
-                    console.log("ATTACK DETECTED - SETTING RED BANNER");
-                    
-                    // Set warning indicators
-                    attackNameElement.innerHTML = `⚠️ ${displayName} ⚠️`;
-                    
-                    // Remove all classes and add attack state
-                    currentAttackElement.className = 'attack-state';
-                  }
-                  else if (hasDefenseKeyword || extractedType === "DEFENSE") {
-                    // It's a defense mode - yellow
-                    console.log("DEFENSE MODE - SETTING YELLOW BANNER");
-                    
-                    // Set defense indicator
-                    if (!displayName.includes("Defense")) {
-                      attackNameElement.innerHTML = `🛡️ ${displayName} (Defense Active)`;
-                    } else {
-                      attackNameElement.innerHTML = `🛡️ ${displayName}`;
-                    }
-                    
-                    currentAttackElement.className = 'defense-state';
-                  } 
-                  else {
-                    // Normal operation - green
-                    console.log("NORMAL MODE - SETTING GREEN BANNER");
-                    currentAttackElement.className = 'normal-state';
-                  }
-                  
-                  // Handle countdown
-                  countdownValue = data.time_remaining || 15;
+                currentAttackElement.className = 'defense-state';
+              } 
+              else {
+                // Normal operation - green
+                console.log("NORMAL MODE - SETTING GREEN BANNER");
+                currentAttackElement.className = 'normal-state';
+              }
+              
+              // Handle countdown
+              countdownValue = data.time_remaining || phaseDuration;
+              countdownElement.innerText = countdownValue;
+              
+              // Only setup countdown if not already running
+              if (data.timestamp_changed && !countdownInterval) {
+                countdownInterval = setInterval(() => {
+                  countdownValue = Math.max(0, countdownValue - 1);
                   countdownElement.innerText = countdownValue;
-                  
-                  // Only setup countdown if not already running
-                  if (data.timestamp_changed && !countdownInterval) {
-                    countdownInterval = setInterval(() => {
-                      countdownValue = Math.max(0, countdownValue - 1);
-                      countdownElement.innerText = countdownValue;
-                    }, 1000);
-                  }
-                }
+                }, 1000);
+              }
+            }
 
-                // Update history counter
-                historyPointsElement.innerText = data.history.length;
+            // Update history counter
+            historyPointsElement.innerText = data.history.length;
 
-                // Update chart with both datasets and timestamps
-                chart.data.datasets[0].data = data.history;
-                chart.data.datasets[1].data = data.actual_history;
-                chart.data.labels = data.timestamps;
-                chart.update();
-                
-                // Update defense events display
-                // Check for defense mode
-                const hasDefenseEvents = data.defense_events && data.defense_events.length > 0;
-                const hasDefenseMode = data.active_attack && typeof data.active_attack === 'string' && 
-                  (data.active_attack.includes('defense') || 
-                   data.active_attack.includes('with_defense') || 
-                   data.active_attack.includes('DEFENSE'));
+            // Update chart with both datasets and timestamps
+            chart.data.datasets[0].data = data.history;
+            chart.data.datasets[1].data = data.actual_history;
+            chart.data.labels = data.timestamps;
+            chart.update();
+            
+            // Update defense events display
+            // Check for defense mode
+            const hasDefenseEvents = data.defense_events && data.defense_events.length > 0;
+            const hasDefenseMode = data.active_attack && typeof data.active_attack === 'string' && 
+              (data.active_attack.includes('defense') || 
+               data.active_attack.includes('with_defense') || 
+               data.active_attack.includes('DEFENSE'));
+            
+            // Set defense header state - ACTIVE when either condition is true
+            if (hasDefenseEvents || hasDefenseMode) {
+              // Set defense header to ACTIVE state
+              defenseHeaderElement.className = 'card-header bg-primary text-white d-flex justify-content-between';
+              defenseStatusElement.innerHTML = '<span class="badge bg-success ms-2">Active</span>';
+            } else {
+              // Set defense header to INACTIVE state
+              defenseHeaderElement.className = 'card-header bg-secondary text-white d-flex justify-content-between';
+              defenseStatusElement.innerHTML = '<span class="badge bg-light text-dark ms-2">Inactive</span>';
+            }
+            
+            if (hasDefenseEvents) {
+              // Check if there are new events to highlight
+              const hasNewEvents = data.new_events && data.new_events.length > 0;
+              
+              // Update the events count badge
+              eventCountElement.textContent = `${data.defense_events.length} events`;
+              
+              // Clear the table content
+              defenseEventsElement.innerHTML = '';
+              
+              // Add each defense event to the table
+              data.defense_events.forEach(event => {
+                const row = document.createElement('tr');
                 
-                // Set defense header state - ACTIVE when either condition is true
-                if (hasDefenseEvents || hasDefenseMode) {
-                  // Set defense header to ACTIVE state
-                  defenseHeaderElement.className = 'card-header bg-primary text-white d-flex justify-content-between';
-                  defenseStatusElement.innerHTML = '<span class="badge bg-success ms-2">Active</span>';
-                } else {
-                  // Set defense header to INACTIVE state
-                  defenseHeaderElement.className = 'card-header bg-secondary text-white d-flex justify-content-between';
-                  defenseStatusElement.innerHTML = '<span class="badge bg-light text-dark ms-2">Inactive</span>';
+                // Check if this is a new event to highlight it
+                if (hasNewEvents && data.new_events.some(e => e.seq === event.seq)) {
+                  row.className = 'defense-event-new';
                 }
                 
-                if (hasDefenseEvents) {
-                  // Check if there are new events to highlight
-                  const hasNewEvents = data.new_events && data.new_events.length > 0;
-                  
-                  // Update the events count badge
-                  eventCountElement.textContent = `${data.defense_events.length} events`;
-                  
-                  // Clear the table content
-                  defenseEventsElement.innerHTML = '';
-                  
-                  // Add each defense event to the table
-                  data.defense_events.forEach(event => {
-                    const row = document.createElement('tr');
-                    
-                    // Check if this is a new event to highlight it
-                    if (hasNewEvents && data.new_events.some(e => e.raw === event.raw)) {
-                      row.className = 'defense-event-new';
-                    }
-                    
-                    // Add icon based on event type
-                    let icon = '<i class="bi bi-check-circle-fill text-primary"></i>';
-                    if (event.type === 'Anomaly') {
-                      icon = '<i class="bi bi-graph-up-arrow text-warning"></i>';
-                    } else if (event.type === 'Authentication') {
-                      icon = '<i class="bi bi-shield-check text-info"></i>';
-                    }
-                    
-                    // Create the table cells
-                    const timeCell = document.createElement('td');
-                    timeCell.textContent = event.timestamp;
-                    
-                    const messageCell = document.createElement('td');
-                    messageCell.innerHTML = event.message;
-                    
-                    const typeCell = document.createElement('td');
-                    typeCell.innerHTML = `${icon} ${event.type}`;
-                    
-                    // Add cells to the row
-                    row.appendChild(timeCell);
-                    row.appendChild(messageCell);
-                    row.appendChild(typeCell);
-                    
-                    // Add the row to the table
-                    defenseEventsElement.appendChild(row);
-                  });
-                } else if (hasDefenseMode) {
-                  // If in defense mode but no events yet
-                  defenseEventsElement.innerHTML = '';
-                  const row = document.createElement('tr');
-                  const cell = document.createElement('td');
-                  cell.colSpan = 3;
-                  cell.className = 'text-center text-primary py-3';
-                  cell.innerHTML = '<i class="bi bi-shield-check"></i> Defense systems active and monitoring...';
-                  row.appendChild(cell);
-                  defenseEventsElement.appendChild(row);
-                  
-                  eventCountElement.textContent = '0 events';
-                } else {
-                  // If no defense mode and no events
-                  defenseEventsElement.innerHTML = '';
-                  const row = document.createElement('tr');
-                  const cell = document.createElement('td');
-                  cell.colSpan = 3;
-                  cell.className = 'text-center text-muted py-3';
-                  cell.innerHTML = 'No defense events logged';
-                  row.appendChild(cell);
-                  defenseEventsElement.appendChild(row);
-                  
-                  eventCountElement.textContent = '0 events';
+                // Add icon based on event type
+                let icon = '<i class="bi bi-check-circle-fill text-primary"></i>';
+                if (event.type === 'Anomaly') {
+                  icon = '<i class="bi bi-graph-up-arrow text-warning"></i>';
+                } else if (event.type === 'Authentication') {
+                  icon = '<i class="bi bi-shield-check text-info"></i>';
                 }
+                
+                // Create the table cells
+                const timeCell = document.createElement('td');
+                timeCell.textContent = event.timestamp;
+                
+                const messageCell = document.createElement('td');
+                messageCell.innerHTML = event.message;
+                
+                const typeCell = document.createElement('td');
+                typeCell.innerHTML = `${icon} ${event.type}`;
+                
+                // Add cells to the row
+                row.appendChild(timeCell);
+                row.appendChild(messageCell);
+                row.appendChild(typeCell);
+                
+                // Add the row to the table
+                defenseEventsElement.appendChild(row);
               });
+            } else if (hasDefenseMode) {
+              // If in defense mode but no events yet
+              defenseEventsElement.innerHTML = '';
+              const row = document.createElement('tr');
+              const cell = document.createElement('td');
+              cell.colSpan = 3;
+              cell.className = 'text-center text-primary py-3';
+              cell.innerHTML = '<i class="bi bi-shield-check"></i> Defense systems active and monitoring...';
+              row.appendChild(cell);
+              defenseEventsElement.appendChild(row);
+              
+              eventCountElement.textContent = '0 events';
+            } else {
+              // If no defense mode and no events
+              defenseEventsElement.innerHTML = '';
+              const row = document.createElement('tr');
+              const cell = document.createElement('td');
+              cell.colSpan = 3;
+              cell.className = 'text-center text-muted py-3';
+              cell.innerHTML = 'No defense events logged';
+              row.appendChild(cell);
+              defenseEventsElement.appendChild(row);
+              
+              eventCountElement.textContent = '0 events';
+            }
           }
 
           // Initial rendering
@@ -708,111 +693,211 @@ def dashboard():
           }
           updateTimeElement.innerText = new Date().toLocaleTimeString();
 
-          // Periodic updates
-          setInterval(updateDashboard, 1000);  // Faster updates
+          // Dashboard state, kept up to date from stream or poll deltas
+          const state = {
+            level: waterLevel,
+            actual_level: actualWaterLevel,
+            history: [],
+            actual_history: [],
+            timestamps: [],
+            active_attack: '',
+            timestamp_changed: false,
+            time_remaining: phaseDuration,
+            defense_events: [],
+            new_events: []
+          };
+          let maxHistory = 30;
+          let maxDefenseEvents = 100;
+          let phaseStartedAt = Date.now();
+          let renderPending = false;
+
+          // Coalesce bursts of updates into one render per frame
+          function scheduleRender() {
+            if (renderPending) {
+              return;
+            }
+            renderPending = true;
+            requestAnimationFrame(() => {
+              renderPending = false;
+              state.time_remaining = Math.max(0, phaseDuration - Math.floor((Date.now() - phaseStartedAt) / 1000));
+              renderDashboard(state);
+              state.timestamp_changed = false;
+              state.new_events = [];
+            });
+          }
+
+          function applySnapshot(snapshot) {
+            Object.assign(state, snapshot);
+            state.new_events = [];
+            maxHistory = snapshot.max_history;
+            maxDefenseEvents = snapshot.max_defense_events;
+            phaseStartedAt = Date.now() - (phaseDuration - snapshot.time_remaining) * 1000;
+            state.timestamp_changed = true;
+          }
+
+          function applySample(sample) {
+            state.level = sample.level;
+            state.actual_level = sample.actual_level;
+            state.history.push(sample.level);
+            state.actual_history.push(sample.actual_level);
+            state.timestamps.push(sample.timestamp);
+            if (state.history.length > maxHistory) {
+              state.history.splice(0, state.history.length - maxHistory);
+              state.actual_history.splice(0, state.actual_history.length - maxHistory);
+              state.timestamps.splice(0, state.timestamps.length - maxHistory);
+            }
+          }
+
+          function applyPhase(activeAttack) {
+            state.active_attack = activeAttack;
+            state.timestamp_changed = true;
+            phaseStartedAt = Date.now();
+          }
+
+          function applyDefenseEvent(defenseEvent) {
+            state.defense_events.push(defenseEvent);
+            state.new_events.push(defenseEvent);
+            if (state.defense_events.length > maxDefenseEvents) {
+              state.defense_events.shift();
+            }
+          }
+
+          // Polling fallback: fetch the full state once, then only what changed
+          let pollCursor = null;
+          function updateDashboard() {
+            const url = pollCursor === null ? '/api/water-level' : `/api/water-level?since=${pollCursor}`;
+            fetch(url)
+              .then(response => response.json())
+              .then(data => {
+                if (data.samples === undefined) {
+                  applySnapshot(data);
+                } else {
+                  data.samples.forEach(applySample);
+                  if (data.timestamp_changed) {
+                    applyPhase(data.active_attack);
+                  }
+                  data.new_events.forEach(applyDefenseEvent);
+                }
+                pollCursor = data.cursor;
+                scheduleRender();
+              });
+          }
+
+          // Live updates: the server pushes deltas over Server-Sent Events,
+          // and the page only falls back to polling without EventSource support
+          if (window.EventSource) {
+            const source = new EventSource('/api/stream');
+            source.addEventListener('snapshot', event => {
+              applySnapshot(JSON.parse(event.data));
+              scheduleRender();
+            });
+            source.addEventListener('sample', event => {
+              applySample(JSON.parse(event.data));
+              scheduleRender();
+            });
+            source.addEventListener('phase', event => {
+              applyPhase(JSON.parse(event.data).active_attack);
+              scheduleRender();
+            });
+            source.addEventListener('defense', event => {
+              applyDefenseEvent(JSON.parse(event.data));
+              scheduleRender();
+            });
+          } else {
+            setInterval(updateDashboard, 1000);
+          }
         </script>
       </body>
     </html>
     """
-    return render_template_string(html, level=water_level, actual_level=actual_water_level)
+    return render_template_string(html, level=water_level, actual_level=actual_water_level,
+                                  phase_duration=PHASE_DURATION)
 
 
-@app.route('/api/water-level')
-def api_water_level():
-    global history, actual_history, timestamps, last_active_attack, attack_change_time, defense_events
+def describe_phase(event):
+    """Format a phase event as the banner string the page expects"""
+    display_message = event['name']
+    attack_type = event['type'] or "NORMAL"
     
-    # Get active attack and defense status from the console output
-    active_attack = ""
-    new_defense_events = []
+    # Detect attack names in the display message as a backup
+    lowered = display_message.lower()
+    if "replay" in lowered or "false data" in lowered or "false_data" in lowered or "dos" in lowered:
+        attack_type = "ATTACK"
     
-    with open('data/simulation.log', 'r') as f:
-        try:
-            lines = f.readlines()
-            
-            # Look for the most recent attack demo message
-            for line in reversed(lines[-50:]):
-                if "DEMO" in line and "demonstrating" in line:
-                    parts = line.split("demonstrating:")
-                    if len(parts) > 1:
-                        full_message = parts[1].strip()
-                        
-                        # Extract the attack type if present
-                        attack_type = "NORMAL"  # Default type
-                        if "[TYPE:" in full_message:
-                            type_parts = full_message.split("[TYPE:")
-                            attack_type = type_parts[1].split("]")[0]
-                            # Remove the type tag from the display message
-                            display_message = type_parts[0].strip()
-                        elif "[ATTACK]" in full_message:
-                            # Alternative attack tag format
-                            attack_type = "ATTACK"
-                            display_message = full_message.replace("[ATTACK]", "").strip()
-                        else:
-                            display_message = full_message
-                            
-                        # Detect attack names in the display message as a backup
-                        if ("Replay" in display_message or 
-                            "replay" in display_message or 
-                            "False Data" in display_message or 
-                            "false_data" in display_message or 
-                            "DoS" in display_message or 
-                            "dos" in display_message or
-                            "Dos" in display_message):
-                            print(f"Found attack name in display message: {display_message}")
-                            attack_type = "ATTACK"
-                        
-                        # For debugging - print what we found
-                        print(f"API found message: {display_message} with type: {attack_type}")
-                        
-                        # Only update if the attack is different or the current active_attack is empty
-                        if display_message != last_active_attack or not active_attack:
-                            # Format the attack string with consistent TYPE tag
-                            active_attack = f"{display_message} [TYPE:{attack_type}]"
-                            print(f"API returning active_attack: {active_attack}")
-                    break
-            
-            # Look for any defense activations in all available lines
-            for line in lines:
-                # Only process actual defense events, not demo announcements
-                if "[DEFENSE]" in line and "DEMO" not in line:
-                    log_time = datetime.fromtimestamp(get_timestamp_from_log(line))
-                    timestamp = log_time.strftime('%H:%M:%S')
-                    
-                    # Extract message and categorize it
-                    event_text = line.strip()
-                    if "[DEFENSE]" in event_text:
-                        message = event_text.split("[DEFENSE]")[1].strip()
-                    else:
-                        message = event_text
-                        
-                    # Determine event type
-                    event_type = "General"
-                    if "Anomaly" in message:
-                        event_type = "Anomaly"
-                    elif "authentication" in message or "authentic" in message:
-                        event_type = "Authentication"
-                    
-                    # Add to events if not already present
-                    event = {
-                        'timestamp': timestamp,
-                        'message': message,
-                        'type': event_type,
-                        'raw': event_text
-                    }
-                    
-                    # Check if this event is already in our list
-                    if event_text not in [e['raw'] for e in defense_events]:
-                        new_defense_events.append(event)
-                        
-        except Exception as e:
-            print(f"Error parsing log: {e}")
+    return f"{display_message} [TYPE:{attack_type}]"
+
+
+def describe_defense_event(event):
+    """Convert a defense event from the bus into a row for the events table"""
+    message = event['message']
+    timestamp = datetime.fromtimestamp(event['time']).strftime('%H:%M:%S')
     
-    # Add new events to our global list
-    defense_events.extend(new_defense_events)
+    # Determine event type
+    event_type = "General"
+    if "Anomaly" in message:
+        event_type = "Anomaly"
+    elif "authentication" in message or "authentic" in message:
+        event_type = "Authentication"
+    
+    return {
+        'seq': event['seq'],
+        'timestamp': timestamp,
+        'message': message,
+        'type': event_type,
+        'raw': f"{timestamp} {message}"
+    }
+
+
+def consume_events():
+    """Pull new events from the event bus into the dashboard state
+
+    Returns the defense events that arrived since the previous call.
+    """
+    global event_cursor, active_attack
+    with state_lock:
+        new_events = event_bus.events_since(event_cursor)
+        new_defense_events = []
+        for event in new_events:
+            if event['kind'] == 'phase':
+                active_attack = describe_phase(event)
+            elif event['kind'] == 'defense':
+                defense_event = describe_defense_event(event)
+                defense_events.append(defense_event)
+                new_defense_events.append(defense_event)
+        if new_events:
+            event_cursor = new_events[-1]['seq']
+        return new_defense_events
+
+
+def chart_history(rows):
+    """Split ring buffer rows into the level and history lists the page expects"""
+    history = rows[:, SampleRingBuffer.REPORTED].tolist()
+    actual_history = rows[:, SampleRingBuffer.ACTUAL].tolist()
+    timestamps = [datetime.fromtimestamp(t).strftime('%H:%M:%S') for t in rows[:, SampleRingBuffer.TIME]]
+    level = history[-1] if history else water_level
+    actual_level = actual_history[-1] if actual_history else actual_water_level
+    return level, actual_level, history, actual_history, timestamps
+
+
+def history_until(cursor):
+    """Newest chart rows published up to cursor
+
+    Samples published after it belong to the next ?since= delta or stream
+    event, so leaving them out keeps clients from seeing them twice.
+    """
+    rows = sample_history.snapshot(MAX_HISTORY + 1)
+    return rows[rows[:, SampleRingBuffer.SEQ] <= cursor][-MAX_HISTORY:]
+
+
+def refresh_state():
+    """Consume new bus events and restart the phase countdown if the attack changed
+
+    Returns the new defense events and whether the attack changed.
+    """
+    global last_active_attack, attack_change_time
     
-    # Keep only the most recent MAX_DEFENSE_EVENTS
-    if len(defense_events) > MAX_DEFENSE_EVENTS:
-        defense_events = defense_events[-MAX_DEFENSE_EVENTS:]
+    # Get active attack and new defense events from the event bus
+    new_defense_events = consume_events()
     
     # Detect if attack has changed
     timestamp_changed = False
@@ -821,46 +906,198 @@ def api_water_level():
         last_active_attack = active_attack
         attack_change_time = time.time()
     
+    return new_defense_events, timestamp_changed
+
+
+@app.route('/api/water-level')
+def api_water_level():
+    # Clients that pass ?since=<cursor> only get what changed after it, as long
+    # as the bus still holds everything after that cursor
+    since = request.args.get('since', type=int)
+    if since is not None and event_bus.first_seq() - 1 <= since <= event_bus.last_seq:
+        return jsonify(water_level_delta(since))
+    
+    new_defense_events, timestamp_changed = refresh_state()
+    with state_lock:
+        cursor = event_cursor
+        level, actual_level, history, actual_history, timestamps = chart_history(history_until(cursor))
+        current_defense_events = list(defense_events)
+    
     # Calculate time remaining until next attack
     time_elapsed = time.time() - attack_change_time
-    time_remaining = max(0, 15 - int(time_elapsed))
+    time_remaining = max(0, PHASE_DURATION - int(time_elapsed))
     
     return jsonify({
-        'level': water_level,
-        'actual_level': actual_water_level,
+        'cursor': cursor,
+        'level': level,
+        'actual_level': actual_level,
         'history': history,
         'actual_history': actual_history,
         'timestamps': timestamps,
+        'max_history': MAX_HISTORY,
         'active_attack': active_attack,
         'timestamp_changed': timestamp_changed,
         'time_remaining': time_remaining,
-        'defense_events': defense_events,
+        'defense_events': current_defense_events,
+        'max_defense_events': MAX_DEFENSE_EVENTS,
         'new_events': new_defense_events
     })
 
 
+def water_level_delta(since):
+    """Build an incremental /api/water-level response for events after since"""
+    refresh_state()
+    new_events = event_bus.events_since(since)
+    
+    samples = []
+    new_defense_events = []
+    phase_changed = False
+    for event in new_events:
+        if event['kind'] == 'sample':
+            samples.append({
+                'level': event['level'],
+                'actual_level': event['actual_level'],
+                'timestamp': event['timestamp']
+            })
+        elif event['kind'] == 'defense':
+            new_defense_events.append(describe_defense_event(event))
+        elif event['kind'] == 'phase':
+            phase_changed = True
+    
+    return {
+        'cursor': new_events[-1]['seq'] if new_events else since,
+        'level': samples[-1]['level'] if samples else water_level,
+        'actual_level': samples[-1]['actual_level'] if samples else actual_water_level,
+        'samples': samples,
+        'active_attack': active_attack,
+        'timestamp_changed': phase_changed,
+        'time_remaining': max(0, PHASE_DURATION - int(time.time() - attack_change_time)),
+        'new_events': new_defense_events
+    }
+
+
 def update_water_level(new_level, new_actual_level=None):
-    global water_level, actual_water_level, history, actual_history, timestamps
-    water_level = new_level
+    global water_level, actual_water_level
     
     # If actual level is provided, update it (otherwise keep the spoofed value as actual too)
-    if new_actual_level is not None:
-        actual_water_level = new_actual_level
-    else:
-        actual_water_level = new_level
+    if new_actual_level is None:
+        new_actual_level = new_level
+    water_level = new_level
+    actual_water_level = new_actual_level
 
-    # Add timestamp for this data point
-    current_time = datetime.now().strftime('%H:%M:%S')
-    timestamps.append(current_time)
-    
-    # Add to history and maintain maximum size
-    history.append(new_level)
-    actual_history.append(actual_water_level)
+    # Push the new sample to streaming clients and record it in the history
+    timestamp = sim_clock.time()
+    seq = event_bus.publish('sample', level=new_level, actual_level=new_actual_level,
+                            timestamp=datetime.fromtimestamp(timestamp).strftime('%H:%M:%S'))
+    sample_history.append(timestamp, new_level, new_actual_level, seq)
+
+
+def set_history_retention(size):
+    """Change how many samples are kept in memory, keeping the newest ones
+
+    Meant to be called before the simulation starts writing samples.
+    """
+    global sample_history, HISTORY_RETENTION
+    new_history = SampleRingBuffer(size)
+    for row in sample_history.snapshot(size):
+        new_history.append(*row)
+    HISTORY_RETENTION = size
+    sample_history = new_history
+
+
+@app.route('/api/history')
+def api_history():
+    """Return the retained history (optionally only the newest ?limit=N samples)"""
+    limit = request.args.get('limit', type=int)
+    rows = sample_history.snapshot(limit)
+    return jsonify({
+        'timestamps': rows[:, SampleRingBuffer.TIME].tolist(),
+        'history': rows[:, SampleRingBuffer.REPORTED].tolist(),
+        'actual_history': rows[:, SampleRingBuffer.ACTUAL].tolist(),
+        'retention': HISTORY_RETENTION
+    })
+
+
+@app.route('/api/metrics')
+def api_metrics():
+    """Per-stage timing of the simulation loop (run with --metrics to enable)"""
+    return jsonify(tick_metrics.snapshot())
+
+
+def format_sse(event_name, data, seq=None):
+    """Encode one Server-Sent Events message"""
+    message = f"event: {event_name}\ndata: {json.dumps(data)}\n\n"
+    if seq is not None:
+        message = f"id: {seq}\n" + message
+    return message
+
+
+def stream_snapshot():
+    """Full dashboard state sent when a stream (re)connects, with its bus cursor"""
+    refresh_state()
+    with state_lock:
+        cursor = event_cursor
+        level, actual_level, history, actual_history, timestamps = chart_history(history_until(cursor))
+        snapshot = {
+            'level': level,
+            'actual_level': actual_level,
+            'history': history,
+            'actual_history': actual_history,
+            'timestamps': timestamps,
+            'max_history': MAX_HISTORY,
+            'active_attack': active_attack,
+            'time_remaining': max(0, PHASE_DURATION - int(time.time() - attack_change_time)),
+            'defense_events': list(defense_events),
+            'max_defense_events': MAX_DEFENSE_EVENTS
+        }
+    return cursor, snapshot
+
+
+def stream_events(cursor):
+    """Generate SSE messages for every bus event after cursor"""
+    while True:
+        # Resend the full state if the client fell behind what the bus retains
+        if cursor < event_bus.first_seq() - 1:
+            cursor, snapshot = stream_snapshot()
+            yield format_sse('snapshot', snapshot, cursor)
+        
+        new_events = event_bus.wait_for_events(cursor, timeout=STREAM_KEEPALIVE)
+        if not new_events:
+            # Comment line keeps proxies from closing an idle connection
+            yield ": keepalive\n\n"
+            continue
+        
+        for event in new_events:
+            if event['kind'] == 'sample':
+                yield format_sse('sample', {
+                    'level': event['level'],
+                    'actual_level': event['actual_level'],
+                    'timestamp': event['timestamp']
+                }, event['seq'])
+            elif event['kind'] == 'phase':
+                yield format_sse('phase', {'active_attack': describe_phase(event)}, event['seq'])
+            elif event['kind'] == 'defense':
+                yield format_sse('defense', describe_defense_event(event), event['seq'])
+        cursor = new_events[-1]['seq']
+
+
+@app.route('/api/stream')
+def api_stream():
+    """Push dashboard updates as Server-Sent Events instead of polling"""
+    # Resume from the last event the browser saw if it is still on the bus
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    if last_event_id is not None and event_bus.first_seq() - 1 <= last_event_id <= event_bus.last_seq:
+        generator = stream_events(last_event_id)
+    else:
+        cursor, snapshot = stream_snapshot()
+        
+        def generator_with_snapshot():
+            yield format_sse('snapshot', snapshot, cursor)
+            yield from stream_events(cursor)
+        generator = generator_with_snapshot()
     
-    if len(history) > MAX_HISTORY:
-        history = history[-MAX_HISTORY:]
-        actual_history = actual_history[-MAX_HISTORY:]
-        timestamps = timestamps[-MAX_HISTORY:]
+    return Response(generator, mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 def run_dashboard():
@@ -0,0 +1,69 @@
+# secure-sim/scada_ui/history_store.py
+import time
+import numpy as np
+
+
+class SampleRingBuffer:
+    """Preallocated ring buffer of (timestamp, reported, actual, seq) samples
+
+    Meant for a single writer (the simulation thread) and many readers
+    (request threads). The writer never blocks: it bumps a version counter
+    before and after each write, and readers retry their copy if the version
+    changed underneath them, so a snapshot never mixes two ticks.
+    """
+    TIME, REPORTED, ACTUAL, SEQ = range(4)
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("Ring buffer capacity must be at least 1")
+        self.capacity = capacity
+        self.data = np.zeros((capacity, 4), dtype=np.float64)
+        self.count = 0  # Total samples ever appended
+        self.version = 0  # Odd while a write is in progress
+
+    def append(self, timestamp, reported, actual, seq=0):
+        """Store one sample, overwriting the oldest once the buffer is full"""
+        self.version += 1
+        row = self.data[self.count % self.capacity]
+        row[0] = timestamp
+        row[1] = reported
+        row[2] = actual
+        row[3] = seq
+        self.count += 1
+        self.version += 1
+
+    def snapshot(self, limit=None):
+        """Return a consistent copy of the newest samples, oldest first
+
+        The result is an (n, 4) array with columns TIME, REPORTED, ACTUAL
+        and SEQ, holding at most limit rows.
+        """
+        while True:
+            version = self.version
+            if version % 2:
+                time.sleep(0)  # A write is in progress, let the writer finish
+                continue
+            count = self.count
+            size = min(count, self.capacity)
+            if limit is not None:
+                size = min(size, limit)
+
+            # Copy the (possibly wrapped) range in at most two slices
+            start = (count - size) % self.capacity
+            end = start + size
+            if end <= self.capacity:
+                rows = self.data[start:end].copy()
+            else:
+                rows = np.concatenate((self.data[start:], self.data[:end - self.capacity]))
+
+            if self.version == version:
+                return rows
+            time.sleep(0)
+
+    def latest(self):
+        """Return the newest sample as a (timestamp, reported, actual, seq) row, or None"""
+        rows = self.snapshot(limit=1)
+        return rows[0] if len(rows) else None
+
+    def __len__(self):
+        return min(self.count, self.capacity)
@@ -0,0 +1,116 @@
+# secure-sim/tests/test_anomaly_detection.py
+import sys
+import os
+import unittest
+import random
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from defenses.anomaly_detection import AnomalyDetector, MultiStreamAnomalyDetector, RollingStats
+
+
+def numpy_z_score(history, current_value):
+    """Reference z-score computed from scratch with NumPy (the original method)"""
+    history_list = list(history)[:-1]  # Exclude current value
+    level_std = np.std(history_list)
+    if level_std > 0:
+        return abs(current_value - np.mean(history_list)) / level_std
+    return None
+
+
+class TestAnomalyDetector(unittest.TestCase):
+    
+    def test_rolling_stats_add_remove(self):
+        """Test that removing values restores the statistics of the rest"""
+        stats = RollingStats()
+        for value in [1.0, 2.0, 4.0, 8.0]:
+            stats.add(value)
+        stats.remove(1.0)
+        self.assertAlmostEqual(stats.mean, np.mean([2.0, 4.0, 8.0]))
+        self.assertAlmostEqual(stats.std(), np.std([2.0, 4.0, 8.0]))
+    
+    def test_detects_outlier(self):
+        """Test that a large jump after a steady signal is flagged"""
+        detector = AnomalyDetector()
+        for i in range(20):
+            self.assertIsNone(detector.add_observation(50.0 + 0.1 * (i % 3)))
+        anomalies = detector.add_observation(75.0)
+        self.assertEqual(len(anomalies), 1)
+        self.assertEqual(anomalies[0]['type'], 'level_outlier')
+    
+    def test_equivalence_with_numpy_over_long_run(self):
+        """Test that streaming statistics match the NumPy recomputation"""
+        rng = random.Random(1234)
+        detector = AnomalyDetector(window_size=20)
+        level = 50.0
+        
+        for i in range(50000):
+            # Random walk with occasional spikes and constant stretches
+            phase = (i // 500) % 4
+            if phase == 0:
+                level += rng.gauss(0, 0.5)
+            elif phase == 1:
+                level = 35.0
+            elif phase == 2:
+                level = 50.0 + rng.uniform(-30, 30) if rng.random() < 0.1 else level + rng.gauss(0, 0.2)
+            else:
+                level += rng.gauss(0, 5.0)
+            level = max(0.0, min(100.0, level))
+            
+            anomalies = detector.add_observation(level)
+            if len(detector.level_history) < detector.min_samples:
+                continue
+            
+            # The running sums must match NumPy on the reference window
+            reference = list(detector.level_history)[:-1]
+            level_mean, level_std = detector.get_window_stats()
+            self.assertAlmostEqual(level_mean, np.mean(reference), delta=1e-9)
+            self.assertAlmostEqual(level_std, np.std(reference), delta=1e-6)
+            
+            # And the detection decision must be the same
+            expected_z = numpy_z_score(detector.level_history, level)
+            expected_flag = expected_z is not None and expected_z > detector.z_score_threshold
+            self.assertEqual(anomalies is not None, expected_flag, f"mismatch at sample {i}")
+            if anomalies:
+                self.assertAlmostEqual(anomalies[0]['z_score'], expected_z, delta=1e-6 * expected_z)
+
+
+
+class TestMultiStreamAnomalyDetector(unittest.TestCase):
+    
+    def test_matches_single_stream_detectors(self):
+        """Test that batch scoring flags the same sensors as one detector per sensor"""
+        rng = np.random.default_rng(42)
+        num_sensors = 8
+        multi = MultiStreamAnomalyDetector(num_sensors, window_size=10)
+        singles = [AnomalyDetector(window_size=10) for _ in range(num_sensors)]
+        levels = np.full(num_sensors, 50.0)
+        
+        for tick in range(3000):
+            levels += rng.normal(0, 0.5, num_sensors)
+            # Inject spikes and hold some sensors constant
+            readings = levels.copy()
+            spikes = rng.random(num_sensors) < 0.02
+            readings[spikes] += rng.uniform(-30, 30, spikes.sum())
+            if (tick // 100) % 3 == 0:
+                readings[:2] = 40.0
+            
+            flagged = multi.add_observations(readings)
+            expected = [i for i, detector in enumerate(singles)
+                        if detector.add_observation(float(readings[i])) is not None]
+            self.assertEqual(flagged.tolist(), expected, f"mismatch at tick {tick}")
+    
+    def test_returns_indices_of_outliers(self):
+        """Test that only the sensor with a jump is reported"""
+        multi = MultiStreamAnomalyDetector(3)
+        for i in range(20):
+            self.assertEqual(multi.add_observations([50.0 + 0.1 * (i % 3)] * 3).size, 0)
+        flagged = multi.add_observations([50.0, 75.0, 50.1])
+        self.assertEqual(flagged.tolist(), [1])
+        self.assertEqual(multi.anomaly_counts.tolist(), [0, 1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
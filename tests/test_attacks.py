@@ -3,6 +3,7 @@ import sys
 import os
 import unittest
 import time
+import numpy as np
 
 # Add the parent directory to path to allow imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -11,6 +12,9 @@ from process_sim.water_tank import WaterTank
 from attacks.replay_attack import ReplayAttack
 from attacks.false_data_injection import FalseDataInjectionAttack
 from attacks.dos_attack import DoSAttack
+from process_sim.clock import sim_clock
+from process_sim.tank_fleet import TankFleet
+from attacks.base import Attack, ATTACK_REGISTRY, register_attack, available_attacks, create_attacks
 
 
 class TestAttacks(unittest.TestCase):
@@ -19,23 +23,63 @@ class TestAttacks(unittest.TestCase):
         self.tank = WaterTank(capacity=100.0, initial_level=50.0)
     
     def test_replay_attack(self):
-        """Test that the replay attack returns a fixed value"""
+        """Test that the replay attack refuses to start without a capture"""
         attack = ReplayAttack(self.tank)
         
         # Before the attack is started
         self.assertFalse(attack.running)
+        self.assertEqual(attack.warmup, attack.capture_window)
         
-        # Start the attack
+        # Nothing was captured, so there is nothing to replay
+        with self.assertRaises(RuntimeError):
+            attack.start()
+        self.assertFalse(attack.running)
+        
+        # Start the attack once it has seen the sensor
+        attack.observe(50.0, 0.0)
         attack.start()
         self.assertTrue(attack.running)
         
-        # Verify the attack returns a fixed value
-        self.assertEqual(attack.attack_value, 75.0)
-        
         # Stop the attack
         attack.stop()
         self.assertFalse(attack.running)
     
+    def test_replay_attack_replays_capture(self):
+        """Test that the replay attack loops back the readings it captured while idle"""
+        sim_clock.set_virtual(True, start_time=0.0)
+        try:
+            attack = ReplayAttack(self.tank, capture_window=5.0, max_samples=8)
+            # Captured once per second; only the last 5 seconds are replayed
+            for t in range(20):
+                attack.observe(float(t), float(t))
+            sim_clock.advance(20.0)
+            attack.start()
+            
+            # Readings while running are ignored rather than captured
+            attack.observe(999.0, 20.0)
+            
+            # Playback at a faster tick rate holds each sample for its original second
+            times = 20.0 + np.arange(0, 12, 0.5)
+            replayed = [float(attack.apply(0.0, t)) for t in times]
+            expected = [14, 14, 15, 15, 16, 16, 17, 17, 18, 18, 19, 19] * 2
+            self.assertEqual(replayed, expected)
+            
+            # The capture buffer is bounded by max_samples
+            self.assertEqual(attack.capture_values.shape, (8,))
+        finally:
+            sim_clock.set_virtual(False)
+    
+    def test_replay_attack_fleet_capture(self):
+        """Test that a fleet's readings are captured and replayed per tank in float32"""
+        attack = ReplayAttack(self.tank)
+        fleet_readings = np.array([10.0, 20.0, 30.0])
+        attack.observe(fleet_readings, 0.0)
+        attack.observe(fleet_readings + 1, 1.0)
+        attack.start()
+        self.assertEqual(attack.capture_values.dtype, np.float32)
+        replayed = attack.apply(np.zeros(3), attack.replay_start)
+        np.testing.assert_array_equal(replayed, fleet_readings)
+    
     def test_false_data_injection(self):
         """Test that the false data injection modifies readings"""
         attack = FalseDataInjectionAttack(self.tank)
@@ -85,6 +129,98 @@ class TestAttacks(unittest.TestCase):
         # Now we should immediately get the current value
         level_4 = attack.get_delayed_reading(80.0)
         self.assertEqual(level_4, 80.0)
+    
+    def test_dos_attack_virtual_time(self):
+        """Test that the DoS attack follows the virtual simulation clock"""
+        sim_clock.set_virtual(True, start_time=1000.0)
+        try:
+            attack = DoSAttack(self.tank)
+            attack.start()
+            
+            # No virtual time has passed, so the reading is still stale
+            self.assertEqual(attack.get_delayed_reading(70.0), 50.0)
+            
+            # Advancing the virtual clock past max_delay releases the new value
+            sim_clock.advance(attack.max_delay + 0.1)
+            self.assertEqual(attack.get_delayed_reading(70.0), 70.0)
+        finally:
+            sim_clock.set_virtual(False)
+
+    
+    def test_registry(self):
+        """Test that built-in and newly registered attacks are available by name"""
+        self.assertEqual(available_attacks()[:3], ['replay', 'false_data', 'dos'])
+        
+        @register_attack('stuck_at_zero')
+        class StuckAtZero(Attack):
+            def apply(self, readings, t):
+                return np.zeros_like(readings) if self.running else readings
+        try:
+            attacks = create_attacks(self.tank)
+            self.assertIsInstance(attacks['stuck_at_zero'], StuckAtZero)
+            self.assertIsInstance(attacks['dos'], DoSAttack)
+        finally:
+            del ATTACK_REGISTRY['stuck_at_zero']
+    
+    def test_defense_hook(self):
+        """Test that attacks only defend once defenses are switched on, each in their own way"""
+        @register_attack('stuck_at_zero')
+        class StuckAtZero(Attack):
+            def apply(self, readings, t):
+                return np.zeros_like(readings) if self.running else readings
+        try:
+            attack = create_attacks(self.tank)['stuck_at_zero']
+            self.assertFalse(attack.defended)
+            attack.set_defense(True)
+            self.assertTrue(attack.defended)
+            # Without its own defend() an attack goes unanswered
+            self.assertEqual(attack.defend(0.0, 50.0), (0.0, 0))
+        finally:
+            del ATTACK_REGISTRY['stuck_at_zero']
+        
+        dos = DoSAttack(self.tank)
+        dos.set_defense(True)
+        flags = set()
+        for _ in range(50):
+            reported, flag = dos.defend(30.0, 50.0)
+            flags.add(flag)
+            if flag:
+                self.assertAlmostEqual(reported, 50.0, delta=1.0)
+            else:
+                self.assertEqual(reported, 30.0)
+        self.assertEqual(len(flags), 2)
+    
+    def test_vectorized_attacks_on_fleet(self):
+        """Test that every attack transforms a whole fleet's readings in one call"""
+        sim_clock.set_virtual(True, start_time=0.0)
+        try:
+            fleet = TankFleet(1000, initial_level=np.linspace(0, 99, 1000))
+            levels = fleet.get_levels()
+            
+            replay = ReplayAttack(fleet)
+            replay.observe(levels, 0.0)
+            replay.start()
+            np.testing.assert_array_equal(replay.apply(levels + 1.0, 1.0), levels.astype(np.float32))
+            
+            false_data = FalseDataInjectionAttack(fleet)
+            false_data.start()
+            falsified = false_data.apply(levels, 0.0)
+            self.assertEqual(falsified.shape, (1000,))
+            # Deviations are independent per tank and bounded by the current intensity
+            self.assertGreater(len(np.unique(falsified - levels)), 900)
+            self.assertTrue(np.all(np.abs(falsified - levels) <= false_data.max_deviation * 0.02 + 1e-9))
+            
+            dos = DoSAttack(fleet)
+            dos.start()
+            np.testing.assert_array_equal(dos.apply(levels + 5, 0.5), levels)
+            # Past max_delay every tank has received the new readings
+            np.testing.assert_array_equal(dos.apply(levels + 5, dos.max_delay + 0.1), levels + 5)
+            
+            # Stopped attacks pass readings through untouched
+            dos.stop()
+            np.testing.assert_array_equal(dos.apply(levels, 10.0), levels)
+        finally:
+            sim_clock.set_virtual(False)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,115 @@
+# secure-sim/tests/test_authentication.py
+import sys
+import os
+import hmac
+import hashlib
+import logging
+import threading
+import unittest
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from defenses.authentication import CommandAuthenticator
+from process_sim.clock import sim_clock
+
+
+class TestCommandAuthenticator(unittest.TestCase):
+
+    def setUp(self):
+        sim_clock.set_virtual(True, start_time=1000.0)
+        self.authenticator = CommandAuthenticator()
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        sim_clock.set_virtual(False)
+        logging.disable(logging.NOTSET)
+
+    def test_accepts_signed_command_once(self):
+        """Test that a signed command is accepted and its replay rejected"""
+        command = self.authenticator.sign_command("get_backup_reading")
+        self.assertTrue(self.authenticator.authenticate_command(*command))
+        self.assertFalse(self.authenticator.authenticate_command(*command))
+        self.assertEqual(self.authenticator.seen_count, 1)
+
+    def test_rejects_bad_signature_and_stale_timestamp(self):
+        """Test that forged and expired commands are rejected and not remembered"""
+        cmd, timestamp, signature = self.authenticator.sign_command("get_backup_reading")
+        self.assertFalse(self.authenticator.authenticate_command("open_valve", timestamp, signature))
+
+        sim_clock.advance(10.0)
+        self.assertFalse(self.authenticator.authenticate_command(cmd, timestamp, signature))
+        self.assertEqual(self.authenticator.seen_count, 0)
+
+    def test_signing_within_one_tick_gives_distinct_commands(self):
+        """Test that commands signed at the same clock reading are both accepted"""
+        first = self.authenticator.sign_command("get_backup_reading")
+        second = self.authenticator.sign_command("get_backup_reading")
+        self.assertNotEqual(first[1], second[1])
+        self.assertTrue(self.authenticator.authenticate_command(*first))
+        self.assertTrue(self.authenticator.authenticate_command(*second))
+
+    def test_concurrent_signing_gives_distinct_timestamps(self):
+        """Test that threads signing at the same clock reading never share a timestamp"""
+        signed = []
+
+        def sign():
+            for _ in range(200):
+                signed.append(self.authenticator.sign_command("set_inflow * 1.0"))
+                signed.extend(self.authenticator.sign_batch(["set_outflow * 1.0"] * 5))
+
+        threads = [threading.Thread(target=sign) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        timestamps = [timestamp for _, timestamp, _ in signed]
+        self.assertEqual(len(set(timestamps)), 4 * 200 * 6)
+        self.assertEqual(self.authenticator.last_signed, max(timestamps))
+
+    def test_cache_expires_as_window_slides(self):
+        """Test that remembered signatures are dropped once they leave the window"""
+        for _ in range(100):
+            command = self.authenticator.sign_command("get_backup_reading")
+            self.assertTrue(self.authenticator.authenticate_command(*command))
+            sim_clock.advance(0.1)
+        # 10 s of commands, but only the last window plus one bucket is kept
+        window = self.authenticator.time_window + self.authenticator.bucket_width
+        self.assertLessEqual(self.authenticator.seen_count, int(window / 0.1) + 1)
+        self.assertLessEqual(len(self.authenticator.seen), window / self.authenticator.bucket_width + 1)
+
+    def test_full_cache_fails_closed(self):
+        """Test that new commands are rejected rather than old signatures forgotten"""
+        authenticator = CommandAuthenticator(max_entries=3)
+        commands = [authenticator.sign_command("get_backup_reading") for _ in range(4)]
+        results = [authenticator.authenticate_command(*command) for command in commands]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertFalse(authenticator.authenticate_command(*commands[0]))
+
+        authenticator.reset()
+        self.assertTrue(authenticator.authenticate_command(*commands[3]))
+
+    def test_signature_matches_plain_hmac(self):
+        """Test that the cloned key state signs exactly like hmac.new"""
+        expected = hmac.new(self.authenticator.shared_secret.encode(), b"open_valve|1000.5",
+                            hashlib.sha256).hexdigest()
+        self.assertEqual(self.authenticator.generate_hmac("open_valve", 1000.5), expected)
+        self.assertEqual(self.authenticator.generate_hmac("open_valve", 1000.5), expected)
+
+    def test_authenticate_batch(self):
+        """Test that a batch gets one verdict per command, replays and forgeries included"""
+        valid = [self.authenticator.sign_command(f"set_valve {i}") for i in range(3)]
+        cmd, timestamp, signature = self.authenticator.sign_command("open_valve")
+        batch = valid + [valid[0], ("close_valve", timestamp, signature), (cmd, timestamp, "not hex")]
+
+        verdicts = self.authenticator.authenticate_batch(batch)
+        self.assertEqual(verdicts.dtype, np.bool_)
+        self.assertEqual(verdicts.tolist(), [True, True, True, False, False, False])
+        # Commands accepted in the batch are replays afterwards
+        self.assertFalse(self.authenticator.authenticate_command(*valid[1]))
+        self.assertEqual(len(self.authenticator.authenticate_batch([])), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
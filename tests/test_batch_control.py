@@ -0,0 +1,58 @@
+# secure-sim/tests/test_batch_control.py
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from control_logic.batch_control import BatchController
+from control_logic.control import Controller
+from process_sim.tank_fleet import TankFleet
+from process_sim.water_tank import WaterTank
+
+
+class TestBatchController(unittest.TestCase):
+    
+    def test_proportional_matches_controller(self):
+        """Test that P-only batch control matches the single-tank Controller"""
+        initial_levels = [10.0, 45.0, 90.0]
+        fleet = TankFleet(3, capacity=100.0, initial_level=initial_levels)
+        batch = BatchController(3, setpoint=50.0)
+        
+        tanks = [WaterTank(capacity=100.0, initial_level=level) for level in initial_levels]
+        controllers = [Controller(tank, setpoint=50.0) for tank in tanks]
+        
+        for _ in range(50):
+            batch.step(fleet, dt=1.0)
+            fleet.update(dt=1.0)
+            for tank, controller in zip(tanks, controllers):
+                controller.step()
+                tank.update(dt=1.0)
+            np.testing.assert_allclose(fleet.get_levels(), [tank.get_level() for tank in tanks])
+    
+    def test_per_tank_setpoints_and_limits(self):
+        """Test that setpoints and output limits are applied per tank"""
+        batch = BatchController(3, setpoint=[20.0, 50.0, 80.0], kp=1.0,
+                                output_min=[0.0, 1.0, 0.0], output_max=[5.0, 4.0, 10.0])
+        output = batch.compute(np.array([50.0, 50.0, 50.0]))
+        np.testing.assert_allclose(output, [0.0, 2.5, 10.0])
+    
+    def test_anti_windup(self):
+        """Test that the integral stops growing while the output is saturated"""
+        batch = BatchController(1, setpoint=50.0, kp=0.1, ki=0.5)
+        for _ in range(100):
+            output = batch.compute(np.array([0.0]))
+        self.assertEqual(output[0], 5.0)
+        
+        # Without anti-windup the integral would be 5000 after 100 steps
+        self.assertLess(batch.integral[0], 10.0)
+        
+        # Once the level is above setpoint the output should leave saturation quickly
+        output = batch.compute(np.array([60.0]))
+        self.assertLess(output[0], 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
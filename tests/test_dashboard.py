@@ -0,0 +1,121 @@
+# secure-sim/tests/test_dashboard.py
+import sys
+import os
+import unittest
+from unittest import mock
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from defenses.event_bus import EventBus
+from scada_ui import dashboard
+from scada_ui.history_store import SampleRingBuffer
+
+
+class TestDashboard(unittest.TestCase):
+    
+    def setUp(self):
+        # A fresh, small bus and history for every test
+        patcher = mock.patch.multiple(dashboard, event_bus=EventBus(capacity=8), event_cursor=0,
+                                      sample_history=SampleRingBuffer(dashboard.HISTORY_RETENTION))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = dashboard.app.test_client()
+    
+    def first_message(self, **headers):
+        """First SSE message of a new /api/stream connection"""
+        response = self.client.get('/api/stream', headers=headers)
+        try:
+            return next(iter(response.response)).decode()
+        finally:
+            response.close()
+    
+    def test_stream_resumes_from_last_event_id(self):
+        """Test that a reconnecting stream continues after the last event the browser saw"""
+        dashboard.update_water_level(40.0, 41.0)
+        dashboard.update_water_level(42.0, 43.0)
+        message = self.first_message(**{'Last-Event-ID': '1'})
+        self.assertTrue(message.startswith('id: 2\nevent: sample\n'))
+    
+    def test_stream_snapshot_for_unknown_last_event_id(self):
+        """Test that evicted and future Last-Event-IDs get a full snapshot"""
+        for i in range(10):
+            dashboard.update_water_level(float(i))
+        # Events 1 and 2 were dropped from the bus
+        self.assertTrue(self.first_message(**{'Last-Event-ID': '1'}).startswith('id: 10\nevent: snapshot\n'))
+        # An id the bus never issued, e.g. from before a restart
+        self.assertTrue(self.first_message(**{'Last-Event-ID': '500'}).startswith('id: 10\nevent: snapshot\n'))
+    
+    def test_water_level_since(self):
+        """Test that ?since= returns only what was published after the cursor"""
+        dashboard.update_water_level(40.0, 41.0)
+        full = self.client.get('/api/water-level').get_json()
+        self.assertEqual(full['cursor'], 1)
+        self.assertEqual(full['history'], [40.0])
+        
+        dashboard.update_water_level(42.0, 43.0)
+        dashboard.event_bus.publish('phase', name='Replay Attack', type='ATTACK')
+        dashboard.update_water_level(44.0, 45.0)
+        delta = self.client.get(f"/api/water-level?since={full['cursor']}").get_json()
+        self.assertEqual(delta['cursor'], 4)
+        self.assertEqual([sample['level'] for sample in delta['samples']], [42.0, 44.0])
+        self.assertEqual(delta['actual_level'], 45.0)
+        self.assertTrue(delta['timestamp_changed'])
+        self.assertNotIn('history', delta)
+    
+    def test_water_level_cursor_continuity(self):
+        """Test that following the returned cursors sees every sample exactly once"""
+        cursor = self.client.get('/api/water-level').get_json()['cursor']
+        seen = []
+        for i in range(5):
+            for j in range(i):
+                dashboard.update_water_level(float(len(seen) + j))
+            delta = self.client.get(f'/api/water-level?since={cursor}').get_json()
+            seen.extend(sample['level'] for sample in delta['samples'])
+            cursor = delta['cursor']
+        self.assertEqual(seen, [float(i) for i in range(10)])
+        self.assertEqual(cursor, dashboard.event_bus.last_seq)
+    
+    def test_water_level_unknown_cursor(self):
+        """Test that evicted and future cursors get the full response"""
+        for i in range(10):
+            dashboard.update_water_level(float(i))
+        # Events 1 and 2 were dropped from the bus, 500 was never issued
+        for since in (1, 500):
+            response = self.client.get(f'/api/water-level?since={since}').get_json()
+            self.assertEqual(response['cursor'], 10)
+            self.assertEqual(response['history'], [float(i) for i in range(10)])
+    
+    def test_full_response_stops_at_cursor(self):
+        """Test that history rows newer than the returned cursor are left for the next delta"""
+        dashboard.update_water_level(40.0)
+        # A sample stored after the response's cursor was taken
+        dashboard.sample_history.append(0.0, 99.0, 99.0, dashboard.event_bus.last_seq + 1)
+        full = self.client.get('/api/water-level').get_json()
+        self.assertEqual(full['cursor'], 1)
+        self.assertEqual(full['history'], [40.0])
+
+    
+    def test_late_reader_keeps_phase_and_defense_events(self):
+        """Test that the phase and defense events survive being pushed off the bus by samples"""
+        dashboard.event_bus.publish_phase('Replay Attack', 'ATTACK')
+        dashboard.event_bus.publish('defense', message='Anomaly detection identified replay attack')
+        for i in range(20):
+            dashboard.update_water_level(float(i))
+        
+        full = self.client.get('/api/water-level?since=1').get_json()
+        self.assertEqual(full['cursor'], 22)
+        self.assertEqual(full['active_attack'], 'Replay Attack [TYPE:ATTACK]')
+        self.assertEqual([event['message'] for event in full['defense_events']],
+                         ['Anomaly detection identified replay attack'])
+    
+    def test_page_uses_server_phase_duration(self):
+        """Test that the countdown on the page comes from PHASE_DURATION"""
+        with mock.patch.object(dashboard, 'PHASE_DURATION', 42):
+            page = self.client.get('/').get_data(as_text=True)
+        self.assertIn('const phaseDuration = 42;', page)
+        self.assertIn('<span id="countdown-timer">42</span>', page)
+
+
+if __name__ == '__main__':
+    unittest.main()
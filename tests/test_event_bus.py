@@ -0,0 +1,89 @@
+# secure-sim/tests/test_event_bus.py
+import sys
+import os
+import unittest
+import threading
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from defenses.event_bus import EventBus, event_bus
+from defenses.logging_defense import log_anomaly
+
+
+class TestEventBus(unittest.TestCase):
+    
+    def test_events_since(self):
+        """Test that readers only get events after their cursor"""
+        bus = EventBus()
+        first = bus.publish('defense', message='one')
+        bus.publish('defense', message='two')
+        bus.publish('defense', message='three')
+        
+        self.assertEqual([e['message'] for e in bus.events_since(first)], ['two', 'three'])
+        self.assertEqual(bus.events_since(bus.last_seq), [])
+        self.assertEqual(len(bus.events_since(0)), 3)
+    
+    def test_bounded_capacity(self):
+        """Test that the oldest events are dropped once the bus is full"""
+        bus = EventBus(capacity=10)
+        for i in range(25):
+            bus.publish('sample', level=float(i))
+        self.assertEqual(len(bus.events), 10)
+        self.assertEqual(bus.first_seq(), 16)
+        self.assertEqual([e['seq'] for e in bus.events_since(0)], list(range(16, 26)))
+    
+    def test_notices_outlive_samples(self):
+        """Test that a reader behind the bus still gets the phase and recent defense events"""
+        bus = EventBus(capacity=10, notice_capacity=2)
+        phase = bus.publish_phase('Replay Attack', 'ATTACK')
+        for i in range(3):
+            bus.publish('defense', message=str(i))
+        for i in range(20):
+            bus.publish('sample', level=float(i))
+        
+        # The latest phase, then the two newest defense events, then the bus itself
+        events = bus.events_since(0)
+        self.assertEqual([e['seq'] for e in events[:3]], [phase, 3, 4])
+        self.assertEqual([e['message'] for e in events[1:3]], ['1', '2'])
+        self.assertEqual([e['seq'] for e in events[3:]], list(range(15, 25)))
+        # Readers that are not behind get just the new events
+        self.assertEqual(len(bus.events_since(14)), 10)
+        self.assertEqual([e['seq'] for e in bus.events_since(3)], [4] + list(range(15, 25)))
+    
+    def test_wait_for_events(self):
+        """Test that waiting readers wake up on publish and time out when idle"""
+        bus = EventBus()
+        self.assertEqual(bus.wait_for_events(0, timeout=0.01), [])
+        
+        timer = threading.Timer(0.05, bus.publish, args=('sample',), kwargs={'level': 42.0})
+        timer.start()
+        events = bus.wait_for_events(0, timeout=5)
+        timer.join()
+        self.assertEqual([e['level'] for e in events], [42.0])
+    
+    def test_phase_changes_are_deduplicated(self):
+        """Test that repeating the current phase does not publish again"""
+        bus = EventBus()
+        self.assertIsNotNone(bus.publish_phase('Replay Attack', 'ATTACK'))
+        self.assertIsNone(bus.publish_phase('Replay Attack', 'ATTACK'))
+        self.assertIsNotNone(bus.publish_phase('Dos With Defense', 'DEFENSE'))
+        self.assertEqual(len(bus.events), 2)
+    
+    def test_log_anomaly_publishes_events(self):
+        """Test that log_anomaly publishes defense and phase events"""
+        cursor = event_bus.last_seq
+        log_anomaly("[DEMO] Now demonstrating: False Data Attack [TYPE:ATTACK]")
+        log_anomaly("[DEMO] Now demonstrating: False Data Attack [TYPE:ATTACK]")
+        log_anomaly("[DEFENSE] Anomaly detection identified false data injection")
+        log_anomaly("Tank level out of bounds: 100.0")
+        
+        events = event_bus.events_since(cursor)
+        self.assertEqual([e['kind'] for e in events], ['phase', 'defense'])
+        self.assertEqual(events[0]['name'], 'False Data Attack')
+        self.assertEqual(events[0]['type'], 'ATTACK')
+        self.assertEqual(events[1]['message'], 'Anomaly detection identified false data injection')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# secure-sim/tests/test_integrators.py
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from process_sim.integrators import RK4Integrator, RK45Integrator, get_integrator
+from process_sim.water_tank import WaterTank
+from process_sim.tank_fleet import TankFleet
+
+
+def torricelli_level(initial_level, k, t):
+    """Exact level of a tank draining as dh/dt = -k * sqrt(h)"""
+    return (np.sqrt(initial_level) - k * t / 2) ** 2
+
+
+class TestIntegrators(unittest.TestCase):
+    
+    def test_exponential_decay(self):
+        """Test RK4 and RK45 against y' = -y"""
+        f = lambda t, y: -y
+        y0 = np.array([1.0, 2.0])
+        expected = y0 * np.exp(-2.0)
+        np.testing.assert_allclose(RK4Integrator(max_step=0.1).integrate(f, 0.0, y0, 2.0), expected, rtol=1e-5)
+        np.testing.assert_allclose(RK45Integrator(rtol=1e-8).integrate(f, 0.0, y0, 2.0), expected, rtol=1e-7)
+    
+    def test_rk45_adapts_step(self):
+        """Test that steady flows take few steps and fast dynamics take many"""
+        steady = RK45Integrator()
+        steady.integrate(lambda t, y: np.full_like(y, 0.5), 0.0, np.zeros(3), 1000.0)
+        self.assertEqual(steady.steps_accepted, 1)
+        
+        fast = RK45Integrator()
+        fast.integrate(lambda t, y: -50 * y, 0.0, np.ones(3), 1.0)
+        self.assertGreater(fast.steps_accepted, 10)
+    
+    def test_torricelli_tank(self):
+        """Test that higher-order integrators stay accurate with large steps where Euler does not"""
+        exact = torricelli_level(81.0, 0.5, 10.0)
+        errors = {}
+        for name in ['euler', 'rk4', 'rk45']:
+            tank = WaterTank(initial_level=81.0, integrator=name, drain_coefficient=0.5)
+            tank.update(dt=5.0)
+            tank.update(dt=5.0)
+            errors[name] = abs(tank.get_level() - exact)
+        self.assertGreater(errors['euler'], 1.0)
+        self.assertLess(errors['rk4'], 1e-2)
+        self.assertLess(errors['rk45'], 1e-4)
+    
+    def test_fleet_matches_single_tanks(self):
+        """Test that a fleet integrates each tank like an individual WaterTank"""
+        levels = np.array([10.0, 40.0, 90.0])
+        fleet = TankFleet(3, initial_level=levels, integrator='rk4', drain_coefficient=[0.2, 0.5, 1.0])
+        fleet.set_inflow([1.0, 2.0, 3.0])
+        fleet.update(dt=2.0)
+        for i, k in enumerate([0.2, 0.5, 1.0]):
+            tank = WaterTank(initial_level=levels[i], integrator='rk4', drain_coefficient=k)
+            tank.set_inflow(i + 1.0)
+            self.assertAlmostEqual(fleet.get_levels()[i], tank.update(dt=2.0))
+    
+    def test_unknown_integrator(self):
+        """Test that an unknown integrator name is rejected"""
+        with self.assertRaises(ValueError):
+            get_integrator('leapfrog')
+
+
+if __name__ == '__main__':
+    unittest.main()
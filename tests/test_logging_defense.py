@@ -0,0 +1,67 @@
+# secure-sim/tests/test_logging_defense.py
+import sys
+import os
+import io
+import unittest
+import threading
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from defenses.logging_defense import AsyncLogWriter
+
+
+class SlowStream(io.StringIO):
+    """Stream whose writes block until released, to simulate a stalled disk"""
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.writes = 0
+    
+    def write(self, text):
+        self.release.wait()
+        self.writes += 1
+        return super().write(text)
+
+
+class TestAsyncLogWriter(unittest.TestCase):
+    
+    def test_close_drains_all_messages(self):
+        """Test that every queued message reaches the stream on close"""
+        stream = io.StringIO()
+        writer = AsyncLogWriter(stream, flush_interval=60)
+        for i in range(1000):
+            writer.write(f"line {i}\n")
+        writer.close()
+        
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 1000)
+        self.assertEqual(lines[-1], "line 999")
+    
+    def test_writes_are_batched(self):
+        """Test that many small writes become a few stream writes"""
+        stream = SlowStream()
+        stream.release.set()
+        writer = AsyncLogWriter(stream, flush_interval=60)
+        for i in range(500):
+            writer.write("x\n")
+        writer.close()
+        self.assertEqual(stream.getvalue().count("x"), 500)
+        self.assertLess(stream.writes, 10)
+    
+    def test_never_blocks_on_stalled_stream(self):
+        """Test that callers keep going and messages are dropped when the queue is full"""
+        stream = SlowStream()
+        writer = AsyncLogWriter(stream, max_queue=10, flush_interval=0)
+        for i in range(100):
+            writer.write(f"line {i}\n")
+        self.assertGreater(writer.dropped, 0)
+        
+        # Once the stream recovers everything that was queued is written
+        stream.release.set()
+        writer.close()
+        self.assertIn("messages dropped", stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+# secure-sim/tests/test_modbus.py
+import sys
+import os
+import asyncio
+import unittest
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scada_net.modbus import (ModbusServer, ModbusClient, ModbusError, ILLEGAL_DATA_ADDRESS,
+                              ILLEGAL_FUNCTION, to_register)
+from scada_net.attack_clients import ReplayProxy, flood
+from process_sim.water_tank import WaterTank
+from process_sim.tank_fleet import TankFleet
+from control_logic.command_channel import CommandChannel
+from defenses.authentication import CommandAuthenticator
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=10))
+
+
+class TestModbusServer(unittest.TestCase):
+
+    def setUp(self):
+        self.tank = WaterTank(capacity=100.0, initial_level=42.5)
+
+    def test_localhost_only(self):
+        """Test that the server refuses to listen on non-loopback addresses"""
+        with self.assertRaises(ValueError):
+            ModbusServer(self.tank, host='0.0.0.0')
+        ModbusServer(self.tank, host='::1')
+
+    def test_read_and_write_registers(self):
+        """Test reading the level and setting flows over the wire"""
+        async def scenario():
+            server = ModbusServer(self.tank, port=0)
+            await server.start()
+            async with ModbusClient(port=server.port) as client:
+                self.assertEqual(await client.read_levels(), [42.5])
+                await client.write_register(0, to_register(3.25))
+                await client.write_registers(0, [to_register(1.5), to_register(2.0)])
+                holding = await client.read_holding_registers(0, 2)
+                with self.assertRaises(ModbusError) as error:
+                    await client.read_input_registers(1, 1)
+                self.assertEqual(error.exception.code, ILLEGAL_DATA_ADDRESS)
+                with self.assertRaises(ModbusError) as error:
+                    await client.request(bytes([0x2B]))
+                self.assertEqual(error.exception.code, ILLEGAL_FUNCTION)
+            server.server.close()
+            return holding, server
+
+        holding, server = run(scenario())
+        self.assertEqual(holding, [150, 200])
+        self.assertEqual((self.tank.inflow, self.tank.outflow), (1.5, 2.0))
+        self.assertEqual(server.requests, 6)
+
+    def test_fleet_registers_and_concurrent_clients(self):
+        """Test one register per tank and many clients at once"""
+        fleet = TankFleet(3, initial_level=[10.0, 20.0, 30.0])
+
+        async def scenario():
+            server = ModbusServer(fleet, port=0)
+            await server.start()
+            clients = [await ModbusClient(port=server.port).connect() for _ in range(20)]
+            readings = await asyncio.gather(*(client.read_levels(0, 3) for client in clients))
+            await clients[0].write_registers(4, [to_register(0.5)])  # Outflow of tank 1
+            for client in clients:
+                await client.close()
+            server.server.close()
+            return readings, server.connections
+
+        readings, connections = run(scenario())
+        self.assertEqual(readings, [[10.0, 20.0, 30.0]] * 20)
+        self.assertEqual(connections, 20)
+        np.testing.assert_array_equal(fleet.outflow, [0.0, 0.5, 0.0])
+
+    def test_writes_through_command_channel(self):
+        """Test that register writes become signed commands applied at the channel's flush"""
+        fleet = TankFleet(2)
+        channel = CommandChannel(fleet, CommandAuthenticator())
+
+        async def scenario():
+            server = ModbusServer(fleet, port=0, command_channel=channel)
+            await server.start()
+            async with ModbusClient(port=server.port) as client:
+                await client.write_registers(1, [to_register(2.5), to_register(0.75)])
+            server.server.close()
+
+        run(scenario())
+        # Nothing reaches the tanks until the simulation flushes the channel
+        np.testing.assert_array_equal(fleet.inflow, [0.0, 0.0])
+        self.assertEqual(channel.flush(), 2)
+        np.testing.assert_array_equal(fleet.inflow, [0.0, 2.5])
+        np.testing.assert_array_equal(fleet.outflow, [0.75, 0.0])
+        self.assertEqual((channel.sent, channel.rejected), (2, 0))
+
+    def test_replay_proxy_serves_captured_levels(self):
+        """Test that the proxy keeps returning captured levels after the tank changed"""
+        async def scenario():
+            server = ModbusServer(self.tank, port=0)
+            await server.start()
+            proxy = ReplayProxy('127.0.0.1', server.port)
+            await proxy.start()
+            async with ModbusClient(port=proxy.port) as client:
+                captured = [await client.read_levels()]
+                self.tank.level = 60.0
+                captured.append(await client.read_levels())
+                proxy.start_replay()
+                self.tank.level = 90.0
+                replayed = [await client.read_levels() for _ in range(3)]
+                await client.write_register(0, to_register(4.0))  # Writes still get through
+                proxy.stop_replay()
+                live = await client.read_levels()
+            proxy.close()
+            server.server.close()
+            return captured, replayed, live
+
+        captured, replayed, live = run(scenario())
+        self.assertEqual(captured, [[42.5], [60.0]])
+        self.assertEqual(replayed, [[42.5], [60.0], [42.5]])
+        self.assertEqual(live, [90.0])
+        self.assertEqual(self.tank.inflow, 4.0)
+
+    def test_background_thread(self):
+        """Test serving from a background thread while the caller runs its own loop"""
+        server = ModbusServer(self.tank, port=0)
+        server.start_in_thread()
+        try:
+            async def read():
+                async with ModbusClient(port=server.port) as client:
+                    return await client.read_levels()
+            self.assertEqual(run(read()), [42.5])
+        finally:
+            server.stop()
+        self.assertFalse(server.thread.is_alive())
+
+    def test_flood(self):
+        """Test that the flood client gets replies on every connection"""
+        async def scenario():
+            server = ModbusServer(self.tank, port=0)
+            await server.start()
+            replies = await flood('127.0.0.1', server.port, connections=4, duration=0.2, pipeline=8)
+            server.server.close()
+            return replies, server
+
+        replies, server = run(scenario())
+        self.assertGreater(replies, 0)
+        self.assertEqual(replies % 8, 0)
+        self.assertEqual(server.connections, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# secure-sim/tests/test_montecarlo.py
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analysis.montecarlo import run_scenario, scenario_seeds, scenario_metrics, aggregate
+from analysis.run_store import MemoryRecorder, DEFENSE_ACTIVE, REPLAY_CORRECTED
+from process_sim.clock import sim_clock
+
+
+class TestMonteCarlo(unittest.TestCase):
+    
+    def test_seeds_are_reproducible(self):
+        """Test that the same base seed gives the same per-run seeds"""
+        seeds = scenario_seeds(42, 10)
+        self.assertEqual(seeds, scenario_seeds(42, 10))
+        self.assertEqual(len(set(seeds)), 10)
+        self.assertNotEqual(seeds, scenario_seeds(43, 10))
+        # Adding runs does not change the seeds of earlier runs
+        self.assertEqual(scenario_seeds(42, 20)[:10], seeds)
+    
+    def test_scenario_metrics(self):
+        """Test discrepancy, detection time and overflow counting"""
+        recorder = MemoryRecorder()
+        actual = [50, 100, 100, 60, 100, 0]
+        for i, level in enumerate(actual):
+            flags = DEFENSE_ACTIVE | (REPLAY_CORRECTED if i >= 3 else 0)
+            recorder.append(10.0 + i, level + (5 if i == 2 else 0), level, 2.0, 1.0, 'replay', flags)
+        
+        metrics = scenario_metrics(recorder)
+        self.assertAlmostEqual(metrics['mean_discrepancy'], 5 / 6)
+        self.assertEqual(metrics['max_discrepancy'], 5.0)
+        self.assertEqual(metrics['time_to_detection'], 3.0)
+        self.assertEqual(metrics['overflow_events'], 2)
+        self.assertEqual(metrics['empty_events'], 1)
+    
+    def test_aggregate(self):
+        """Test that runs are grouped per attack/defense combination"""
+        run = {'mean_discrepancy': 1.0, 'max_discrepancy': 4.0, 'time_to_detection': None,
+               'overflow_events': 1, 'empty_events': 0}
+        detected = dict(run, time_to_detection=2.0, max_discrepancy=2.0)
+        summary = aggregate([(('dos', True), run), (('dos', True), detected), (('dos', False), run)])
+        
+        self.assertEqual([(row['attack'], row['defense']) for row in summary], [('dos', False), ('dos', True)])
+        self.assertEqual(summary[1]['runs'], 2)
+        self.assertEqual(summary[1]['detection_rate'], 0.5)
+        self.assertEqual(summary[1]['mean_time_to_detection'], 2.0)
+        self.assertEqual(summary[1]['max_discrepancy'], 4.0)
+        self.assertEqual(summary[1]['overflow_events'], 2)
+    
+    def test_replay_scenario_replays_capture(self):
+        """Test that a replay scenario captures before attacking and replays a varying trace"""
+        recording = run_scenario('replay', False, 60, seed=3)
+        attacked = recording['phase'] == recording.phases.index('replay')
+        
+        # A full capture window of normal operation comes first
+        self.assertEqual(int(np.count_nonzero(~attacked)), 60)
+        self.assertEqual(int(np.count_nonzero(attacked)), 60)
+        # The tank was filling during the capture, so the replayed levels vary
+        replayed = recording['reported'][attacked]
+        self.assertGreater(float(np.ptp(replayed)), 1.0)
+        # They are old readings, not the current ones
+        np.testing.assert_array_less(replayed[:10], recording['actual'][attacked][:10])
+
+    
+    def test_metrics_skip_warmup(self):
+        """Test that a warmup before the attack does not change its metrics"""
+        without = scenario_metrics(run_scenario('false_data', True, 30, seed=1))
+        warmed_up = scenario_metrics(run_scenario('false_data', True, 30, seed=1, warmup=20))
+        self.assertEqual(warmed_up['time_to_detection'], without['time_to_detection'])
+        self.assertAlmostEqual(warmed_up['mean_discrepancy'], without['mean_discrepancy'])
+        
+        # Replay always warms up for its capture window, which is not detection time
+        replay = scenario_metrics(run_scenario('replay', True, 30, seed=1))
+        self.assertLess(replay['time_to_detection'], 30)
+
+    
+    def test_scenario_restores_wall_clock(self):
+        """Test that a scenario hands the clock back to wall time when it ends"""
+        recording = run_scenario('none', False, 5, seed=1)
+        self.assertEqual(len(recording), 5)
+        self.assertFalse(sim_clock.virtual)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+# secure-sim/tests/test_request_queue.py
+import sys
+import os
+import random
+import unittest
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from process_sim.request_queue import RequestQueue, LEGIT_CLIENT
+from process_sim.water_tank import WaterTank
+from process_sim.clock import sim_clock
+from defenses.rate_limiting import TokenBucket, ClientRateLimiter
+from attacks.flood_attack import RequestFloodAttack
+from analysis.flood_study import run_flood
+
+
+class TestRequestQueue(unittest.TestCase):
+
+    def test_fifo_service_and_drops(self):
+        """Test queueing delay, drops when full and timeouts"""
+        queue = RequestQueue(capacity=3, service_time=0.1, timeout=0.2)
+        latencies = [queue.submit(0.0, 'attacker') for _ in range(4)]
+        self.assertEqual(latencies[3], None)  # Queue full
+        np.testing.assert_allclose(latencies[:3], [0.1, 0.2, 0.3])
+
+        # The first request has left by 0.15, so a read gets in but waits behind two others
+        self.assertFalse(queue.read(0.15))
+        self.assertEqual((queue.reads, queue.reads_dropped, queue.reads_timed_out), (1, 0, 1))
+        self.assertFalse(queue.read(0.15))
+        self.assertEqual(queue.reads_dropped, 1)
+
+        # Once the queue drains, reads take just the service time
+        self.assertTrue(queue.read(10.0))
+        stats = queue.stats()
+        self.assertAlmostEqual(stats['drop_rate'], 1 / 3)
+        # The late read is in the percentiles, the dropped one is not
+        self.assertAlmostEqual(stats['read_p50_ms'], 175.0)
+        self.assertAlmostEqual(stats['read_max_ms'], 250.0)
+
+    def test_flood_counts(self):
+        """Test that a flood over capacity drops requests and no reads are left for percentiles"""
+        queue = RequestQueue(capacity=8, service_time=0.01)
+        rng = np.random.default_rng(0)
+        for t in range(1, 11):
+            queue.flood(t - 1, t, 2000.0, rng)
+            queue.read(t)
+        stats = queue.stats()
+        self.assertGreater(stats['flood_requests'], 15_000)
+        self.assertGreater(stats['flood_dropped'], 0.9 * stats['flood_requests'])
+        self.assertEqual(stats['drop_rate'], 1.0)
+        self.assertIsNone(stats['read_p99_ms'])
+
+    def test_token_buckets(self):
+        """Test refill, burst and per-client isolation of the rate limiter"""
+        bucket = TokenBucket(rate=2.0, burst=3.0)
+        self.assertEqual([bucket.allow(0.0) for _ in range(4)], [True, True, True, False])
+        self.assertTrue(bucket.allow(0.5))
+        self.assertFalse(bucket.allow(0.5))
+
+        limiter = ClientRateLimiter(rate=1.0, burst=1.0, max_clients=2)
+        self.assertTrue(limiter.allow('a', 0.0))
+        self.assertFalse(limiter.allow('a', 0.1))
+        self.assertTrue(limiter.allow(LEGIT_CLIENT, 0.1))
+        self.assertEqual(limiter.limited, 1)
+        limiter.allow('b', 0.2)
+        self.assertEqual(list(limiter.buckets), [LEGIT_CLIENT, 'b'])
+
+    def test_flood_attack_with_and_without_rate_limiting(self):
+        """Test that rate limiting keeps reads fresh against a single flooding client"""
+        sim_clock.set_virtual(True, start_time=0.0)
+        try:
+            results = {}
+            for defense in (False, True):
+                random.seed(1)
+                tank = WaterTank(capacity=100.0, initial_level=50.0)
+                attack = RequestFloodAttack(tank, flood_rate=500.0)
+                attack.set_defense(defense)
+                attack.start()
+                reported = [float(attack.apply(50.0 + t, float(t))) for t in range(1, 61)]
+                results[defense] = (reported, attack.queue.stats())
+
+            reported, stats = results[False]
+            self.assertGreater(stats['drop_rate'] + stats['timeout_rate'], 0.5)
+            self.assertEqual(reported[0], 50.0)  # Stale reading from before the flood
+            reported, stats = results[True]
+            self.assertEqual(stats['drop_rate'] + stats['timeout_rate'], 0.0)
+            self.assertEqual(reported, [50.0 + t for t in range(1, 61)])
+            self.assertAlmostEqual(stats['read_p99_ms'], 10.0)
+        finally:
+            sim_clock.set_virtual(False)
+
+    def test_flood_study_latency_past_timeout(self):
+        """Test that the flood study reports latencies past the timeout and restores the clock"""
+        stats = run_flood(95.0, duration=120.0, seed=2, timeout=0.2)
+        self.assertGreater(stats['timeout_rate'], 0.0)
+        self.assertGreater(stats['read_p99_ms'], 200.0)
+        self.assertFalse(sim_clock.virtual)
+
+
+if __name__ == '__main__':
+    unittest.main()
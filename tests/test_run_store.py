@@ -0,0 +1,60 @@
+# secure-sim/tests/test_run_store.py
+import sys
+import os
+import unittest
+import tempfile
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analysis.run_store import RunWriter, RunReader, DEFENSE_ACTIVE, BACKUP_READING
+
+
+class TestRunStore(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_round_trip(self):
+        """Test that recorded ticks read back as the same arrays"""
+        with RunWriter(self.path, buffer_rows=7) as writer:
+            for i in range(100):
+                phase = 'none' if i < 50 else 'dos_with_defense'
+                flags = 0 if i < 50 else DEFENSE_ACTIVE | (BACKUP_READING if i % 2 else 0)
+                writer.append(1000.0 + i, 40.0 + i, 40.0, 2.0, 1.0, phase, flags)
+        
+        reader = RunReader(self.path)
+        self.assertEqual(len(reader), 100)
+        np.testing.assert_array_equal(reader['time'], 1000.0 + np.arange(100))
+        self.assertEqual(reader.phases, ['none', 'dos_with_defense'])
+        self.assertEqual(int(reader.phase_mask('dos_with_defense').sum()), 50)
+        self.assertEqual(int(reader.flag_mask(BACKUP_READING).sum()), 25)
+        self.assertEqual(reader.summary()['none']['max_discrepancy'], 49.0)
+    
+    def test_time_range(self):
+        """Test that range queries return the rows in [start, end)"""
+        with RunWriter(self.path) as writer:
+            for i in range(1000):
+                writer.append(float(i), 0.0, 0.0, 0.0, 0.0, 'none')
+        
+        window = RunReader(self.path).time_range(100.0, 110.0)
+        np.testing.assert_array_equal(window['time'], np.arange(100.0, 110.0))
+        self.assertEqual(len(window['phase']), 10)
+    
+    def test_read_while_writing(self):
+        """Test that flushed rows are readable before the run is closed"""
+        writer = RunWriter(self.path, buffer_rows=10)
+        for i in range(25):
+            writer.append(float(i), 0.0, 0.0, 0.0, 0.0, 'none')
+        self.assertEqual(len(RunReader(self.path)), 20)
+        writer.close()
+        self.assertEqual(len(RunReader(self.path)), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
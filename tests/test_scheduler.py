@@ -0,0 +1,81 @@
+# secure-sim/tests/test_scheduler.py
+import sys
+import os
+import time
+import threading
+import unittest
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from process_sim.clock import SimClock
+from process_sim.scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+    
+    def setUp(self):
+        self.clock = SimClock()
+        self.clock.set_virtual(True, start_time=100.0)
+        self.scheduler = Scheduler(self.clock)
+        self.log = []
+    
+    def record(self, name):
+        self.log.append((round(self.clock.time() - 100.0, 6), name))
+    
+    def test_periodic_events_at_their_own_rates(self):
+        """Test that events at different rates interleave in time order without drift"""
+        self.scheduler.every(0.1, self.record, 'control', priority=0)
+        self.scheduler.every(1.0, self.record, 'sensor', priority=1)
+        self.scheduler.run(until=100.0 + 2.0)
+        
+        self.assertEqual([t for t, name in self.log if name == 'sensor'], [0.0, 1.0])
+        control_times = [t for t, name in self.log if name == 'control']
+        self.assertEqual(len(control_times), 20)
+        self.assertEqual(control_times[-1], 1.9)
+        # The controller runs before the sensor when both are due
+        self.assertEqual(self.log[:2], [(0.0, 'control'), (0.0, 'sensor')])
+        # A finished virtual run leaves the clock at the end time
+        self.assertEqual(self.clock.time(), 102.0)
+    
+    def test_one_shot_and_cancel(self):
+        """Test one-shot events, cancellation and stopping from a callback"""
+        self.scheduler.schedule(5.0, self.record, 'late')
+        early = self.scheduler.schedule(1.0, self.record, 'cancelled')
+        self.scheduler.schedule_at(102.0, self.record, 'early')
+        periodic = self.scheduler.every(2.0, self.record, 'periodic', start=103.0)
+        self.scheduler.schedule(4.0, periodic.cancel)
+        self.scheduler.schedule(10.0, self.scheduler.stop)
+        early.cancel()
+        self.scheduler.run()
+        
+        self.assertEqual(self.log, [(2.0, 'early'), (3.0, 'periodic'), (5.0, 'late')])
+        self.assertEqual(self.clock.time(), 110.0)
+    
+    def test_real_time(self):
+        """Test that a wall-clock run sleeps until events are due"""
+        clock = SimClock()
+        scheduler = Scheduler(clock)
+        times = []
+        start = time.time()
+        scheduler.every(0.05, lambda: times.append(time.time() - start), start=start)
+        scheduler.run(until=start + 0.2)
+        self.assertEqual(len(times), 4)
+        self.assertGreaterEqual(times[-1], 0.15)
+    
+    def test_wakes_for_events_added_from_another_thread(self):
+        """Test that an event scheduled while run() sleeps is not delayed"""
+        clock = SimClock()
+        scheduler = Scheduler(clock)
+        scheduler.schedule(5.0, scheduler.stop)
+        ran = []
+        timer = threading.Timer(0.05, lambda: scheduler.schedule(0.0, lambda: (ran.append(1), scheduler.stop())))
+        timer.start()
+        start = time.time()
+        scheduler.run()
+        self.assertEqual(ran, [1])
+        self.assertLess(time.time() - start, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
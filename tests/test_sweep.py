@@ -0,0 +1,74 @@
+# secure-sim/tests/test_sweep.py
+import sys
+import os
+import json
+import unittest
+import tempfile
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analysis.sweep import grid_cells, random_cells, detect, load_cache, open_cache, cell_key
+
+
+class TestSweep(unittest.TestCase):
+    
+    def test_grid_cells(self):
+        """Test that the grid covers every combination"""
+        cells = grid_cells({'z_score_threshold': [2.0, 3.0], 'window_size': [10, 20, 40]})
+        self.assertEqual(len(cells), 6)
+        self.assertIn({'z_score_threshold': 3.0, 'window_size': 20}, cells)
+    
+    def test_random_cells(self):
+        """Test that random cells are reproducible and stay within the given ranges"""
+        space = {'z_score_threshold': [2.0, 3.0], 'window_size': [10, 40], 'kp': [0.1]}
+        cells = random_cells(space, 50, seed=3)
+        self.assertEqual(cells, random_cells(space, 50, seed=3))
+        for cell in cells:
+            self.assertTrue(2.0 <= cell['z_score_threshold'] <= 3.0)
+            self.assertTrue(10 <= cell['window_size'] <= 40)
+            self.assertIsInstance(cell['window_size'], int)
+            self.assertEqual(cell['kp'], 0.1)
+    
+    def test_detect(self):
+        """Test that a jump is flagged on the tick it happens, and only on that run"""
+        rng = np.random.default_rng(0)
+        readings = 50 + rng.normal(0, 0.5, size=(2, 60))
+        readings[1, 40:] = 75.0
+        alarms = detect(readings, window_size=20, z_score_threshold=4.0)
+        self.assertTrue(alarms[1, 40])
+        self.assertFalse(alarms[0].any())
+    
+    def test_cache_resume(self):
+        """Test that completed cells load back and a truncated last line is ignored"""
+        settings = {'runs': 5, 'seed': 0}
+        key = cell_key({'kp': 0.1}, settings)
+        self.assertNotEqual(key, cell_key({'kp': 0.1}, {'runs': 10, 'seed': 0}))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.jsonl')
+            with open(path, 'w') as f:
+                f.write(json.dumps({'key': key, 'params': {'kp': 0.1}, 'metrics': {}}) + '\n')
+                f.write('{"key": "cut sh')
+            cache = load_cache(path)
+        self.assertEqual(list(cache), [key])
+    
+    def test_resume_after_truncated_write(self):
+        """Test that records appended after a truncated line are not lost"""
+        keys = [cell_key({'kp': kp}, {'seed': 0}) for kp in (0.1, 0.2, 0.3)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.jsonl')
+            with open(path, 'w') as f:
+                f.write(json.dumps({'key': keys[0], 'params': {}, 'metrics': {}}) + '\n')
+                f.write('{"key": "cut sh')
+            # Two resumed sweeps, each appending one cell
+            for key in keys[1:]:
+                with open_cache(path) as cache_file:
+                    cache_file.write(json.dumps({'key': key, 'params': {}, 'metrics': {}}) + '\n')
+            cache = load_cache(path)
+        self.assertEqual(list(cache), keys)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# secure-sim/tests/test_tank_fleet.py
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from process_sim.tank_fleet import TankFleet
+from process_sim.water_tank import WaterTank
+
+
+class TestTankFleet(unittest.TestCase):
+    
+    def setUp(self):
+        self.fleet = TankFleet(4, capacity=100.0, initial_level=50.0)
+    
+    def test_update_matches_water_tank(self):
+        """Test that every tank in the fleet follows WaterTank dynamics"""
+        inflows = [5.0, 0.0, 10.0, 2.0]
+        outflows = [2.0, 10.0, 0.0, 2.0]
+        self.fleet.set_inflow(inflows)
+        self.fleet.set_outflow(outflows)
+        
+        tanks = [WaterTank(capacity=100.0, initial_level=50.0) for _ in inflows]
+        for tank, inflow, outflow in zip(tanks, inflows, outflows):
+            tank.set_inflow(inflow)
+            tank.set_outflow(outflow)
+        
+        for _ in range(10):
+            levels = self.fleet.update(dt=1.0)
+            expected = [tank.update(dt=1.0) for tank in tanks]
+            np.testing.assert_allclose(levels, expected)
+        
+        # Tanks should be clamped to [0, capacity]
+        self.assertEqual(levels[1], 0.0)
+        self.assertEqual(levels[2], 100.0)
+    
+    def test_per_tank_capacity(self):
+        """Test that clamping uses each tank's own capacity"""
+        fleet = TankFleet(2, capacity=[60.0, 80.0], initial_level=50.0)
+        fleet.set_inflow(20.0)
+        levels = fleet.update(dt=1.0)
+        np.testing.assert_array_equal(levels, [60.0, 70.0])
+    
+    def test_per_tank_initial_levels(self):
+        """Test that a fleet built from per-tank arrays updates its own copy of them"""
+        initial_level = np.array([10.0, 20.0, 30.0])
+        fleet = TankFleet(3, capacity=np.array([60.0, 80.0, 100.0]), initial_level=initial_level)
+        fleet.set_inflow(5.0)
+        np.testing.assert_array_equal(fleet.update(dt=1.0), [15.0, 25.0, 35.0])
+        np.testing.assert_array_equal(initial_level, [10.0, 20.0, 30.0])
+    
+    def test_tank_view(self):
+        """Test that a single-tank view behaves like a WaterTank"""
+        tank = self.fleet.tank(2)
+        tank.set_inflow(5.0)
+        tank.set_outflow(2.0)
+        self.assertEqual(tank.update(dt=1.0), 53.0)
+        self.assertEqual(tank.get_level(), 53.0)
+        self.assertEqual(tank.capacity, 100.0)
+        
+        # The view writes straight into the fleet arrays
+        self.assertEqual(self.fleet.inflow[2], 5.0)
+        self.fleet.update(dt=1.0)
+        self.assertEqual(tank.get_level(), 56.0)
+        self.assertEqual(self.fleet.get_levels()[0], 50.0)
+        
+        with self.assertRaises(IndexError):
+            self.fleet.tank(4)
+
+
+if __name__ == '__main__':
+    unittest.main()
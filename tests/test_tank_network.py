@@ -0,0 +1,132 @@
+# secure-sim/tests/test_tank_network.py
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from process_sim.tank_network import TankNetwork
+from attacks.replay_attack import ReplayAttack
+from attacks.false_data_injection import FalseDataInjectionAttack
+from attacks.dos_attack import DoSAttack
+
+
+class TestTankNetwork(unittest.TestCase):
+    
+    def test_incidence_matches_dense(self):
+        """Test that the CSR incidence product matches a dense matrix product"""
+        rng = np.random.default_rng(1)
+        network = TankNetwork(50)
+        src = rng.integers(0, 50, 200)
+        dst = rng.integers(-1, 50, 200)
+        network.add_pipes(src, dst, rng.uniform(0.1, 1.0, 200))
+        
+        dense = np.zeros((50, 200))
+        dense[src, np.arange(200)] -= 1
+        dense[dst[dst >= 0], np.flatnonzero(dst >= 0)] += 1
+        np.testing.assert_array_equal(network.incidence.toarray(), dense)
+        
+        flows = rng.uniform(0, 5, 200)
+        np.testing.assert_allclose(network.incidence.matvec(flows), dense @ flows)
+    
+    def test_closed_network_conserves_water(self):
+        """Test that pipes only move water between tanks"""
+        network = TankNetwork(4, capacity=1000.0, initial_level=[80.0, 10.0, 40.0, 0.0], integrator='rk4')
+        network.add_pipes([0, 1, 2, 3, 0], [1, 2, 3, 0, 2], 0.3)
+        total = network.get_levels().sum()
+        for _ in range(100):
+            network.update(dt=1.0)
+        self.assertAlmostEqual(network.get_levels().sum(), total)
+    
+    def test_cascade(self):
+        """Test that one tank's outflow is the next one's inflow"""
+        network = TankNetwork.cascade(3, conductance=0.5, initial_level=[64.0, 0.0, 0.0])
+        network.update(dt=1.0)
+        # Euler step: 0.5 * sqrt(64) = 4 leaves tank 0 and enters tank 1
+        np.testing.assert_allclose(network.get_levels(), [60.0, 4.0, 0.0])
+        network.update(dt=1.0)
+        self.assertGreater(network.get_levels()[2], 0.0)
+        
+        # Closing the first valve isolates tank 0
+        network.set_valve(0, 0.0)
+        level_0 = network.get_levels()[0]
+        network.update(dt=1.0)
+        self.assertEqual(network.get_levels()[0], level_0)
+    
+    def test_node_view(self):
+        """Test the WaterTank interface of a single node"""
+        network = TankNetwork(10, initial_level=20.0)
+        node = network.tank(3)
+        node.set_inflow(2.0)
+        node.set_outflow(0.5)
+        self.assertEqual(node.update(dt=2.0), 23.0)
+        self.assertEqual(network.get_levels()[4], 20.0)
+        with self.assertRaises(IndexError):
+            network.tank(10)
+    
+    def test_attacks_target_nodes(self):
+        """Test that attacks only change the readings of the nodes they target"""
+        network = TankNetwork(100, initial_level=np.linspace(0, 99, 100))
+        replay = ReplayAttack(network.tank(0))
+        false_data = FalseDataInjectionAttack(network.tank(0))
+        network.target('replay', [5, 6])
+        network.target('false_data', np.arange(50, 100))
+        attacks = {'replay': replay, 'false_data': false_data}
+        
+        # While idle nothing changes, but the replay attack captures its targets
+        genuine = network.get_levels()
+        np.testing.assert_array_equal(network.sensor_readings(attacks, 0.0), genuine)
+        replay.start()
+        false_data.start()
+        readings = network.sensor_readings(attacks, 1.0)
+        
+        np.testing.assert_array_equal(readings[[5, 6]], genuine[[5, 6]])
+        untouched = np.setdiff1d(np.arange(100), np.r_[5, 6, 50:100])
+        np.testing.assert_array_equal(readings[untouched], genuine[untouched])
+        self.assertTrue(np.all(readings[50:] != genuine[50:]))
+    
+    def test_dos_on_node_subset(self):
+        """Test a DoS attack started on the whole network but aimed at a few nodes"""
+        network = TankNetwork(6, initial_level=np.arange(6) * 10.0)
+        network.set_inflow(1.0)
+        dos = DoSAttack(network)
+        network.target('dos', [2, 5])
+        attacks = {'dos': dos}
+        dos.start()
+        
+        # The first batch is delivered as is
+        np.testing.assert_array_equal(network.sensor_readings(attacks, 0.0), network.get_levels())
+        network.update(dt=0.5)
+        readings = network.sensor_readings(attacks, 0.5)
+        # The targets are still stale half a second later, the other nodes are live
+        np.testing.assert_array_equal(readings[[2, 5]], [20.0, 50.0])
+        np.testing.assert_array_equal(readings[[0, 1, 3, 4]], network.get_levels()[[0, 1, 3, 4]])
+    
+    def test_defenses_protect_nodes(self):
+        """Test that a defense only corrects the protected nodes among an attack's targets"""
+        class BackupDoS(DoSAttack):
+            def defend(self, reported, actual):
+                return actual, 1
+        
+        network = TankNetwork(6, initial_level=np.arange(6) * 10.0)
+        network.set_inflow(1.0)
+        dos = BackupDoS(network)
+        network.target('dos', [2, 5])
+        network.protect('dos', [5])
+        attacks = {'dos': dos}
+        dos.start()
+        network.sensor_readings(attacks, 0.0)
+        network.update(dt=0.5)
+        
+        # Protection does nothing until defenses are switched on
+        np.testing.assert_array_equal(network.sensor_readings(attacks, 0.5)[[2, 5]], [20.0, 50.0])
+        dos.set_defense(True)
+        readings = network.sensor_readings(attacks, 0.5)
+        self.assertEqual(readings[2], 20.0)
+        self.assertEqual(readings[5], network.get_levels()[5])
+
+
+if __name__ == '__main__':
+    unittest.main()
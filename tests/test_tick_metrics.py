@@ -0,0 +1,77 @@
+# secure-sim/tests/test_tick_metrics.py
+import sys
+import os
+import time
+import tempfile
+import unittest
+import numpy as np
+
+# Add the parent directory to path to allow imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from process_sim.tick_metrics import StageHistogram, TickMetrics
+
+
+class TestTickMetrics(unittest.TestCase):
+    
+    def test_histogram_percentiles(self):
+        """Test that histogram percentiles are within one bin of the exact values"""
+        durations = np.random.default_rng(0).lognormal(mean=-7, sigma=1.0, size=10000)
+        histogram = StageHistogram()
+        for duration in durations:
+            histogram.add(duration)
+        for q in (50, 99):
+            self.assertAlmostEqual(histogram.percentile(q) / np.percentile(durations, q), 1.0, delta=0.13)
+        self.assertEqual(histogram.max, durations.max())
+    
+    def test_disabled_is_noop(self):
+        """Test that nothing is recorded until metrics are enabled"""
+        metrics = TickMetrics()
+        timed = metrics.wrap('work', lambda x: x * 2)
+        self.assertEqual(timed(21), 42)
+        metrics.start('stage')
+        metrics.stop()
+        metrics.end_tick()
+        self.assertEqual(metrics.snapshot()['stages'], {})
+        self.assertEqual(metrics.snapshot()['ticks']['count'], 0)
+    
+    def test_nested_stages_and_overruns(self):
+        """Test that nested stages are charged exclusively and slow ticks count as overruns"""
+        metrics = TickMetrics()
+        metrics.enable(tick_budget=0.015)
+        sleep_in_print = metrics.wrap('print', time.sleep)
+        for delay in (0.001, 0.02):
+            metrics.start('sensor')
+            sleep_in_print(delay)
+            metrics.stop()
+            metrics.end_tick()
+        
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['stages']['print']['count'], 2)
+        self.assertGreaterEqual(snapshot['stages']['print']['max_ms'], 20)
+        # The sensor stage does not include the time spent printing
+        self.assertLess(snapshot['stages']['sensor']['max_ms'], 5)
+        self.assertGreaterEqual(snapshot['ticks']['max_ms'], 20)
+        self.assertEqual(snapshot['overruns'], 1)
+    
+    def test_profiles_of_slowest_ticks(self):
+        """Test that only the N slowest ticks' profiles are kept and dumped"""
+        metrics = TickMetrics()
+        metrics.enable(profile_slowest=2)
+        for delay in (0.001, 0.04, 0.002, 0.02):
+            metrics.start('sensor')
+            time.sleep(delay)
+            metrics.stop()
+            metrics.end_tick()
+        metrics.disable()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = metrics.dump_profiles(tmp)
+            self.assertEqual(len(paths), 2)
+            # Slowest first, named by tick number
+            self.assertTrue(os.path.basename(paths[0]).startswith('tick_0000002_'))
+            self.assertTrue(os.path.basename(paths[1]).startswith('tick_0000004_'))
+
+
+if __name__ == '__main__':
+    unittest.main()